@@ -2,13 +2,14 @@
 
 __version__ = "1.2.2"
 
-from ossval.core import analyze, parse_sbom, quick_estimate
+from ossval.core import analyze, iter_sbom, parse_sbom, quick_estimate
 from ossval.models import AnalysisConfig, AnalysisResult, Region, ProjectType
 
 __all__ = [
     "analyze",
     "quick_estimate",
     "parse_sbom",
+    "iter_sbom",
     "AnalysisConfig",
     "AnalysisResult",
     "Region",
@@ -1,8 +1,13 @@
 """Code analysis modules."""
 
 from ossval.analyzers.complexity import analyze_complexity, get_complexity_level
+from ossval.analyzers.fused import (
+    analyze_directory_complexity,
+    analyze_directory_halstead,
+    analyze_file,
+    analyze_repository,
+)
 from ossval.analyzers.git_history import analyze_git_history
-from ossval.analyzers.halstead import analyze_directory_halstead
 from ossval.analyzers.health import analyze_health
 from ossval.analyzers.maintainability import calculate_maintainability_index
 from ossval.analyzers.repo_finder import find_repository_url
@@ -12,10 +17,13 @@ __all__ = [
     "find_repository_url",
     "analyze_sloc",
     "analyze_complexity",
+    "analyze_directory_complexity",
     "get_complexity_level",
     "analyze_health",
     "analyze_git_history",
     "analyze_directory_halstead",
     "calculate_maintainability_index",
+    "analyze_file",
+    "analyze_repository",
 ]
 
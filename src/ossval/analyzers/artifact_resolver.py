@@ -0,0 +1,342 @@
+"""In-process resolution of Package URLs to repositories from published artifacts."""
+
+import asyncio
+import gzip
+import json
+import re
+import tarfile
+import zlib
+from email.parser import BytesHeaderParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import httpx
+
+from ossval.analyzers.urls import normalize_repository_url, repository_from_pypi_info
+from ossval.http_client import throttle
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib  # For Python < 3.11
+    except ImportError:
+        tomllib = None
+
+# Compressed bytes read from one artifact before giving up
+MAX_ARTIFACT_BYTES = 2**24
+
+# Size of the largest manifest that is extracted
+MAX_MANIFEST_BYTES = 2**22
+
+# Artifact downloads in flight at once per batch
+DEFAULT_CONCURRENCY = 8
+
+_BLOCK = 512
+
+# PURL types that differ from ossval ecosystem names
+_PURL_TYPES = {"gem": "rubygems"}
+
+# Lines of a gem's YAML metadata holding candidate repository URLs
+_GEM_URI = re.compile(
+    rb"^\s*(?P<key>source_code_uri|homepage_uri|homepage):\s*['\"]?(?P<url>[^'\"\s]+)", re.M
+)
+
+
+def parse_purl(purl: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    Split a Package URL into ecosystem, package name and version.
+
+    Maven names are returned as ``group:artifact`` and npm scopes are kept
+    (``@scope/name``), matching the names used elsewhere in ossval.
+
+    Args:
+        purl: Package URL such as ``pkg:npm/%40babel/core@7.0.0``
+
+    Returns:
+        (ecosystem, name, version) tuple, or None if the PURL is malformed
+    """
+    if not purl.startswith("pkg:"):
+        return None
+    rest = purl[len("pkg:"):].split("#", 1)[0].split("?", 1)[0].strip("/")
+    purl_type, _, path = rest.partition("/")
+    if not purl_type or not path:
+        return None
+    namespace, _, name = path.rpartition("/")
+    version = None
+    if "@" in name:
+        name, version = name.split("@", 1)
+        version = unquote(version)
+    namespace, name = unquote(namespace), unquote(name)
+    if not name:
+        return None
+    ecosystem = _PURL_TYPES.get(purl_type.lower(), purl_type.lower())
+    if ecosystem == "maven":
+        name = f"{namespace.replace('/', '.')}:{name}" if namespace else name
+    elif namespace:
+        name = f"{namespace}/{name}"
+    return ecosystem, name, version
+
+
+def artifact_urls(ecosystem: str, name: str, version: Optional[str]) -> List[str]:
+    """
+    Download URLs of the artifact that carries a package's manifest.
+
+    This is the subset of purl2src this module needs: npm tarballs, PyPI
+    source distributions, crates and gems. Maven POMs are read by
+    MavenResolver in the registry lookup already. Wheels are not used,
+    since their METADATA sits behind the zip central directory at the end
+    of the file.
+
+    Args:
+        ecosystem: Package ecosystem
+        name: Package name
+        version: Package version (required: artifacts are per version)
+
+    Returns:
+        Candidate URLs, most likely first; empty if the ecosystem has no
+        artifact with repository metadata
+    """
+    if not version:
+        return []
+    if ecosystem == "npm":
+        basename = name.rsplit("/", 1)[-1]
+        return [f"https://registry.npmjs.org/{name}/-/{basename}-{quote(version)}.tgz"]
+    if ecosystem == "pypi":
+        # sdists are named after the normalized project name since PEP 625
+        names = dict.fromkeys([re.sub(r"[-_.]+", "_", name).lower(), name])
+        return [
+            f"https://files.pythonhosted.org/packages/source/{n[0]}/{n}/{n}-{quote(version)}.tar.gz"
+            for n in names
+        ]
+    if ecosystem == "cargo":
+        return [f"https://static.crates.io/crates/{name}/{name}-{quote(version)}.crate"]
+    if ecosystem == "rubygems":
+        return [f"https://rubygems.org/downloads/{name}-{quote(version)}.gem"]
+    return []
+
+
+def artifact_client(timeout: float = 30.0) -> httpx.AsyncClient:
+    """Create an HTTP client suited to artifact downloads (redirects are followed)."""
+    return httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+
+
+async def resolve_purls(
+    purls: Iterable[str],
+    client: Optional[httpx.AsyncClient] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    timeout: float = 30.0,
+) -> Dict[str, Optional[str]]:
+    """
+    Resolve Package URLs to repository URLs from their published artifacts.
+
+    All PURLs are resolved concurrently over one HTTP client, each request
+    waiting for the rate limit of its host (see ``http_client.throttle``).
+    Artifacts are streamed and only read up to the manifest: the tar stream
+    is decompressed and scanned header by header, and the download is
+    closed as soon as the manifest member has been read.
+
+    Args:
+        purls: Package URLs to resolve
+        client: Optional client to send requests with
+        concurrency: Maximum artifact downloads in flight
+        timeout: Request timeout in seconds (when no client is given)
+
+    Returns:
+        Mapping of each PURL to its normalized repository URL, or None
+    """
+    purls = list(dict.fromkeys(purls))
+    if not purls:
+        return {}
+    if client is None:
+        async with artifact_client(timeout) as own_client:
+            return await resolve_purls(purls, own_client, concurrency)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def resolve(purl: str) -> Optional[str]:
+        async with semaphore:
+            try:
+                return await _resolve_purl(purl, client)
+            except Exception:
+                return None
+
+    results = await asyncio.gather(*(resolve(purl) for purl in purls))
+    return dict(zip(purls, results))
+
+
+async def _resolve_purl(purl: str, client: httpx.AsyncClient) -> Optional[str]:
+    """Resolve one PURL, trying its candidate artifact URLs in order."""
+    parsed = parse_purl(purl)
+    if parsed is None:
+        return None
+    ecosystem, name, version = parsed
+    extract = _EXTRACTORS.get(ecosystem)
+    for url in artifact_urls(ecosystem, name, version):
+        await throttle(url)
+        async with client.stream("GET", url) as response:
+            if response.status_code == 404:
+                continue
+            if response.status_code != 200:
+                return None
+            return normalize_repository_url(await extract(response))
+    return None
+
+
+async def _read_tar_member(
+    response: httpx.Response, wanted: Callable[[str], bool], compressed: bool = True
+) -> Optional[bytes]:
+    """
+    Stream a (gzip-compressed) tar archive up to the first wanted member.
+
+    Args:
+        response: Streaming response of the archive
+        wanted: Predicate on member names
+        compressed: Whether the archive is gzip-compressed
+
+    Returns:
+        Content of the first wanted member, or None if there is none
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if compressed else None
+    scanner = _TarScanner(wanted)
+    received = 0
+    async for chunk in response.aiter_bytes():
+        received += len(chunk)
+        if received > MAX_ARTIFACT_BYTES:
+            return None
+        while chunk:
+            if decompressor is None:
+                data, chunk = chunk, b""
+            else:
+                # Bound the output per step so that a small chunk cannot inflate without limit
+                data = decompressor.decompress(chunk, 2**20)
+                chunk = decompressor.unconsumed_tail
+            member = scanner.feed(data)
+            if member is not None or scanner.done:
+                return member
+    return None
+
+
+class _TarScanner:
+    """Incremental tar reader that skips to the first wanted member."""
+
+    def __init__(self, wanted: Callable[[str], bool]):
+        self.wanted = wanted
+        self.done = False
+        self._buffer = bytearray()
+        # Bytes of member data still to skip
+        self._skip = 0
+        # Member being collected: (kind, size, padded size); kind is "member",
+        # "longname" (GNU) or "pax"
+        self._collect: Optional[Tuple[str, int, int]] = None
+        # Name of the next member from a GNU long name or pax header
+        self._next_name: Optional[str] = None
+
+    def feed(self, data: bytes) -> Optional[bytes]:
+        """Add decompressed bytes; return the wanted member once it is complete."""
+        self._buffer += data
+        while not self.done:
+            if self._skip:
+                skipped = min(self._skip, len(self._buffer))
+                del self._buffer[:skipped]
+                self._skip -= skipped
+                if self._skip:
+                    return None
+            if self._collect is not None:
+                kind, size, padded = self._collect
+                if len(self._buffer) < padded:
+                    return None
+                content = bytes(self._buffer[:size])
+                del self._buffer[:padded]
+                self._collect = None
+                if kind == "member":
+                    return content
+                self._next_name = _long_name(kind, content) or self._next_name
+                continue
+            if len(self._buffer) < _BLOCK:
+                return None
+            header = bytes(self._buffer[:_BLOCK])
+            del self._buffer[:_BLOCK]
+            if header.count(0) == _BLOCK:
+                self.done = True
+                return None
+            info = tarfile.TarInfo.frombuf(header, "utf-8", "surrogateescape")
+            padded = -(-info.size // _BLOCK) * _BLOCK
+            if info.type in (tarfile.GNUTYPE_LONGNAME, tarfile.XHDTYPE):
+                kind = "longname" if info.type == tarfile.GNUTYPE_LONGNAME else "pax"
+                self._collect = (kind, info.size, padded)
+                continue
+            name, self._next_name = self._next_name or info.name, None
+            if info.isfile() and info.size <= MAX_MANIFEST_BYTES and self.wanted(name):
+                self._collect = ("member", info.size, padded)
+            else:
+                self._skip = padded
+        return None
+
+
+def _long_name(kind: str, content: bytes) -> Optional[str]:
+    """Member name from a GNU long name or pax extended header."""
+    if kind == "longname":
+        return content.rstrip(b"\0").decode("utf-8", "surrogateescape")
+    # pax records are "<length> <key>=<value>\n"
+    for record in content.split(b"\n"):
+        _, _, field = record.partition(b" ")
+        key, _, value = field.partition(b"=")
+        if key == b"path":
+            return value.decode("utf-8", "surrogateescape")
+    return None
+
+
+def _top_level(filename: str) -> Callable[[str], bool]:
+    """Match a file directly inside the archive's top-level directory."""
+    return lambda name: name.count("/") == 1 and name.endswith("/" + filename)
+
+
+async def _extract_npm(response: httpx.Response) -> Optional[str]:
+    content = await _read_tar_member(response, _top_level("package.json"))
+    if content is None:
+        return None
+    repository = json.loads(content).get("repository")
+    return repository.get("url") if isinstance(repository, dict) else repository
+
+
+async def _extract_pypi(response: httpx.Response) -> Optional[str]:
+    content = await _read_tar_member(response, _top_level("PKG-INFO"))
+    if content is None:
+        return None
+    metadata = BytesHeaderParser().parsebytes(content)
+    project_urls = {}
+    for entry in metadata.get_all("Project-URL") or []:
+        label, _, url = entry.partition(",")
+        project_urls[label.strip()] = url.strip()
+    return repository_from_pypi_info({"project_urls": project_urls, "home_page": metadata.get("Home-page")})
+
+
+async def _extract_cargo(response: httpx.Response) -> Optional[str]:
+    if tomllib is None:
+        return None
+    content = await _read_tar_member(response, _top_level("Cargo.toml"))
+    if content is None:
+        return None
+    return tomllib.loads(content.decode("utf-8")).get("package", {}).get("repository")
+
+
+async def _extract_rubygems(response: httpx.Response) -> Optional[str]:
+    # A gem is a plain tar whose metadata.gz member holds the gzipped YAML spec
+    content = await _read_tar_member(response, lambda name: name == "metadata.gz", compressed=False)
+    if content is None:
+        return None
+    uris = {m.group("key"): m.group("url") for m in _GEM_URI.finditer(gzip.decompress(content))}
+    for key in (b"source_code_uri", b"homepage_uri", b"homepage"):
+        url = uris.get(key, b"").decode("utf-8")
+        if url and normalize_repository_url(url):
+            return url
+    return None
+
+
+_EXTRACTORS = {
+    "npm": _extract_npm,
+    "pypi": _extract_pypi,
+    "cargo": _extract_cargo,
+    "rubygems": _extract_rubygems,
+}
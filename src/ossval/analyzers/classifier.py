@@ -0,0 +1,111 @@
+"""Cheap pre-classification of binary, generated and minified files."""
+
+import re
+from pathlib import Path
+from typing import Optional
+
+from ossval.models import FileCategory
+
+# Number of leading bytes inspected to classify a file
+HEAD_SIZE = 8192
+
+# Average line length (in the inspected head) above which a file is treated as minified
+MINIFIED_AVG_LINE_LENGTH = 200
+
+# A head this long without a single newline is one huge line
+MINIFIED_SINGLE_LINE_LENGTH = 4096
+
+# Files that are always produced by tools
+GENERATED_FILE_NAMES = {
+    "package-lock.json",
+    "npm-shrinkwrap.json",
+    "yarn.lock",
+    "pnpm-lock.yaml",
+    "Cargo.lock",
+    "poetry.lock",
+    "Pipfile.lock",
+    "Gemfile.lock",
+    "composer.lock",
+    "go.sum",
+}
+
+GENERATED_NAME_SUFFIXES = (
+    ".pb.go",
+    ".pb.cc",
+    ".pb.h",
+    ".pb.swift",
+    "_pb2.py",
+    "_pb2_grpc.py",
+    "_pb2.pyi",
+    "_grpc.pb.go",
+    ".pb.gw.go",
+    ".g.dart",
+    ".designer.cs",
+)
+
+# Markers emitted by code generators near the top of a file
+GENERATED_MARKERS = re.compile(
+    rb"Code generated .{0,80}DO NOT EDIT"
+    rb"|@generated"
+    rb"|Generated by the protocol buffer compiler"
+    rb"|Autogenerated by Thrift"
+    rb"|This file was automatically generated"
+    rb"|<auto-generated",
+    re.IGNORECASE,
+)
+
+
+def classify_file(file_path: Path, head: Optional[bytes] = None) -> Optional[FileCategory]:
+    """
+    Classify a file as binary, generated or minified from its name and first bytes.
+
+    Args:
+        file_path: Path to file
+        head: First bytes of the file; read from disk if not given
+
+    Returns:
+        FileCategory, or None for an ordinary source or text file
+    """
+    name = file_path.name
+    if name in GENERATED_FILE_NAMES or name.endswith(GENERATED_NAME_SUFFIXES):
+        return FileCategory.GENERATED
+
+    if head is None:
+        try:
+            with open(file_path, "rb") as f:
+                head = f.read(HEAD_SIZE)
+        except OSError:
+            return None
+    else:
+        head = head[:HEAD_SIZE]
+
+    if b"\0" in head:
+        return FileCategory.BINARY
+
+    if ".min." in name:
+        return FileCategory.MINIFIED
+
+    # Generator markers sit in the header comment
+    if GENERATED_MARKERS.search(head[:2048]):
+        return FileCategory.GENERATED
+
+    if _looks_minified(head):
+        return FileCategory.MINIFIED
+
+    return None
+
+
+def _looks_minified(head: bytes) -> bool:
+    """Check the line-length distribution of a file head for minified content."""
+    lines = head.split(b"\n")
+    if len(lines) == 1:
+        return len(head) >= MINIFIED_SINGLE_LINE_LENGTH
+
+    if len(head) == HEAD_SIZE:
+        # The last line was cut off by the head size
+        lines = lines[:-1]
+    lines = [line for line in lines if line.strip()]
+    if not lines:
+        return False
+
+    return sum(len(line) for line in lines) / len(lines) > MINIFIED_AVG_LINE_LENGTH
@@ -1,12 +1,103 @@
 """Cyclomatic complexity analysis."""
 
-from typing import Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar
 
 from radon.complexity import cc_visit
 from radon.raw import analyze
 
 from ossval.models import ComplexityLevel, ComplexityMetrics
 
+# Node types that add a decision point (branch) by language
+DECISION_TYPES = {
+    "python": {
+        "if_statement", "elif_clause", "for_statement", "while_statement",
+        "except_clause", "conditional_expression", "for_in_clause", "if_clause",
+        "case_clause", "assert_statement",
+    },
+    "javascript": {
+        "if_statement", "for_statement", "for_in_statement", "while_statement",
+        "do_statement", "switch_case", "catch_clause", "ternary_expression",
+    },
+    "typescript": {
+        "if_statement", "for_statement", "for_in_statement", "while_statement",
+        "do_statement", "switch_case", "catch_clause", "ternary_expression",
+    },
+    "java": {
+        "if_statement", "for_statement", "enhanced_for_statement", "while_statement",
+        "do_statement", "switch_label", "catch_clause", "ternary_expression",
+    },
+    "c": {
+        "if_statement", "for_statement", "while_statement", "do_statement",
+        "case_statement", "conditional_expression",
+    },
+    "cpp": {
+        "if_statement", "for_statement", "for_range_loop", "while_statement",
+        "do_statement", "case_statement", "catch_clause", "conditional_expression",
+    },
+    "c_sharp": {
+        "if_statement", "for_statement", "for_each_statement", "while_statement",
+        "do_statement", "switch_section", "catch_clause", "conditional_expression",
+    },
+    "go": {
+        "if_statement", "for_statement", "expression_case", "type_case",
+        "communication_case",
+    },
+    "rust": {
+        "if_expression", "while_expression", "for_expression", "loop_expression",
+        "match_arm",
+    },
+    "php": {
+        "if_statement", "else_if_clause", "for_statement", "foreach_statement",
+        "while_statement", "do_statement", "case_statement", "catch_clause",
+        "conditional_expression",
+    },
+    "ruby": {
+        "if", "elsif", "unless", "while", "until", "for", "when", "rescue",
+        "conditional", "if_modifier", "unless_modifier", "while_modifier",
+        "until_modifier",
+    },
+    "swift": {
+        "if_statement", "guard_statement", "for_statement", "while_statement",
+        "repeat_while_statement", "switch_entry", "catch_block", "ternary_expression",
+    },
+}
+
+# Node types that start a new function scope by language
+FUNCTION_TYPES = {
+    "python": {"function_definition"},
+    "javascript": {
+        "function_declaration", "function", "arrow_function", "method_definition",
+        "generator_function_declaration",
+    },
+    "typescript": {
+        "function_declaration", "function", "arrow_function", "method_definition",
+        "generator_function_declaration",
+    },
+    "java": {"method_declaration", "constructor_declaration", "lambda_expression"},
+    "c": {"function_definition"},
+    "cpp": {"function_definition", "lambda_expression"},
+    "c_sharp": {
+        "method_declaration", "constructor_declaration", "local_function_statement",
+        "lambda_expression",
+    },
+    "go": {"function_declaration", "method_declaration", "func_literal"},
+    "rust": {"function_item", "closure_expression"},
+    "php": {"function_definition", "method_declaration", "anonymous_function_creation_expression"},
+    "ruby": {"method", "singleton_method", "lambda"},
+    "swift": {"function_declaration", "init_declaration", "lambda_literal"},
+}
+
+# Short-circuit operator tokens; each one adds a decision point
+LOGICAL_OPERATORS = {"&&", "||", "and", "or", "??"}
+
+# Below this many files the process pool startup cost outweighs the gain
+PARALLEL_MIN_FILES = 64
+
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 def analyze_complexity(
     code: str, language: str = "python"
@@ -75,3 +166,38 @@ def get_complexity_level(avg_complexity: float) -> ComplexityLevel:
     else:
         return ComplexityLevel.VERY_COMPLEX
 
+
+def _is_logical_operator(node) -> bool:
+    """Check that an operator token belongs to a boolean expression."""
+    parent = node.parent
+    if parent is None:
+        return False
+    return (
+        parent.type in ("binary", "boolean_operator")
+        or parent.type.endswith("_expression")
+    )
+
+
+def map_files(func: Callable[[T], R], items: Sequence[T], workers: int = 1) -> List[R]:
+    """
+    Apply a per-file analysis function, in worker processes when worthwhile.
+
+    Args:
+        func: Picklable module-level function taking one item
+        items: Per-file work items (file paths or argument tuples)
+        workers: Number of worker processes
+
+    Returns:
+        Results in the same order as ``items``
+    """
+    if workers > 1 and len(items) >= PARALLEL_MIN_FILES:
+        try:
+            # spawn avoids forking a process that is running an event loop in threads
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                chunksize = max(1, len(items) // (workers * 4))
+                return list(pool.map(func, items, chunksize=chunksize))
+        except Exception:
+            pass
+
+    return [func(item) for item in items]
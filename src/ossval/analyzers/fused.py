@@ -0,0 +1,705 @@
+"""Fused single-pass per-file analysis for SLOC, Halstead and complexity."""
+
+import ast
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from pygount import SourceAnalysis
+from radon.visitors import ComplexityVisitor
+
+from ossval.analyzers.classifier import HEAD_SIZE, classify_file
+from ossval.analyzers.complexity import (
+    DECISION_TYPES,
+    FUNCTION_TYPES,
+    LOGICAL_OPERATORS,
+    _is_logical_operator,
+    get_complexity_level,
+    map_files,
+)
+from ossval.analyzers.halstead import (
+    OPERAND_TYPES,
+    OPERATOR_TYPES,
+    TREE_SITTER_AVAILABLE,
+    PythonHalsteadAnalyzer,
+    aggregate_halstead,
+    collect_source_files,
+    detect_language,
+    extrapolate_halstead,
+    halstead_from_counts,
+    select_stratified_sample,
+)
+from ossval.analyzers.sloc import iter_sloc_files
+from ossval.models import ComplexityMetrics, FileCategory, HalsteadMetrics, SLOCMetrics
+
+if TREE_SITTER_AVAILABLE:
+    import tree_sitter_languages as tsl
+
+# Language names as reported by pygount, so SLOCMetrics.by_language stays consistent
+PYGOUNT_LANGUAGE_NAMES = {
+    "python": "Python",
+    "javascript": "JavaScript",
+    "typescript": "TypeScript",
+    "java": "Java",
+    "c": "C",
+    "cpp": "C++",
+    "c_sharp": "C#",
+    "go": "Go",
+    "rust": "Rust",
+    "php": "PHP",
+    "ruby": "Ruby",
+    "swift": "Swift",
+}
+
+# Same rules as pygount: a line made only of these characters or words is not code
+WHITE_CHARACTERS = " \f\n\r\t(),:;[]{}"
+WHITE_WORDS = {"python": {"pass"}}
+
+# Leaf-like node types whose lines count as string lines rather than code
+STRING_NODE_TYPES = {"char_literal", "character_literal", "rune_literal", "heredoc_body", "text_block"}
+
+# Nodes inside strings that contain code again
+INTERPOLATION_NODE_TYPES = {"interpolation", "template_substitution"}
+
+# Reasons a file was skipped because of an analysis limit
+SKIP_SIZE = "size"
+SKIP_TIMEOUT = "timeout"
+SKIP_BUDGET = "budget"
+
+# How many tree nodes are visited between deadline checks
+DEADLINE_CHECK_INTERVAL = 4096
+
+
+class _ThreadParsers(threading.local):
+    """Tree-sitter parsers of the current thread, by language."""
+
+    def __init__(self) -> None:
+        self.parsers: Dict[str, object] = {}
+
+
+_thread_parsers = _ThreadParsers()
+
+
+class AnalysisLimits(NamedTuple):
+    """Per-file and per-repository limits for the fused pass."""
+
+    # Files larger than this are skipped
+    max_file_bytes: Optional[int] = None
+    # Wall time allowed for parsing and walking one file, in seconds
+    file_timeout: Optional[float] = None
+    # Absolute time (time.time()) after which remaining files are skipped
+    deadline: Optional[float] = None
+
+
+class FileTimeoutError(Exception):
+    """Raised when a file exceeds its analysis deadline."""
+
+
+class FileRecord(NamedTuple):
+    """Compact result of analyzing one file."""
+
+    language: str
+    code_lines: int
+    comment_lines: int
+    blank_lines: int
+    # (distinct operators, distinct operands, total operators, total operands)
+    halstead_counts: Optional[Tuple[int, int, int, int]] = None
+    # Cyclomatic complexity of each function in the file
+    function_complexities: Tuple[int, ...] = ()
+    # Set for binary, generated or minified files, which are not analyzed
+    category: Optional[FileCategory] = None
+    size_bytes: int = 0
+    # Set for files skipped because of an analysis limit (SKIP_* reasons)
+    skipped: Optional[str] = None
+
+
+class RepositoryAnalysis(NamedTuple):
+    """Repository-level metrics reduced from per-file records."""
+
+    sloc: Optional[SLOCMetrics]
+    halstead: Optional[HalsteadMetrics]
+    complexity: Optional[ComplexityMetrics]
+    # Number of files skipped per SKIP_* reason
+    skipped: Dict[str, int] = {}
+
+
+def analyze_file(
+    file_path: Path, parse: bool = True, limits: Optional[AnalysisLimits] = None
+) -> Optional[FileRecord]:
+    """
+    Analyze a file in a single pass.
+
+    The file is read once. Binary, generated and minified files are recognized
+    from the first few KB and returned as an excluded record without reading
+    the rest. If the language is supported and ``parse`` is set,
+    one parse tree provides line counts, Halstead tallies and per-function
+    decision points together. Otherwise only line counts are produced, using
+    pygount on the buffer that was already read.
+
+    Files over the byte limit, files whose parse runs past the time limit and
+    files reached after the repository deadline are returned as skipped records.
+
+    Args:
+        file_path: Path to file
+        parse: Whether to parse the file for Halstead and complexity metrics
+        limits: Optional size and time limits
+
+    Returns:
+        FileRecord or None if the file can't be analyzed
+    """
+    limits = limits or AnalysisLimits()
+    start = time.time()
+    if limits.deadline is not None and start > limits.deadline:
+        return _skipped_record(SKIP_BUDGET)
+
+    try:
+        with open(file_path, "rb") as f:
+            head = f.read(HEAD_SIZE)
+            size = os.fstat(f.fileno()).st_size
+            category = classify_file(file_path, head)
+            if category is not None:
+                return FileRecord(
+                    language="",
+                    code_lines=0,
+                    comment_lines=0,
+                    blank_lines=0,
+                    category=category,
+                    size_bytes=size,
+                )
+            if limits.max_file_bytes is not None and size > limits.max_file_bytes:
+                return _skipped_record(SKIP_SIZE, size)
+            data = head + f.read()
+    except OSError:
+        return None
+
+    if not data:
+        return None
+
+    file_deadline = limits.deadline
+    if limits.file_timeout is not None:
+        file_deadline = min(start + limits.file_timeout, file_deadline or float("inf"))
+
+    language = detect_language(file_path) if parse else None
+    if language:
+        try:
+            if TREE_SITTER_AVAILABLE:
+                record = _analyze_tree_sitter(data, language, file_deadline)
+                if record and language == "python" and not halstead_from_counts(
+                    *record.halstead_counts
+                ):
+                    # Same fallback as analyze_python_file: retry Halstead on the ast
+                    record = record._replace(
+                        halstead_counts=_python_ast_halstead_counts(ast.parse(data))
+                    )
+                if record:
+                    return record
+            if language == "python":
+                return _analyze_python_ast(file_path, data)
+        except FileTimeoutError:
+            if limits.deadline is not None and time.time() > limits.deadline:
+                return _skipped_record(SKIP_BUDGET, len(data))
+            return _skipped_record(SKIP_TIMEOUT, len(data))
+        except Exception:
+            pass
+
+    return _analyze_lines_only(file_path, data)
+
+
+def _skipped_record(reason: str, size: int = 0) -> FileRecord:
+    """Record for a file skipped because of an analysis limit."""
+    return FileRecord(
+        language="", code_lines=0, comment_lines=0, blank_lines=0, size_bytes=size, skipped=reason
+    )
+
+
+def _analyze_tree_sitter(
+    data: bytes, language: str, deadline: Optional[float] = None
+) -> Optional[FileRecord]:
+    """Line counts, Halstead tallies and complexities from one tree-sitter parse."""
+    parser = _get_parser(language)
+    if parser is None:
+        return None
+
+    if deadline is None:
+        tree = parser.parse(data)
+    else:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            raise FileTimeoutError()
+        parser.set_timeout_micros(max(1, int(remaining * 1_000_000)))
+        try:
+            tree = parser.parse(data)
+        except ValueError:
+            # A timed-out parser keeps its state and would resume on the next call
+            parser.reset()
+            raise FileTimeoutError()
+        finally:
+            parser.set_timeout_micros(0)
+
+    operator_types = OPERATOR_TYPES.get(language, set())
+    operand_types = OPERAND_TYPES.get(language, set())
+    decision_types = DECISION_TYPES.get(language, set())
+    function_types = FUNCTION_TYPES.get(language, set())
+    white_words = WHITE_WORDS.get(language, set())
+
+    operators: Set[str] = set()
+    operands: Set[str] = set()
+    operator_count = 0
+    operand_count = 0
+    complexities: List[int] = []
+    closures: Set[int] = set()
+    line_marks: Dict[int, Set[str]] = {}
+
+    def mark(node, kind: str) -> None:
+        for line in range(node.start_point[0], node.end_point[0] + 1):
+            line_marks.setdefault(line, set()).add(kind)
+
+    # Iterative walk: (node, enclosing function index, inside a string/comment)
+    stack = [(tree.root_node, -1, False)]
+    visited = 0
+    while stack:
+        node, function_index, in_literal = stack.pop()
+        visited += 1
+        if (
+            deadline is not None
+            and visited % DEADLINE_CHECK_INTERVAL == 0
+            and time.time() > deadline
+        ):
+            raise FileTimeoutError()
+        node_type = node.type
+
+        # Halstead tallies
+        if node_type in operator_types:
+            operators.add(node_type)
+            operator_count += 1
+        if node_type in operand_types:
+            operand_text = data[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
+            operands.add(operand_text[:50])  # Limit length
+            operand_count += 1
+
+        # Decision points
+        if node.is_named and node_type in function_types:
+            if language == "python" and function_index >= 0:
+                # radon does not report closures, nor count them in the parent
+                closures.add(len(complexities))
+            complexities.append(1)
+            function_index = len(complexities) - 1
+        elif function_index >= 0:
+            if node_type in decision_types or (
+                node_type in LOGICAL_OPERATORS and _is_logical_operator(node)
+            ):
+                complexities[function_index] += 1
+            elif node_type == "else_clause" and language == "python":
+                # radon counts else branches of loops and try blocks
+                if node.parent is not None and node.parent.type in (
+                    "for_statement", "while_statement", "try_statement"
+                ):
+                    complexities[function_index] += 1
+
+        # Line classification
+        if in_literal and node_type in INTERPOLATION_NODE_TYPES:
+            # Code embedded in a string (f-strings, template literals) counts as code
+            in_literal = False
+        elif not in_literal:
+            if "comment" in node_type:
+                mark(node, "d")
+                in_literal = True
+            elif node.is_named and ("string" in node_type or node_type in STRING_NODE_TYPES):
+                mark(node, "d" if _is_docstring(node, language) else "s")
+                in_literal = True
+            elif node.child_count == 0:
+                text = data[node.start_byte:node.end_byte].decode("utf-8", errors="ignore")
+                if text.strip() not in white_words and text.strip(WHITE_CHARACTERS):
+                    mark(node, "c")
+
+        for child in node.children:
+            stack.append((child, function_index, in_literal))
+
+    code, comment, blank = _count_lines(data, line_marks)
+    halstead_counts = (len(operators), len(operands), operator_count, operand_count)
+
+    return FileRecord(
+        language=PYGOUNT_LANGUAGE_NAMES.get(language, language),
+        code_lines=code,
+        comment_lines=comment,
+        blank_lines=blank,
+        halstead_counts=halstead_counts,
+        function_complexities=tuple(
+            value for i, value in enumerate(complexities) if i not in closures
+        ),
+    )
+
+
+def _is_docstring(node, language: str) -> bool:
+    """Check whether a string node is a Python docstring."""
+    if language != "python":
+        return False
+    statement = node.parent
+    if statement is None or statement.type != "expression_statement":
+        return False
+    if statement.named_child_count != 1:
+        return False
+    body = statement.parent
+    if body is None or body.type not in ("module", "block"):
+        return False
+    for child in body.named_children:
+        if child.type == "comment":
+            continue
+        return child == statement
+    return False
+
+
+def _count_lines(data: bytes, line_marks: Dict[int, Set[str]]) -> Tuple[int, int, int]:
+    """Classify lines as code, comment or empty from their marks (pygount rules)."""
+    code = comment = blank = 0
+    # Like pygments, ignore leading and trailing newlines
+    stripped = data.strip(b"\n")
+    if not stripped:
+        return 0, 0, 0
+    first_line = len(data) - len(data.lstrip(b"\n"))
+    line_count = stripped.count(b"\n") + 1
+    for line in range(first_line, first_line + line_count):
+        marks = line_marks.get(line)
+        if not marks:
+            blank += 1
+        elif "c" in marks:
+            code += 1
+        elif "d" in marks:
+            comment += 1
+        # String-only lines are not counted, as with pygount
+    return code, comment, blank
+
+
+def _analyze_python_ast(file_path: Path, data: bytes) -> Optional[FileRecord]:
+    """Python fallback without tree-sitter: one ast parse for Halstead and radon."""
+    tree = ast.parse(data.decode("utf-8"))
+
+    visitor = ComplexityVisitor.from_ast(tree)
+    complexities = [block.complexity for block in visitor.functions]
+    for cls in visitor.classes:
+        complexities.extend(method.complexity for method in cls.methods)
+
+    lines = _analyze_lines_only(file_path, data)
+    if lines is None:
+        return None
+
+    return lines._replace(
+        halstead_counts=_python_ast_halstead_counts(tree),
+        function_complexities=tuple(complexities),
+    )
+
+
+def _python_ast_halstead_counts(tree: ast.AST) -> Tuple[int, int, int, int]:
+    """Halstead tallies of a parsed Python module."""
+    analyzer = PythonHalsteadAnalyzer()
+    analyzer.visit(tree)
+    return (
+        len(analyzer.operators),
+        len(analyzer.operands),
+        analyzer.operator_count,
+        analyzer.operand_count,
+    )
+
+
+def _analyze_lines_only(file_path: Path, data: bytes) -> Optional[FileRecord]:
+    """Line counts with pygount, reusing the buffer that was already read."""
+    # Suppress encoding warnings from pygount
+    old_stderr = sys.stderr
+    sys.stderr = io.StringIO()
+    try:
+        analysis = SourceAnalysis.from_file(
+            str(file_path), group="", file_handle=io.BytesIO(data)
+        )
+    except Exception:
+        return None
+    finally:
+        sys.stderr = old_stderr
+
+    if not analysis or analysis.language.startswith("__"):
+        # pygount states such as __unknown__ or __binary__
+        return None
+
+    return FileRecord(
+        language=analysis.language,
+        code_lines=analysis.code_count,
+        comment_lines=analysis.documentation_count,
+        blank_lines=analysis.empty_count,
+    )
+
+
+def _get_parser(language: str):
+    """
+    Get this thread's tree-sitter parser for a language (None if unavailable).
+
+    Parsers keep per-parse state (the timeout and a partially parsed tree
+    after a timeout), so each analysis thread gets its own.
+    """
+    parsers = _thread_parsers.parsers
+    if language not in parsers:
+        try:
+            parsers[language] = tsl.get_parser(language)
+        except Exception:
+            parsers[language] = None
+    return parsers[language]
+
+
+def _analyze_file_task(
+    task: Tuple[Path, bool, Optional[AnalysisLimits]]
+) -> Optional[FileRecord]:
+    """Picklable wrapper around analyze_file for worker processes."""
+    file_path, parse, limits = task
+    return analyze_file(file_path, parse, limits)
+
+
+def reduce_sloc(records: List[Optional[FileRecord]]) -> Optional[SLOCMetrics]:
+    """
+    Reduce per-file records into SLOCMetrics.
+
+    Excluded files contribute no lines; they are counted per category instead.
+
+    Args:
+        records: Records of the files that count towards SLOC
+
+    Returns:
+        SLOCMetrics or None if no lines were counted
+    """
+    total_code = 0
+    total_comment = 0
+    total_blank = 0
+    by_language: Dict[str, int] = {}
+    excluded_files: Dict[str, int] = {}
+    excluded_bytes: Dict[str, int] = {}
+
+    for record in records:
+        if record is None or record.skipped is not None:
+            continue
+        if record.category is not None:
+            category = record.category.value
+            excluded_files[category] = excluded_files.get(category, 0) + 1
+            excluded_bytes[category] = excluded_bytes.get(category, 0) + record.size_bytes
+            continue
+        total_code += record.code_lines
+        total_comment += record.comment_lines
+        total_blank += record.blank_lines
+        by_language[record.language] = by_language.get(record.language, 0) + record.code_lines
+
+    if total_code == 0 and total_comment == 0 and total_blank == 0:
+        return None
+
+    return SLOCMetrics(
+        total=total_code + total_comment + total_blank,
+        code_lines=total_code,
+        comment_lines=total_comment,
+        blank_lines=total_blank,
+        by_language=by_language,
+        excluded_files=excluded_files,
+        excluded_bytes=excluded_bytes,
+    )
+
+
+def reduce_halstead(
+    records: List[Optional[FileRecord]],
+    strata: Optional[Dict[Tuple[str, int], Tuple[int, List[int]]]] = None,
+    files_total: Optional[int] = None,
+) -> Optional[HalsteadMetrics]:
+    """
+    Reduce per-file records into HalsteadMetrics.
+
+    Args:
+        records: Records of the analyzed source files
+        strata: Optional sample strata as (stratum size, indexes into ``records``)
+        files_total: Number of candidate source files when sampling
+
+    Returns:
+        HalsteadMetrics or None
+    """
+    file_metrics = [
+        halstead_from_counts(*record.halstead_counts)
+        if record is not None and record.halstead_counts
+        else None
+        for record in records
+    ]
+
+    if strata is None:
+        return aggregate_halstead(file_metrics)
+
+    observations = {
+        key: (stratum_size, [file_metrics[i] for i in indexes])
+        for key, (stratum_size, indexes) in strata.items()
+    }
+    return extrapolate_halstead(observations, files_total or len(records))
+
+
+def reduce_complexity(
+    records: List[Optional[FileRecord]], scale: float = 1.0
+) -> Optional[ComplexityMetrics]:
+    """
+    Reduce per-file records into ComplexityMetrics.
+
+    Args:
+        records: Records of the analyzed source files
+        scale: Factor to extrapolate the complexity sum when only a sample was analyzed
+
+    Returns:
+        ComplexityMetrics or None if no functions were found
+    """
+    complexities = [
+        value
+        for record in records
+        if record is not None
+        for value in record.function_complexities
+    ]
+    if not complexities:
+        return None
+
+    sum_complexity = sum(complexities)
+    avg_complexity = sum_complexity / len(complexities)
+
+    return ComplexityMetrics(
+        cyclomatic_complexity_avg=avg_complexity,
+        cyclomatic_complexity_max=max(complexities),
+        cyclomatic_complexity_sum=round(sum_complexity * scale),
+        complexity_level=get_complexity_level(avg_complexity),
+    )
+
+
+def analyze_repository(
+    repo_path: Path,
+    sample_files: Optional[int] = None,
+    sample_bytes: Optional[int] = None,
+    workers: int = 1,
+    seed: int = 0,
+    max_file_bytes: Optional[int] = None,
+    file_timeout: Optional[float] = None,
+    time_budget: Optional[float] = None,
+    count_sloc: bool = True,
+) -> RepositoryAnalysis:
+    """
+    Analyze a repository checkout with one fused pass over its files.
+
+    Every file is read once. Source files are parsed once for Halstead and
+    complexity; when a Halstead sample budget is given, only the sampled
+    source files are parsed and the rest contribute line counts only.
+
+    Files over ``max_file_bytes`` or whose parse exceeds ``file_timeout`` are
+    skipped, and once ``time_budget`` is spent the remaining files are skipped
+    too. Skips are counted per reason in ``RepositoryAnalysis.skipped``.
+
+    Args:
+        repo_path: Path to repository
+        sample_files: Optional maximum number of source files to parse
+        sample_bytes: Optional maximum number of source bytes to parse
+        workers: Number of worker processes for per-file analysis
+        seed: Random seed for sampling
+        max_file_bytes: Optional maximum size of an analyzed file
+        file_timeout: Optional time limit per file in seconds
+        time_budget: Optional time limit for the whole repository in seconds
+        count_sloc: Whether to count lines of non-source files too (for SLOC)
+
+    Returns:
+        RepositoryAnalysis with SLOC, Halstead and complexity metrics
+    """
+    limits = AnalysisLimits(
+        max_file_bytes=max_file_bytes,
+        file_timeout=file_timeout,
+        deadline=time.time() + time_budget if time_budget is not None else None,
+    )
+
+    source_files = collect_source_files(repo_path)
+    sloc_files = set(iter_sloc_files(repo_path)) if count_sloc else set()
+
+    sampled_strata = None
+    parse_files = set(source_files)
+    if sample_files is not None or sample_bytes is not None:
+        needs_sampling = (sample_files is not None and len(source_files) > sample_files) or (
+            sample_bytes is not None
+            and sum(f.stat().st_size for f in source_files) > sample_bytes
+        )
+        if needs_sampling:
+            sampled_strata = select_stratified_sample(
+                source_files, sample_files, sample_bytes, seed
+            )
+            parse_files = {f for _, sampled in sampled_strata.values() for f in sampled}
+
+    all_files = sorted(sloc_files | parse_files)
+    records = map_files(
+        _analyze_file_task, [(f, f in parse_files, limits) for f in all_files], workers
+    )
+    by_path = dict(zip(all_files, records))
+
+    skipped: Dict[str, int] = {}
+    for record in records:
+        if record is not None and record.skipped is not None:
+            skipped[record.skipped] = skipped.get(record.skipped, 0) + 1
+
+    sloc = reduce_sloc([by_path[f] for f in all_files if f in sloc_files])
+
+    if sampled_strata is None:
+        parsed = [by_path[f] for f in source_files]
+        halstead = reduce_halstead(parsed)
+        complexity = reduce_complexity(parsed)
+    else:
+        parsed_order = sorted(parse_files)
+        index = {f: i for i, f in enumerate(parsed_order)}
+        parsed = [by_path[f] for f in parsed_order]
+        strata = {
+            key: (stratum_size, [index[f] for f in sampled])
+            for key, (stratum_size, sampled) in sampled_strata.items()
+        }
+        halstead = reduce_halstead(parsed, strata, len(source_files))
+        complexity = reduce_complexity(
+            parsed, scale=len(source_files) / max(1, len(parsed))
+        )
+
+    return RepositoryAnalysis(
+        sloc=sloc, halstead=halstead, complexity=complexity, skipped=skipped
+    )
+
+
+def analyze_directory_halstead(
+    repo_path: Path,
+    sample_files: Optional[int] = None,
+    sample_bytes: Optional[int] = None,
+    seed: int = 0,
+) -> Optional[HalsteadMetrics]:
+    """
+    Analyze all supported source files in a directory for aggregate Halstead metrics.
+
+    When a file or byte budget is given and the repository exceeds it, only a
+    stratified random sample of files is analyzed and the repository totals
+    are extrapolated from it (see analyze_repository).
+
+    Args:
+        repo_path: Path to repository
+        sample_files: Optional maximum number of files to analyze
+        sample_bytes: Optional maximum number of bytes to analyze
+        seed: Random seed for sampling
+
+    Returns:
+        Aggregated HalsteadMetrics or None
+    """
+    return analyze_repository(
+        repo_path,
+        sample_files=sample_files,
+        sample_bytes=sample_bytes,
+        seed=seed,
+        count_sloc=False,
+    ).halstead
+
+
+def analyze_directory_complexity(repo_path: Path, workers: int = 1) -> Optional[ComplexityMetrics]:
+    """
+    Analyze cyclomatic complexity across all supported source files in a directory.
+
+    Args:
+        repo_path: Path to repository
+        workers: Number of worker processes for per-file analysis
+
+    Returns:
+        Aggregated ComplexityMetrics or None if no functions were found
+    """
+    return analyze_repository(repo_path, workers=workers, count_sloc=False).complexity
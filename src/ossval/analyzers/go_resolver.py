@@ -0,0 +1,189 @@
+"""Go module repository resolution through ``?go-get=1`` import meta tags."""
+
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional, Tuple
+
+from ossval.analyzers.urls import normalize_git_url
+from ossval.cache import AnalysisCache, cache_key
+from ossval.http_client import cached_get
+from ossval.singleflight import SingleFlight
+
+# Cache namespace of resolved module roots
+GO_IMPORT_NAMESPACE = "registry"
+
+# Hosts whose repository root is always host/owner/repo
+_KNOWN_HOSTS = ("github.com", "gitlab.com", "bitbucket.org")
+
+# Module paths: a domain followed by path elements, nothing that could alter a URL
+_MODULE_PATH = re.compile(r"^[a-z0-9-]+(\.[a-z0-9-]+)+(/[A-Za-z0-9._~+-]+)*$")
+
+# Major version suffix of a module path (github.com/foo/bar/v2)
+_MAJOR_VERSION = re.compile(r"^v[2-9][0-9]*$")
+
+
+class _PrefixTrie:
+    """Trie of slash-separated path elements mapping module roots to values."""
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def insert(self, path: str, value: str) -> None:
+        """Store a value for a path prefix."""
+        node = self._root
+        for element in path.split("/"):
+            node = node.setdefault(element, {})
+        node[""] = value
+
+    def longest_prefix(self, path: str) -> Optional[Tuple[str, str]]:
+        """Find the longest stored prefix of a path as (prefix, value)."""
+        node = self._root
+        found = None
+        elements = path.split("/")
+        for depth, element in enumerate(elements):
+            node = node.get(element)
+            if node is None:
+                break
+            if "" in node:
+                found = ("/".join(elements[: depth + 1]), node[""])
+        return found
+
+
+class _GoImportParser(HTMLParser):
+    """Collect ``<meta name="go-import" content="root vcs repo">`` tags."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.imports: List[Tuple[str, str, str]] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag != "meta":
+            return
+        attributes = dict(attrs)
+        if attributes.get("name") == "go-import":
+            fields = (attributes.get("content") or "").split()
+            if len(fields) == 3:
+                self.imports.append((fields[0], fields[1], fields[2]))
+
+
+class GoResolver:
+    """
+    Resolve Go module paths to repositories.
+
+    Paths on GitHub, GitLab and Bitbucket map to ``host/owner/repo``. Other
+    paths (vanity imports such as ``golang.org/x/net``, ``k8s.io/api`` or
+    ``go.uber.org/zap``) are resolved from the ``go-import`` meta tag served
+    at ``https://<path>?go-get=1``, once per module root. Resolved roots are
+    kept in a prefix trie, so every package, submodule and ``go.sum`` entry
+    under a known root resolves without another request, and in the cache
+    for later runs. Major version suffixes (``/v2``) are dropped first, since
+    every major version lives in the same repository.
+    """
+
+    def __init__(self, cache: Optional[AnalysisCache] = None):
+        """
+        Initialize the resolver.
+
+        Args:
+            cache: Optional AnalysisCache for resolved module roots
+        """
+        self.cache = cache
+        self._trie = _PrefixTrie()
+        # In-flight vanity lookups by path; concurrent paths under one root
+        # join a lookup of an enclosing or enclosed path instead of sending
+        # their own request, while distinct roots resolve in parallel
+        self._flights = SingleFlight()
+        # Number of go-get requests sent
+        self.requests = 0
+
+    async def resolve(self, module_path: str) -> Optional[str]:
+        """
+        Find the repository URL of a Go module or package path.
+
+        Args:
+            module_path: Module or package import path
+
+        Returns:
+            Repository URL if found, None otherwise
+        """
+        path = _strip_major_version(module_path.strip().rstrip("/"))
+        if not _MODULE_PATH.match(path) or ".." in path:
+            return None
+
+        host = path.split("/", 1)[0]
+        if host in _KNOWN_HOSTS:
+            elements = path.split("/")
+            if len(elements) < 3:
+                return None
+            return f"https://{'/'.join(elements[:3])}.git"
+
+        repo_url = self._known(path)
+        if repo_url:
+            return repo_url
+        for other in self._flights.keys():
+            # The root found for an ancestor or descendant path usually covers
+            # this one too; skip lookups that completed while this one waited
+            if isinstance(other, str) and other in self._flights and _overlaps(path, other):
+                await self._flights.do(other, lambda: self._fetch_go_import(other))
+                repo_url = self._known(path)
+                if repo_url:
+                    return repo_url
+        return await self._flights.do(path, lambda: self._fetch_go_import(path))
+
+    def _known(self, path: str) -> Optional[str]:
+        """Repository of a root already resolved in this process or a previous run."""
+        found = self._trie.longest_prefix(path)
+        if found:
+            return found[1]
+        if self.cache is None:
+            return None
+        elements = path.split("/")
+        for depth in range(len(elements), 1, -1):
+            root = "/".join(elements[:depth])
+            repo_url = self.cache.get(cache_key("go-import", root), GO_IMPORT_NAMESPACE)
+            if repo_url:
+                self._trie.insert(root, repo_url)
+                return repo_url
+        return None
+
+    async def _fetch_go_import(self, path: str) -> Optional[str]:
+        """Resolve a path from its go-import meta tag and remember the root."""
+        self.requests += 1
+        try:
+            response = await cached_get(f"https://{path}", params={"go-get": "1"}, timeout=10.0)
+            if response.status_code != 200:
+                return None
+            parser = _GoImportParser()
+            parser.feed(response.text)
+        except Exception:
+            return None
+
+        matches = [
+            (root, vcs, repo)
+            for root, vcs, repo in parser.imports
+            if vcs == "git" and (path == root or path.startswith(root + "/"))
+        ]
+        if not matches:
+            return None
+        root, _, repo = max(matches, key=lambda match: len(match[0]))
+        repo_url = _normalize_repo(repo)
+        self._trie.insert(root, repo_url)
+        if self.cache is not None:
+            self.cache.set(cache_key("go-import", root), repo_url, GO_IMPORT_NAMESPACE)
+        return repo_url
+
+
+def _overlaps(path: str, other: str) -> bool:
+    """Whether one of two different paths lies under the other."""
+    return path.startswith(other + "/") or other.startswith(path + "/")
+
+
+def _strip_major_version(path: str) -> str:
+    """Drop a trailing major version element (``/v2``) of a module path."""
+    head, _, last = path.rpartition("/")
+    return head if head and _MAJOR_VERSION.match(last) else path
+
+
+def _normalize_repo(repo: str) -> str:
+    """Normalize a go-import repository URL."""
+    return normalize_git_url(repo.rstrip("/"))
@@ -1,8 +1,11 @@
 """Halstead complexity metrics analyzer with multi-language support."""
 
 import ast
+import bisect
+import math
+import random
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 try:
     import tree_sitter_languages as tsl
@@ -10,6 +13,7 @@ try:
 except ImportError:
     TREE_SITTER_AVAILABLE = False
 
+from ossval.analyzers.classifier import classify_file
 from ossval.models import HalsteadMetrics
 
 
@@ -265,6 +269,46 @@ def detect_language(file_path: Path) -> Optional[str]:
     return None
 
 
+def halstead_from_counts(
+    distinct_operators: int, distinct_operands: int, total_operators: int, total_operands: int
+) -> Optional[HalsteadMetrics]:
+    """
+    Compute Halstead metrics from operator and operand tallies.
+
+    Args:
+        distinct_operators: Number of distinct operators (n1)
+        distinct_operands: Number of distinct operands (n2)
+        total_operators: Total number of operators (N1)
+        total_operands: Total number of operands (N2)
+
+    Returns:
+        HalsteadMetrics or None if there are no operators or operands
+    """
+    n1, n2 = distinct_operators, distinct_operands
+    if n1 == 0 or n2 == 0:
+        return None
+
+    vocabulary = n1 + n2
+    length = total_operators + total_operands
+    calculated_length = n1 * (n1 / 2 if n1 > 0 else 0) + n2 * (n2 / 2 if n2 > 0 else 0)
+    volume = length * (vocabulary.bit_length() if vocabulary > 0 else 0)
+    difficulty = (n1 / 2.0) * (total_operands / n2 if n2 > 0 else 0)
+    effort = difficulty * volume
+    time_seconds = effort / 18.0
+    bugs = volume / 3000.0
+
+    return HalsteadMetrics(
+        vocabulary=vocabulary,
+        length=length,
+        calculated_length=calculated_length,
+        volume=volume,
+        difficulty=difficulty,
+        effort=effort,
+        time_seconds=time_seconds,
+        bugs=bugs,
+    )
+
+
 def analyze_with_tree_sitter(file_path: Path, language: str) -> Optional[HalsteadMetrics]:
     """
     Analyze file using tree-sitter.
@@ -312,32 +356,8 @@ def analyze_with_tree_sitter(file_path: Path, language: str) -> Optional[Halstea
 
         traverse(root_node)
 
-        n1 = len(operators)
-        n2 = len(operands)
-        N1 = operator_count
-        N2 = operand_count
-
-        if n1 == 0 or n2 == 0:
-            return None
-
-        vocabulary = n1 + n2
-        length = N1 + N2
-        calculated_length = n1 * (n1 / 2 if n1 > 0 else 0) + n2 * (n2 / 2 if n2 > 0 else 0)
-        volume = length * (vocabulary.bit_length() if vocabulary > 0 else 0)
-        difficulty = (n1 / 2.0) * (N2 / n2 if n2 > 0 else 0)
-        effort = difficulty * volume
-        time_seconds = effort / 18.0
-        bugs = volume / 3000.0
-
-        return HalsteadMetrics(
-            vocabulary=vocabulary,
-            length=length,
-            calculated_length=calculated_length,
-            volume=volume,
-            difficulty=difficulty,
-            effort=effort,
-            time_seconds=time_seconds,
-            bugs=bugs,
+        return halstead_from_counts(
+            len(operators), len(operands), operator_count, operand_count
         )
 
     except Exception:
@@ -362,32 +382,11 @@ def analyze_python_file_fallback(file_path: Path) -> Optional[HalsteadMetrics]:
         analyzer = PythonHalsteadAnalyzer()
         analyzer.visit(tree)
 
-        n1 = len(analyzer.operators)
-        n2 = len(analyzer.operands)
-        N1 = analyzer.operator_count
-        N2 = analyzer.operand_count
-
-        if n1 == 0 or n2 == 0:
-            return None
-
-        vocabulary = n1 + n2
-        length = N1 + N2
-        calculated_length = n1 * (n1 / 2 if n1 > 0 else 0) + n2 * (n2 / 2 if n2 > 0 else 0)
-        volume = length * (vocabulary.bit_length() if vocabulary > 0 else 0)
-        difficulty = (n1 / 2.0) * (N2 / n2 if n2 > 0 else 0)
-        effort = difficulty * volume
-        time_seconds = effort / 18.0
-        bugs = volume / 3000.0
-
-        return HalsteadMetrics(
-            vocabulary=vocabulary,
-            length=length,
-            calculated_length=calculated_length,
-            volume=volume,
-            difficulty=difficulty,
-            effort=effort,
-            time_seconds=time_seconds,
-            bugs=bugs,
+        return halstead_from_counts(
+            len(analyzer.operators),
+            len(analyzer.operands),
+            analyzer.operator_count,
+            analyzer.operand_count,
         )
 
     except Exception:
@@ -438,42 +437,160 @@ def analyze_source_file(file_path: Path) -> Optional[HalsteadMetrics]:
     return analyze_with_tree_sitter(file_path, language)
 
 
-def analyze_directory_halstead(repo_path: Path) -> Optional[HalsteadMetrics]:
+def collect_source_files(repo_path: Path) -> List[Path]:
     """
-    Analyze all supported source files in a directory for aggregate Halstead metrics.
+    Collect all source files with a supported extension under a directory.
+
+    Binary, generated and minified files are left out.
 
     Args:
         repo_path: Path to repository
 
     Returns:
-        Aggregated HalsteadMetrics or None
+        Sorted list of source file paths
     """
-    total_volume = 0.0
-    total_difficulty = 0.0
-    total_effort = 0.0
-    total_time = 0.0
-    total_bugs = 0.0
-    file_count = 0
-
     # Get all extensions to search for
     all_extensions = set()
     for extensions in LANGUAGE_EXTENSIONS.values():
         all_extensions.update(extensions)
 
+    files = set()
     for ext in all_extensions:
         for source_file in repo_path.rglob(f"*{ext}"):
             # Skip common non-source directories
             if any(skip in str(source_file) for skip in ["venv", "node_modules", ".git", "build", "dist", "target"]):
                 continue
+            if source_file.is_file() and classify_file(source_file) is None:
+                files.add(source_file)
 
-            metrics = analyze_source_file(source_file)
-            if metrics:
-                total_volume += metrics.volume
-                total_difficulty += metrics.difficulty
-                total_effort += metrics.effort
-                total_time += metrics.time_seconds
-                total_bugs += metrics.bugs
-                file_count += 1
+    return sorted(files)
+
+
+def _file_size(file_path: Path) -> int:
+    """Get file size in bytes, 0 if it cannot be read."""
+    try:
+        return file_path.stat().st_size
+    except OSError:
+        return 0
+
+
+def select_stratified_sample(
+    files: List[Path],
+    max_files: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    seed: int = 0,
+) -> Dict[Tuple[str, int], Tuple[int, List[Path]]]:
+    """
+    Pick a stratified random sample of source files.
+
+    Files are grouped into strata by language and by size decile, and the
+    file budget is allocated to strata in proportion to their size (at least
+    one file per stratum while the budget allows). Strata are then drawn
+    round-robin until the byte budget is used up.
+
+    Args:
+        files: Candidate source files
+        max_files: Maximum number of files to sample
+        max_bytes: Maximum total bytes to sample
+        seed: Random seed for reproducible samples
+
+    Returns:
+        Mapping of (language, size decile) to (stratum size, sampled files)
+    """
+    sizes = {f: _file_size(f) for f in files}
+
+    # Size decile boundaries over all candidate files
+    sorted_sizes = sorted(sizes.values())
+    boundaries = [
+        sorted_sizes[min(len(sorted_sizes) - 1, (len(sorted_sizes) * i) // 10)]
+        for i in range(1, 10)
+    ] if sorted_sizes else []
+
+    strata: Dict[Tuple[str, int], List[Path]] = {}
+    for f in files:
+        language = detect_language(f) or "unknown"
+        decile = bisect.bisect_right(boundaries, sizes[f])
+        strata.setdefault((language, decile), []).append(f)
+
+    rng = random.Random(seed)
+    for members in strata.values():
+        rng.shuffle(members)
+
+    # Allocate the file budget proportionally, largest remainders first
+    total = len(files)
+    budget = total if max_files is None else min(max_files, total)
+    quotas: Dict[Tuple[str, int], int] = {}
+    if budget >= len(strata):
+        remainders = []
+        for key, members in strata.items():
+            share = budget * len(members) / total
+            quotas[key] = max(1, int(share))
+            remainders.append((share - int(share), key))
+        # Minimum-one quotas can overshoot the budget; trim the largest strata
+        while sum(quotas.values()) > budget:
+            key = max(quotas, key=lambda k: quotas[k])
+            quotas[key] -= 1
+        leftover = budget - sum(quotas.values())
+        for _, key in sorted(remainders, reverse=True):
+            if leftover <= 0:
+                break
+            if quotas[key] < len(strata[key]):
+                quotas[key] += 1
+                leftover -= 1
+    else:
+        # Fewer files than strata: one file from each of the largest strata
+        largest = sorted(strata, key=lambda k: len(strata[k]), reverse=True)
+        quotas = {key: (1 if key in largest[:budget] else 0) for key in strata}
+
+    # Draw round-robin across strata so the byte budget is spread evenly
+    sample: Dict[Tuple[str, int], List[Path]] = {key: [] for key in strata}
+    used_bytes = 0
+    depth = 0
+    while True:
+        progressed = False
+        for key, members in strata.items():
+            if depth >= quotas[key]:
+                continue
+            candidate = members[depth]
+            if max_bytes is not None and used_bytes + sizes[candidate] > max_bytes and used_bytes > 0:
+                continue
+            sample[key].append(candidate)
+            used_bytes += sizes[candidate]
+            progressed = True
+        if not progressed:
+            break
+        depth += 1
+
+    return {key: (len(strata[key]), sample[key]) for key in strata}
+
+
+def aggregate_halstead(
+    file_metrics: List[Optional[HalsteadMetrics]],
+) -> Optional[HalsteadMetrics]:
+    """
+    Aggregate per-file Halstead metrics into repository-level metrics.
+
+    Args:
+        file_metrics: Per-file metrics, None for files that could not be analyzed
+
+    Returns:
+        Aggregated HalsteadMetrics or None
+    """
+    total_volume = 0.0
+    total_difficulty = 0.0
+    total_effort = 0.0
+    total_time = 0.0
+    total_bugs = 0.0
+    file_count = 0
+
+    for metrics in file_metrics:
+        if metrics:
+            total_volume += metrics.volume
+            total_difficulty += metrics.difficulty
+            total_effort += metrics.effort
+            total_time += metrics.time_seconds
+            total_bugs += metrics.bugs
+            file_count += 1
 
     if file_count == 0:
         return None
@@ -489,4 +606,80 @@ def analyze_directory_halstead(repo_path: Path) -> Optional[HalsteadMetrics]:
         effort=total_effort,
         time_seconds=total_time,
         bugs=total_bugs,
+        files_analyzed=file_count,
+        files_total=len(file_metrics),
+    )
+
+
+def extrapolate_halstead(
+    observations: Dict[Tuple[str, int], Tuple[int, List[Optional[HalsteadMetrics]]]],
+    files_total: int,
+) -> Optional[HalsteadMetrics]:
+    """
+    Extrapolate repository-level Halstead metrics from a stratified sample.
+
+    Args:
+        observations: Mapping of stratum to (stratum size, per-file metrics of sampled files)
+        files_total: Number of candidate source files in the repository
+
+    Returns:
+        Extrapolated HalsteadMetrics or None
+    """
+    # Per-stratum rows: (volume, difficulty, effort, time, bugs, ok)
+    rows_by_stratum: Dict[Tuple[str, int], List[Tuple[float, float, float, float, float, int]]] = {}
+    for key, (_, sampled_metrics) in observations.items():
+        rows = []
+        for metrics in sampled_metrics:
+            if metrics:
+                rows.append((
+                    metrics.volume, metrics.difficulty, metrics.effort,
+                    metrics.time_seconds, metrics.bugs, 1,
+                ))
+            else:
+                rows.append((0.0, 0.0, 0.0, 0.0, 0.0, 0))
+        rows_by_stratum[key] = rows
+
+    all_rows = [row for rows in rows_by_stratum.values() for row in rows]
+    if not any(row[5] for row in all_rows):
+        return None
+
+    # Per-file means over the whole sample, used for strata left unsampled
+    overall_means = [sum(col) / len(all_rows) for col in zip(*all_rows)]
+
+    totals = [0.0] * 6
+    variance = 0.0
+    for key, (stratum_size, _) in observations.items():
+        rows = rows_by_stratum[key]
+        if not rows:
+            means = overall_means
+        else:
+            means = [sum(col) / len(rows) for col in zip(*rows)]
+            # Stratified variance of the volume total with finite population correction
+            if len(rows) > 1:
+                volume_var = sum((row[0] - means[0]) ** 2 for row in rows) / (len(rows) - 1)
+                variance += (
+                    stratum_size ** 2
+                    * (1 - len(rows) / stratum_size)
+                    * volume_var
+                    / len(rows)
+                )
+        for i in range(6):
+            totals[i] += stratum_size * means[i]
+
+    total_volume, total_difficulty, total_effort, total_time, total_bugs, est_files = totals
+    if est_files <= 0:
+        return None
+
+    return HalsteadMetrics(
+        vocabulary=0,  # Not meaningful at aggregate level
+        length=0,  # Not meaningful at aggregate level
+        calculated_length=0,  # Not meaningful at aggregate level
+        volume=total_volume,
+        difficulty=total_difficulty / est_files,
+        effort=total_effort,
+        time_seconds=total_time,
+        bugs=total_bugs,
+        files_analyzed=sum(row[5] for row in all_rows),
+        files_total=files_total,
+        sample_relative_error=math.sqrt(variance) / total_volume if total_volume > 0 else None,
     )
@@ -1,15 +1,48 @@
 """Repository health metrics from GitHub API."""
 
+import asyncio
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
 
 import httpx
 
+from ossval.http_client import RateLimitExceededError, TokenPool, cached_get, throttle
 from ossval.models import HealthMetrics
 
+# GitHub GraphQL API endpoint
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Repositories per GraphQL request; about 50 nodes keeps a query well within
+# GitHub's node and cost limits
+GRAPHQL_BATCH_SIZE = 50
+
+# Seconds to wait for more lookups before sending a partial batch
+GRAPHQL_BATCH_DELAY = 0.5
+
+# Fields fetched for every repository of a batch
+_HEALTH_FRAGMENT = """
+fragment health on Repository {
+  stargazerCount
+  forkCount
+  createdAt
+  pushedAt
+  isSecurityPolicyEnabled
+  licenseInfo { name }
+  fundingLinks { url }
+  issues(states: OPEN) { totalCount }
+  pullRequests(states: OPEN) { totalCount }
+}
+"""
+
+# Result of a batched lookup that has to fall back to the REST API
+_FAILED = object()
+
 
 async def analyze_health(
-    repository_url: str, github_token: Optional[str] = None
+    repository_url: str,
+    github_token: Optional[str] = None,
+    token_pool: Optional[TokenPool] = None,
 ) -> Optional[HealthMetrics]:
     """
     Analyze repository health metrics from GitHub API.
@@ -17,9 +50,14 @@ async def analyze_health(
     Args:
         repository_url: Repository URL (must be GitHub)
         github_token: Optional GitHub API token
+        token_pool: Optional rate-limit scheduler rotating several tokens;
+            replaces ``github_token``
 
     Returns:
         HealthMetrics if successful, None otherwise
+
+    Raises:
+        RateLimitExceededError: If the GitHub rate limit does not allow the lookup now
     """
     if not repository_url or "github.com" not in repository_url.lower():
         return None
@@ -29,84 +67,381 @@ async def analyze_health(
     if not owner or not repo:
         return None
 
-    headers = {}
-    if github_token:
-        headers["Authorization"] = f"token {github_token}"
+    if token_pool is None:
+        token_pool = TokenPool([github_token] if github_token else [])
 
     async with httpx.AsyncClient(timeout=10.0) as client:
+
+        async def get(url: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
+            return await token_pool.request(
+                lambda token: cached_get(
+                    url, headers=_auth_headers("token", token), params=params, client=client
+                )
+            )
+
         try:
             # Get repository info
             repo_url = f"https://api.github.com/repos/{owner}/{repo}"
-            repo_response = await client.get(repo_url, headers=headers)
+            repo_response = await get(repo_url)
 
             if repo_response.status_code != 200:
                 return None
 
             repo_data = repo_response.json()
 
-            # Get contributors
-            contributors_url = f"https://api.github.com/repos/{owner}/{repo}/contributors"
-            contributors_response = await client.get(
-                contributors_url, headers=headers, params={"per_page": 1, "anon": "true"}
-            )
+            contributors_count = await fetch_contributors_count(owner, repo, token_pool, client)
 
-            contributors_count = None
-            if contributors_response.status_code == 200:
-                # Get total count from Link header if available
-                link_header = contributors_response.headers.get("Link", "")
-                if link_header:
-                    # Try to extract count from Link header
-                    # This is a simplified approach
-                    contributors_data = contributors_response.json()
-                    contributors_count = len(contributors_data)
-                else:
-                    contributors_data = contributors_response.json()
-                    contributors_count = len(contributors_data)
-
-            # Calculate bus factor (number of contributors with significant commits)
-            # For now, use contributors_count as approximation
-            bus_factor = contributors_count
-
-            # Parse dates
-            created_date = None
-            if repo_data.get("created_at"):
-                created_date = datetime.fromisoformat(
-                    repo_data["created_at"].replace("Z", "+00:00")
-                )
-
-            last_commit_date = None
-            if repo_data.get("pushed_at"):
-                last_commit_date = datetime.fromisoformat(
-                    repo_data["pushed_at"].replace("Z", "+00:00")
-                )
-
-            # Check if actively maintained (commits in last 6 months)
-            is_actively_maintained = False
-            if last_commit_date:
-                six_months_ago = datetime.now(last_commit_date.tzinfo) - timedelta(days=180)
-                is_actively_maintained = last_commit_date > six_months_ago
-
-            return HealthMetrics(
+            return _build_health_metrics(
                 stars=repo_data.get("stargazers_count"),
                 forks=repo_data.get("forks_count"),
                 contributors_count=contributors_count,
                 open_issues=repo_data.get("open_issues_count"),
-                last_commit_date=last_commit_date,
-                created_date=created_date,
+                created_at=repo_data.get("created_at"),
+                pushed_at=repo_data.get("pushed_at"),
                 license=repo_data.get("license", {}).get("name") if repo_data.get("license") else None,
                 has_funding=repo_data.get("has_sponsorships", False),
                 has_security_policy=repo_data.get("security_and_analysis", {}).get(
                     "advanced_security", {}
                 ).get("status")
                 == "enabled",
-                bus_factor=bus_factor,
-                is_actively_maintained=is_actively_maintained,
             )
 
+        except RateLimitExceededError:
+            raise
         except Exception:
             return None
 
 
+async def fetch_contributors_count(
+    owner: str,
+    repo: str,
+    token_pool: TokenPool,
+    client: Optional[httpx.AsyncClient] = None,
+) -> Optional[int]:
+    """
+    Count the contributors of a GitHub repository with one REST request.
+
+    One contributor is listed per page, so the page number of the ``last``
+    link of the response is the number of contributors, anonymous ones
+    included.
+
+    Args:
+        owner: Repository owner
+        repo: Repository name
+        token_pool: Rate-limit scheduler of REST requests
+        client: Optional client to send the request with
+
+    Returns:
+        Number of contributors, or None if GitHub does not report it
+
+    Raises:
+        RateLimitExceededError: If the REST rate limit does not allow the request now
+    """
+    url = f"https://api.github.com/repos/{owner}/{repo}/contributors"
+    try:
+        response = await token_pool.request(
+            lambda token: cached_get(
+                url,
+                headers=_auth_headers("token", token),
+                params={"per_page": 1, "anon": "true"},
+                client=client,
+            )
+        )
+        if response.status_code != 200:
+            # 204 for empty repositories, 403 when the history is too large to list
+            return None
+        last = response.links.get("last")
+        if last:
+            page = parse_qs(urlparse(last["url"]).query).get("page")
+            return int(page[0]) if page else None
+        return len(response.json())
+    except RateLimitExceededError:
+        raise
+    except Exception:
+        return None
+
+
+async def fetch_health_batch(
+    repositories: List[Tuple[str, str]],
+    github_token: str,
+    endpoint: str = GITHUB_GRAPHQL_URL,
+    token_pool: Optional[TokenPool] = None,
+) -> Optional[Dict[Tuple[str, str], Optional[HealthMetrics]]]:
+    """
+    Fetch health metrics of several GitHub repositories with one GraphQL query.
+
+    Each repository is an aliased node of the query. The GraphQL API does not
+    report contributors, so ``contributors_count`` and ``bus_factor`` are left
+    unset; HealthBatcher fills them in with ``fetch_contributors_count``.
+
+    Args:
+        repositories: (owner, repo) pairs
+        github_token: GitHub API token (the GraphQL API requires one)
+        endpoint: GraphQL endpoint URL
+        token_pool: Optional rate-limit scheduler rotating several tokens;
+            replaces ``github_token``
+
+    Returns:
+        Mapping of (owner, repo) to HealthMetrics, or to None for repositories
+        that do not exist; repositories that failed otherwise are left out.
+        None if the request failed.
+
+    Raises:
+        RateLimitExceededError: If the GraphQL rate limit does not allow the query now
+    """
+    if not repositories:
+        return {}
+
+    variables: Dict[str, str] = {}
+    parameters = []
+    nodes = []
+    for index, (owner, repo) in enumerate(repositories):
+        variables[f"o{index}"] = owner
+        variables[f"n{index}"] = repo
+        parameters.append(f"$o{index}: String!, $n{index}: String!")
+        nodes.append(f"r{index}: repository(owner: $o{index}, name: $n{index}) {{ ...health }}")
+    query = (
+        f"query({', '.join(parameters)}) {{\n  " + "\n  ".join(nodes) + "\n}\n" + _HEALTH_FRAGMENT
+    )
+
+    if token_pool is None:
+        token_pool = TokenPool([github_token])
+    async with httpx.AsyncClient(timeout=30.0) as client:
+
+        async def post(token: Optional[str]) -> httpx.Response:
+            await throttle(endpoint)
+            return await client.post(
+                endpoint,
+                json={"query": query, "variables": variables},
+                headers=_auth_headers("bearer", token),
+            )
+
+        try:
+            response = await token_pool.request(post)
+            if response.status_code != 200:
+                return None
+            payload = response.json()
+        except RateLimitExceededError:
+            raise
+        except Exception:
+            return None
+
+    data = payload.get("data") or {}
+    if not data:
+        return None
+    missing = {
+        error["path"][0]
+        for error in payload.get("errors") or []
+        if error.get("type") == "NOT_FOUND" and error.get("path")
+    }
+
+    results: Dict[Tuple[str, str], Optional[HealthMetrics]] = {}
+    for index, repository in enumerate(repositories):
+        alias = f"r{index}"
+        node = data.get(alias)
+        if node:
+            try:
+                results[repository] = _health_from_graphql(node)
+            except Exception:
+                continue
+        elif alias in missing:
+            results[repository] = None
+    return results
+
+
+class HealthBatcher:
+    """
+    Batch health lookups of concurrently analyzed packages into GraphQL queries.
+
+    Lookups are queued and sent together once GRAPHQL_BATCH_SIZE repositories
+    are waiting, or GRAPHQL_BATCH_DELAY seconds after the first was queued.
+    Repositories a batch could not cover fall back to ``analyze_health``.
+    GraphQL does not report contributors, so each repository found also costs
+    one REST request for its contributor count.
+    """
+
+    def __init__(
+        self,
+        github_token: str,
+        batch_size: int = GRAPHQL_BATCH_SIZE,
+        delay: float = GRAPHQL_BATCH_DELAY,
+        endpoint: str = GITHUB_GRAPHQL_URL,
+        token_pool: Optional[TokenPool] = None,
+        rest_pool: Optional[TokenPool] = None,
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            github_token: GitHub API token
+            batch_size: Maximum repositories per GraphQL request
+            delay: Seconds to wait for more lookups before sending a partial batch
+            endpoint: GraphQL endpoint URL
+            token_pool: Optional scheduler of GraphQL requests
+            rest_pool: Optional scheduler of REST fallback requests; GitHub
+                keeps separate GraphQL and REST quotas
+        """
+        self.github_token = github_token
+        self.batch_size = batch_size
+        self.delay = delay
+        self.endpoint = endpoint
+        self.token_pool = token_pool or TokenPool([github_token])
+        self.rest_pool = rest_pool or TokenPool([github_token])
+        # Number of GraphQL requests sent
+        self.requests = 0
+        self._queue: Dict[Tuple[str, str], Tuple[Tuple[str, str], asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def fetch(self, repository_url: str) -> Optional[HealthMetrics]:
+        """
+        Get health metrics of a GitHub repository through the next batch.
+
+        Args:
+            repository_url: Repository URL (must be GitHub)
+
+        Returns:
+            HealthMetrics if successful, None otherwise
+
+        Raises:
+            RateLimitExceededError: If neither the GraphQL nor the REST rate limit
+                allows the lookup now
+        """
+        owner, repo = _extract_github_repo(repository_url)
+        if not owner or not repo:
+            return None
+
+        # Lookups of the same repository share one node
+        key = (owner.lower(), repo.lower())
+        loop = asyncio.get_running_loop()
+        if key in self._queue:
+            future = self._queue[key][1]
+        else:
+            future = loop.create_future()
+            self._queue[key] = ((owner, repo), future)
+            if len(self._queue) >= self.batch_size:
+                self._send()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.delay, self._send)
+
+        result = await asyncio.shield(future)
+        if result is _FAILED:
+            return await analyze_health(repository_url, token_pool=self.rest_pool)
+        if result is not None:
+            contributors_count = await fetch_contributors_count(owner, repo, self.rest_pool)
+            # Same bus factor approximation as _build_health_metrics
+            result = result.model_copy(
+                update={"contributors_count": contributors_count, "bus_factor": contributors_count}
+            )
+        return result
+
+    def _send(self) -> None:
+        """Send the queued lookups as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._queue = self._queue, {}
+        if batch:
+            task = asyncio.ensure_future(self._query(list(batch.values())))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _query(self, batch: List[Tuple[Tuple[str, str], asyncio.Future]]) -> None:
+        """Run a batch query and resolve the futures of its lookups."""
+        self.requests += 1
+        try:
+            results = await fetch_health_batch(
+                [repository for repository, _ in batch],
+                self.github_token,
+                self.endpoint,
+                self.token_pool,
+            )
+        except Exception:
+            # Including RateLimitExceededError: the REST quota may still allow the lookups
+            results = None
+        for repository, future in batch:
+            if future.done():
+                continue
+            if results is None or repository not in results:
+                future.set_result(_FAILED)
+            else:
+                future.set_result(results[repository])
+
+
+def _auth_headers(scheme: str, token: Optional[str]) -> Dict[str, str]:
+    """Authorization header for a token, or no headers for anonymous requests."""
+    return {"Authorization": f"{scheme} {token}"} if token else {}
+
+
+def _health_from_graphql(node: Dict[str, Any]) -> HealthMetrics:
+    """Build HealthMetrics from a GraphQL repository node."""
+    open_issues = None
+    if node.get("issues") or node.get("pullRequests"):
+        # Like the REST API, count open pull requests as open issues
+        open_issues = (node.get("issues") or {}).get("totalCount", 0) + (
+            node.get("pullRequests") or {}
+        ).get("totalCount", 0)
+    return _build_health_metrics(
+        stars=node.get("stargazerCount"),
+        forks=node.get("forkCount"),
+        # Not available through GraphQL (mentionable users are a different
+        # population); HealthBatcher adds it from the REST API
+        contributors_count=None,
+        open_issues=open_issues,
+        created_at=node.get("createdAt"),
+        pushed_at=node.get("pushedAt"),
+        license=(node.get("licenseInfo") or {}).get("name"),
+        has_funding=bool(node.get("fundingLinks")),
+        has_security_policy=node.get("isSecurityPolicyEnabled"),
+    )
+
+
+def _build_health_metrics(
+    stars: Optional[int],
+    forks: Optional[int],
+    contributors_count: Optional[int],
+    open_issues: Optional[int],
+    created_at: Optional[str],
+    pushed_at: Optional[str],
+    license: Optional[str],
+    has_funding: Optional[bool],
+    has_security_policy: Optional[bool],
+) -> HealthMetrics:
+    """Build HealthMetrics from repository fields, deriving dates and maintenance status."""
+    # Calculate bus factor (number of contributors with significant commits)
+    # For now, use contributors_count as approximation
+    bus_factor = contributors_count
+
+    # Parse dates
+    created_date = None
+    if created_at:
+        created_date = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+
+    last_commit_date = None
+    if pushed_at:
+        last_commit_date = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
+
+    # Check if actively maintained (commits in last 6 months)
+    is_actively_maintained = False
+    if last_commit_date:
+        six_months_ago = datetime.now(last_commit_date.tzinfo) - timedelta(days=180)
+        is_actively_maintained = last_commit_date > six_months_ago
+
+    return HealthMetrics(
+        stars=stars,
+        forks=forks,
+        contributors_count=contributors_count,
+        open_issues=open_issues,
+        last_commit_date=last_commit_date,
+        created_date=created_date,
+        license=license,
+        has_funding=has_funding,
+        has_security_policy=has_security_policy,
+        bus_factor=bus_factor,
+        is_actively_maintained=is_actively_maintained,
+    )
+
+
 def _extract_github_repo(repository_url: str) -> tuple[Optional[str], Optional[str]]:
     """Extract owner and repo name from GitHub URL."""
     import re
@@ -0,0 +1,286 @@
+"""Repository URL discovery from package metadata installed on this machine."""
+
+import json
+import os
+import re
+import site
+import sys
+import threading
+from email.parser import BytesHeaderParser
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import tomllib  # Python 3.11+
+except ImportError:
+    try:
+        import tomli as tomllib  # For Python < 3.11
+    except ImportError:
+        tomllib = None
+
+from ossval.analyzers.urls import (
+    normalize_pypi_name,
+    normalize_repository_url,
+    pom_scm_url,
+    repository_from_pypi_info,
+)
+
+# Cargo registry source directories are named <crate>-<version>
+_CARGO_DIR_NAME = re.compile(r"^(?P<name>.+?)-(?P<version>\d+\.\d+\.\d+.*)$")
+
+
+class LocalMetadataIndex:
+    """
+    Index of repository URLs in the package metadata of local installs.
+
+    Covers ``node_modules`` of the project directories, Python
+    ``site-packages`` ``*.dist-info/METADATA``, ``~/.cargo/registry``,
+    ``~/.m2/repository`` POMs and the Go module cache. The npm, PyPI and
+    Cargo stores are listed once, on the first lookup of their ecosystem, into
+    a name -> install directory mapping; Maven and Go metadata live at paths
+    derived from the coordinates. Metadata files are only read on lookup,
+    and each result is memoized, so lookups are O(1) after the first.
+    """
+
+    def __init__(
+        self,
+        project_dirs: Iterable[Path] = (),
+        site_dirs: Optional[Iterable[Path]] = None,
+        home: Optional[Path] = None,
+        gomodcache: Optional[Path] = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            project_dirs: Directories whose ``node_modules`` and virtualenvs are indexed
+            site_dirs: Python site-packages directories (default: those of this interpreter)
+            home: Home directory holding ``.cargo`` and ``.m2`` (default: the user's)
+            gomodcache: Go module cache (default: $GOMODCACHE or $GOPATH/pkg/mod)
+        """
+        self.project_dirs = [Path(path) for path in project_dirs]
+        self.home = Path(home) if home else Path.home()
+        self.site_dirs = (
+            [Path(path) for path in site_dirs] if site_dirs is not None else _default_site_dirs()
+        )
+        self.gomodcache = Path(gomodcache) if gomodcache else _default_gomodcache(self.home)
+        # ecosystem -> name -> install directories or metadata files
+        self._stores: Dict[str, Dict[str, List[Path]]] = {}
+        self._results: Dict[Tuple[str, str, Optional[str]], Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    def lookup(
+        self, package_name: str, ecosystem: str, version: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Find the repository URL of a package in local install metadata.
+
+        Args:
+            package_name: Package name
+            ecosystem: Package ecosystem (pypi, npm, cargo, maven, go)
+            version: Optional package version; the version installed locally
+                is preferred, any installed version is used otherwise
+
+        Returns:
+            Normalized repository URL if found, None otherwise
+        """
+        key = (ecosystem, package_name, version)
+        with self._lock:
+            if key not in self._results:
+                try:
+                    self._results[key] = self._resolve(package_name, ecosystem, version)
+                except Exception:
+                    self._results[key] = None
+            return self._results[key]
+
+    def _resolve(self, name: str, ecosystem: str, version: Optional[str]) -> Optional[str]:
+        if ecosystem == "npm":
+            return self._find_npm(name, version)
+        if ecosystem == "pypi":
+            return self._find_pypi(name, version)
+        if ecosystem == "cargo":
+            return self._find_cargo(name, version)
+        if ecosystem == "maven":
+            return self._find_maven(name, version)
+        if ecosystem == "go":
+            return self._find_go(name, version)
+        return None
+
+    def _store(self, ecosystem: str) -> Dict[str, List[Path]]:
+        """List an ecosystem's install directories on first use."""
+        if ecosystem not in self._stores:
+            if ecosystem == "npm":
+                store = _list_node_modules(self.project_dirs)
+            elif ecosystem == "pypi":
+                store = _list_dist_info(self.site_dirs + _project_site_dirs(self.project_dirs))
+            else:
+                store = _list_cargo_registry(self.home / ".cargo" / "registry" / "src")
+            self._stores[ecosystem] = store
+        return self._stores[ecosystem]
+
+    def _find_npm(self, name: str, version: Optional[str]) -> Optional[str]:
+        manifests = []
+        for package_dir in self._store("npm").get(name, []):
+            with open(package_dir / "package.json", encoding="utf-8") as f:
+                manifests.append(json.load(f))
+        for manifest in _prefer_version(manifests, version, lambda m: m.get("version")):
+            repository = manifest.get("repository")
+            if isinstance(repository, dict):
+                repository = repository.get("url")
+            url = normalize_repository_url(repository)
+            if url:
+                return url
+        return None
+
+    def _find_pypi(self, name: str, version: Optional[str]) -> Optional[str]:
+        dists = []
+        for dist_info in self._store("pypi").get(normalize_pypi_name(name), []):
+            with open(dist_info / "METADATA", "rb") as f:
+                dists.append(BytesHeaderParser().parse(f))
+        for metadata in _prefer_version(dists, version, lambda m: m.get("Version")):
+            project_urls = {}
+            for entry in metadata.get_all("Project-URL") or []:
+                label, _, url = entry.partition(",")
+                project_urls[label.strip()] = url.strip()
+            url = repository_from_pypi_info(
+                {"project_urls": project_urls, "home_page": metadata.get("Home-page")}
+            )
+            if url:
+                return url
+        return None
+
+    def _find_cargo(self, name: str, version: Optional[str]) -> Optional[str]:
+        if tomllib is None:
+            return None
+        manifests = []
+        for crate_dir in self._store("cargo").get(name, []):
+            with open(crate_dir / "Cargo.toml", "rb") as f:
+                manifests.append(tomllib.load(f).get("package", {}))
+        for manifest in _prefer_version(manifests, version, lambda m: m.get("version")):
+            url = normalize_repository_url(manifest.get("repository"))
+            if url:
+                return url
+        return None
+
+    def _find_maven(self, name: str, version: Optional[str]) -> Optional[str]:
+        group, _, artifact = name.partition(":")
+        artifact = artifact.split(":")[0]
+        if not group or not artifact:
+            return None
+        artifact_dir = self.home / ".m2" / "repository" / Path(*group.split(".")) / artifact
+        if not artifact_dir.is_dir():
+            return None
+        versions = [version] if version and (artifact_dir / version).is_dir() else []
+        versions += sorted(
+            (path.name for path in artifact_dir.iterdir() if path.is_dir()), reverse=True
+        )
+        for candidate in versions:
+            pom = artifact_dir / candidate / f"{artifact}-{candidate}.pom"
+            if pom.is_file():
+                url = normalize_repository_url(pom_scm_url(pom))
+                if url:
+                    return url
+        return None
+
+    def _find_go(self, name: str, version: Optional[str]) -> Optional[str]:
+        # Module paths are stored case-encoded: "A" becomes "!a"
+        escaped = re.sub(r"[A-Z]", lambda m: "!" + m.group(0).lower(), name)
+        versions_dir = self.gomodcache / "cache" / "download" / escaped / "@v"
+        if not versions_dir.is_dir():
+            return None
+        infos = sorted(versions_dir.glob("*.info"), reverse=True)
+        if version:
+            infos.sort(key=lambda path: path.stem != version)
+        for info in infos:
+            with open(info, encoding="utf-8") as f:
+                origin = json.load(f).get("Origin") or {}
+            url = normalize_repository_url(origin.get("URL"))
+            if url:
+                return url
+        return None
+
+
+def _prefer_version(items: List, version: Optional[str], get_version) -> List:
+    """Order metadata so that the requested version comes first."""
+    return sorted(items, key=lambda item: get_version(item) != version) if version else items
+
+
+def _list_node_modules(project_dirs: List[Path]) -> Dict[str, List[Path]]:
+    """Map package names to install directories in (nested) node_modules."""
+    store: Dict[str, List[Path]] = {}
+    pending = [project_dir / "node_modules" for project_dir in project_dirs]
+    while pending:
+        node_modules = pending.pop()
+        if not node_modules.is_dir():
+            continue
+        for entry in node_modules.iterdir():
+            if entry.name.startswith("@") and entry.is_dir():
+                package_dirs = [(f"{entry.name}/{sub.name}", sub) for sub in entry.iterdir()]
+            else:
+                package_dirs = [(entry.name, entry)]
+            for name, package_dir in package_dirs:
+                if (package_dir / "package.json").is_file():
+                    store.setdefault(name, []).append(package_dir)
+                    pending.append(package_dir / "node_modules")
+    return store
+
+
+def _list_dist_info(site_dirs: List[Path]) -> Dict[str, List[Path]]:
+    """Map normalized distribution names to ``*.dist-info`` directories."""
+    store: Dict[str, List[Path]] = {}
+    for site_dir in dict.fromkeys(site_dirs):
+        if not site_dir.is_dir():
+            continue
+        for dist_info in site_dir.glob("*.dist-info"):
+            if not (dist_info / "METADATA").is_file():
+                continue
+            # Directory names are <name>-<version>.dist-info with "-" in names escaped
+            name = dist_info.name[: -len(".dist-info")].rsplit("-", 1)[0]
+            store.setdefault(normalize_pypi_name(name), []).append(dist_info)
+    return store
+
+
+def _list_cargo_registry(registry_src: Path) -> Dict[str, List[Path]]:
+    """Map crate names to unpacked crate directories of the Cargo registry."""
+    store: Dict[str, List[Path]] = {}
+    if not registry_src.is_dir():
+        return store
+    for index_dir in registry_src.iterdir():
+        if not index_dir.is_dir():
+            continue
+        for crate_dir in index_dir.iterdir():
+            match = _CARGO_DIR_NAME.match(crate_dir.name)
+            if match and (crate_dir / "Cargo.toml").is_file():
+                store.setdefault(match.group("name"), []).append(crate_dir)
+    return store
+
+
+def _default_site_dirs() -> List[Path]:
+    """Site-packages directories of this interpreter."""
+    dirs = []
+    try:
+        dirs.extend(site.getsitepackages())
+        dirs.append(site.getusersitepackages())
+    except AttributeError:
+        # Some virtualenv versions do not provide getsitepackages()
+        pass
+    dirs.extend(path for path in sys.path if path.endswith(("site-packages", "dist-packages")))
+    return [Path(path) for path in dict.fromkeys(dirs)]
+
+
+def _project_site_dirs(project_dirs: List[Path]) -> List[Path]:
+    """Site-packages directories of virtualenvs inside the project directories."""
+    dirs = []
+    for project_dir in project_dirs:
+        for venv in (".venv", "venv"):
+            dirs.extend((project_dir / venv).glob("lib/python*/site-packages"))
+            dirs.append(project_dir / venv / "Lib" / "site-packages")
+    return dirs
+
+
+def _default_gomodcache(home: Path) -> Path:
+    """Go module cache location, following the go command's defaults."""
+    if os.environ.get("GOMODCACHE"):
+        return Path(os.environ["GOMODCACHE"])
+    gopath = os.environ.get("GOPATH", "").split(os.pathsep)[0]
+    return Path(gopath or home / "go") / "pkg" / "mod"
@@ -0,0 +1,254 @@
+"""Maven repository URL resolution from POM ``<scm>`` sections and their parent chain."""
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ossval.analyzers.urls import normalize_repository_url
+from ossval.cache import AnalysisCache, cache_key
+from ossval.http_client import cached_get
+from ossval.singleflight import SingleFlight
+
+MAVEN_CENTRAL = "https://repo1.maven.org/maven2"
+
+# Cache namespace of parsed POMs
+POM_NAMESPACE = "pom"
+
+# Parent POMs followed before giving up (guards against cycles)
+MAX_PARENT_DEPTH = 10
+
+_PROPERTY = re.compile(r"\$\{([^}]+)\}")
+
+Coordinates = Tuple[str, str, str]
+
+
+class MavenResolver:
+    """
+    Resolve Maven artifacts to repositories from the ``<scm>`` of their POMs.
+
+    POMs are looked up in ``~/.m2/repository``, then in the configured
+    repositories (local directories laid out like a Maven repository, or
+    repository base URLs), then in Maven Central. An artifact without
+    ``<scm>`` inherits it from a parent POM that aggregates it as a module;
+    the ``<scm>`` of organization parents such as ``org.apache:apache``
+    describes the parent project itself and is not used.
+
+    Parsed POMs are memoized in-process and in the ``pom`` cache namespace,
+    so parents shared by thousands of artifacts are fetched and parsed once,
+    and concurrent lookups of the same POM share one fetch.
+    """
+
+    def __init__(
+        self,
+        repositories: Iterable[str] = (),
+        home: Optional[Path] = None,
+        cache: Optional[AnalysisCache] = None,
+        central: bool = True,
+    ):
+        """
+        Initialize the resolver.
+
+        Args:
+            repositories: Additional repository directories or base URLs, searched in order
+            home: Home directory holding ``.m2`` (default: the user's)
+            cache: Optional AnalysisCache for parsed POMs
+            central: Whether to fall back to Maven Central
+        """
+        home = Path(home) if home else Path.home()
+        self.repositories: List[Union[str, Path]] = [home / ".m2" / "repository"]
+        for repository in repositories:
+            if repository.startswith(("http://", "https://")):
+                self.repositories.append(repository.rstrip("/"))
+            else:
+                self.repositories.append(Path(repository).expanduser())
+        if central:
+            self.repositories.append(MAVEN_CENTRAL)
+        self.cache = cache
+        self._poms: Dict[Coordinates, Optional[Dict[str, Any]]] = {}
+        self._flights = SingleFlight()
+
+    async def resolve(self, name: str, version: Optional[str] = None) -> Optional[str]:
+        """
+        Find the repository URL of a Maven artifact.
+
+        Args:
+            name: Coordinates as ``group:artifact`` (further segments are ignored)
+            version: Artifact version; the latest release is used when missing
+
+        Returns:
+            Normalized repository URL if found, None otherwise
+        """
+        group, _, artifact = name.partition(":")
+        artifact = artifact.split(":")[0]
+        if not group or not artifact:
+            return None
+        version = version or await self._latest_version(group, artifact)
+        if not version:
+            return None
+
+        pom = await self.pom(group, artifact, version)
+        inherited = False
+        for _ in range(MAX_PARENT_DEPTH):
+            if pom is None:
+                return None
+            if pom["scm"] and (not inherited or pom["modules"]):
+                return normalize_repository_url(pom["scm"])
+            if pom["scm"] or not pom["parent"]:
+                # An organization parent's <scm> is its own repository
+                return None
+            inherited = True
+            pom = await self.pom(*pom["parent"])
+        return None
+
+    async def pom(self, group: str, artifact: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a parsed POM.
+
+        Args:
+            group: Group ID
+            artifact: Artifact ID
+            version: Version
+
+        Returns:
+            Dictionary with ``scm`` (URL or None), ``parent`` (coordinates or
+            None) and ``modules`` (whether it aggregates modules), or None if
+            the POM was not found
+        """
+        coordinates = (group, artifact, version)
+        if coordinates not in self._poms:
+            self._poms[coordinates] = await self._flights.do(
+                coordinates, lambda: self._load_pom(coordinates)
+            )
+        return self._poms[coordinates]
+
+    async def _load_pom(self, coordinates: Coordinates) -> Optional[Dict[str, Any]]:
+        """Load a POM from the cache or the repositories."""
+        key = cache_key(*coordinates)
+        if self.cache is not None:
+            cached = self.cache.get(key, POM_NAMESPACE)
+            if cached is not None:
+                # JSON stores the parent coordinates as a list
+                if cached.get("parent"):
+                    cached["parent"] = tuple(cached["parent"])
+                return cached
+        group, artifact, version = coordinates
+        path = f"{group.replace('.', '/')}/{artifact}/{version}/{artifact}-{version}.pom"
+        content = await self._fetch(path)
+        if content is None:
+            return None
+        try:
+            pom = _parse_pom(content, coordinates)
+        except ET.ParseError:
+            return None
+        if self.cache is not None:
+            # Released POMs never change
+            self.cache.set(key, pom, POM_NAMESPACE)
+        return pom
+
+    async def _fetch(self, path: str) -> Optional[bytes]:
+        """Read a file from the first repository that has it."""
+        for repository in self.repositories:
+            try:
+                if isinstance(repository, Path):
+                    file = repository / path
+                    if file.is_file():
+                        return file.read_bytes()
+                    continue
+                response = await cached_get(f"{repository}/{path}", timeout=10.0)
+                if response.status_code == 200:
+                    return response.content
+            except Exception:
+                continue
+        return None
+
+    async def _latest_version(self, group: str, artifact: str) -> Optional[str]:
+        """Latest release of an artifact from ``maven-metadata.xml`` or the local layout."""
+        artifact_path = f"{group.replace('.', '/')}/{artifact}"
+        for repository in self.repositories:
+            if isinstance(repository, Path):
+                artifact_dir = repository / artifact_path
+                if artifact_dir.is_dir():
+                    versions = sorted(
+                        (p.name for p in artifact_dir.iterdir() if p.is_dir()),
+                        key=version_key,
+                    )
+                    if versions:
+                        return versions[-1]
+                continue
+            try:
+                response = await cached_get(
+                    f"{repository}/{artifact_path}/maven-metadata.xml", timeout=10.0
+                )
+                if response.status_code != 200:
+                    continue
+                versioning = ET.fromstring(response.content).find("versioning")
+                if versioning is None:
+                    continue
+                for tag in ("release", "latest"):
+                    element = versioning.find(tag)
+                    if element is not None and element.text:
+                        return element.text.strip()
+            except Exception:
+                continue
+        return None
+
+
+def _parse_pom(content: bytes, coordinates: Coordinates) -> Dict[str, Any]:
+    """Extract the SCM URL, parent coordinates and module aggregation of a POM."""
+    root = ET.fromstring(content)
+    ns = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+
+    def text(element: Optional[ET.Element], tag: str) -> Optional[str]:
+        child = element.find(f"{ns}{tag}") if element is not None else None
+        return child.text.strip() if child is not None and child.text else None
+
+    parent_element = root.find(f"{ns}parent")
+    parent: Optional[Coordinates] = None
+    if parent_element is not None:
+        group_id, artifact_id, version_id = (
+            text(parent_element, tag) for tag in ("groupId", "artifactId", "version")
+        )
+        if group_id and artifact_id and version_id:
+            parent = (group_id, artifact_id, version_id)
+
+    group, artifact, version = coordinates
+    properties = {
+        "project.groupId": group,
+        "project.artifactId": artifact,
+        "project.version": version,
+        "groupId": group,
+        "artifactId": artifact,
+        "version": version,
+    }
+    properties_element = root.find(f"{ns}properties")
+    if properties_element is not None:
+        for prop in properties_element:
+            if prop.text:
+                properties[prop.tag[len(ns):]] = prop.text.strip()
+
+    scm = None
+    scm_element = root.find(f"{ns}scm")
+    for field in ("url", "connection", "developerConnection"):
+        value = text(scm_element, field)
+        if value:
+            value = _PROPERTY.sub(lambda m: properties.get(m.group(1), m.group(0)), value)
+            # Properties of a parent POM are not resolved
+            if "${" not in value and normalize_repository_url(value):
+                scm = value
+                break
+
+    modules = root.find(f"{ns}modules")
+    return {
+        "scm": scm,
+        "parent": parent,
+        "modules": modules is not None and len(modules) > 0,
+    }
+
+
+def version_key(version: str) -> Tuple:
+    """Sort key ordering numeric version segments numerically."""
+    return tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.split(r"[.-]", version)
+    )
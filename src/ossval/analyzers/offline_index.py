@@ -0,0 +1,267 @@
+"""Offline (ecosystem, name) -> repository URL index built from bulk registry exports."""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tarfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from ossval.analyzers.maven_resolver import version_key
+from ossval.analyzers.urls import (
+    normalize_pypi_name,
+    normalize_repository_url,
+    pom_scm_url,
+    repository_from_pypi_info,
+)
+
+# Rows written per transaction batch while building
+_BATCH_SIZE = 10_000
+
+_SCHEMA = """
+CREATE TABLE repos (
+    ecosystem TEXT NOT NULL,
+    name TEXT NOT NULL,
+    url TEXT NOT NULL,
+    PRIMARY KEY (ecosystem, name)
+) WITHOUT ROWID
+"""
+
+
+def default_index_path() -> Path:
+    """Default location of the offline index (next to the analysis cache)."""
+    return Path.home() / ".cache" / "ossval" / "registry-index.sqlite"
+
+
+def normalize_name(ecosystem: str, name: str) -> str:
+    """Normalize a package name the way its registry compares names."""
+    if ecosystem == "pypi":
+        return normalize_pypi_name(name)
+    if ecosystem == "cargo":
+        # crates.io treats "-" and "_" as the same and ignores case
+        return name.lower().replace("_", "-")
+    return name
+
+
+class OfflineIndex:
+    """Read-only SQLite index of repository URLs by (ecosystem, name)."""
+
+    def __init__(self, path: str | Path):
+        """
+        Open an index.
+
+        Args:
+            path: Path of an index written by build_index
+        """
+        self.path = Path(path)
+        self._connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def lookup(self, package_name: str, ecosystem: str) -> Optional[str]:
+        """
+        Find the repository URL of a package.
+
+        Args:
+            package_name: Package name
+            ecosystem: Package ecosystem (npm, pypi, cargo, maven)
+
+        Returns:
+            Repository URL if indexed, None otherwise
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url FROM repos WHERE ecosystem = ? AND name = ?",
+                (ecosystem, normalize_name(ecosystem, package_name)),
+            ).fetchone()
+        return row[0] if row else None
+
+    def counts(self) -> Dict[str, int]:
+        """Number of indexed packages per ecosystem."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT ecosystem, COUNT(*) FROM repos GROUP BY ecosystem ORDER BY ecosystem"
+            ).fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """Close the index."""
+        self._connection.close()
+
+
+def build_index(
+    output: str | Path,
+    npm: Iterable[str | Path] = (),
+    pypi: Iterable[str | Path] = (),
+    crates: Iterable[str | Path] = (),
+    maven: Iterable[str | Path] = (),
+) -> Dict[str, int]:
+    """
+    Build an offline index from bulk registry metadata exports.
+
+    Supported inputs:
+
+    - npm: JSON lines of packuments, as written by replicating the registry
+      (``{"doc": {...}}`` rows of ``_all_docs?include_docs=true`` also work)
+    - pypi: JSON lines of PyPI JSON API documents (``{"info": {...}}``) or of
+      flat rows with ``name``, ``project_urls`` and ``home_page``
+    - crates: the crates.io database dump (``db-dump.tar.gz``) or its
+      ``crates.csv``; the crates.io index repository has no repository URLs
+    - maven: directories of POMs laid out like a Maven repository
+
+    Inputs may be gzip-compressed. The index is written to a temporary file
+    and moved into place, so readers never see a partial index.
+
+    Args:
+        output: Path of the index to write
+        npm: npm export files
+        pypi: PyPI export files
+        crates: crates.io dumps
+        maven: Maven repository directories
+
+    Returns:
+        Number of indexed packages per ecosystem
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    partial = output.with_name(output.name + ".partial")
+    if partial.exists():
+        partial.unlink()
+
+    sources = [
+        ("npm", path, _read_npm) for path in npm
+    ] + [
+        ("pypi", path, _read_pypi) for path in pypi
+    ] + [
+        ("cargo", path, _read_crates) for path in crates
+    ] + [
+        ("maven", path, _read_maven) for path in maven
+    ]
+
+    counts: Dict[str, int] = {}
+    connection = sqlite3.connect(partial)
+    try:
+        connection.execute("PRAGMA journal_mode = OFF")
+        connection.execute("PRAGMA synchronous = OFF")
+        connection.execute(_SCHEMA)
+        for ecosystem, path, reader in sources:
+            batch = []
+            for name, url in reader(Path(path)):
+                url = normalize_repository_url(url)
+                if not name or not url:
+                    continue
+                batch.append((ecosystem, normalize_name(ecosystem, name), url))
+                if len(batch) >= _BATCH_SIZE:
+                    _insert(connection, batch)
+                    batch = []
+            _insert(connection, batch)
+        connection.commit()
+        counts = dict(
+            connection.execute("SELECT ecosystem, COUNT(*) FROM repos GROUP BY ecosystem")
+        )
+        connection.execute("VACUUM")
+        connection.close()
+        os.replace(partial, output)
+    except BaseException:
+        connection.close()
+        partial.unlink(missing_ok=True)
+        raise
+    return counts
+
+
+def _insert(connection: sqlite3.Connection, rows: list) -> None:
+    """Insert a batch of rows, later exports overriding earlier ones."""
+    if rows:
+        connection.executemany("INSERT OR REPLACE INTO repos VALUES (?, ?, ?)", rows)
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    """Open a possibly gzip-compressed text file."""
+    if path.suffix == ".gz":
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _json_lines(path: Path) -> Iterator[Dict[str, Any]]:
+    """Objects of a JSON lines file, skipping malformed lines."""
+    with _open_text(path) as f:
+        for line in f:
+            line = line.strip().rstrip(",")
+            if not line.startswith("{"):
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _read_npm(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    for document in _json_lines(path):
+        document = document.get("doc", document)
+        repository = document.get("repository")
+        if repository is None:
+            latest = (document.get("dist-tags") or {}).get("latest")
+            repository = ((document.get("versions") or {}).get(latest) or {}).get("repository")
+        if isinstance(repository, dict):
+            repository = repository.get("url")
+        yield document.get("name") or document.get("_id"), repository
+
+
+def _read_pypi(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    for document in _json_lines(path):
+        info = document.get("info", document)
+        project_urls = info.get("project_urls") or {}
+        if isinstance(project_urls, list):
+            # BigQuery-style rows hold "Label, URL" strings
+            project_urls = dict(
+                (part.strip() for part in entry.split(",", 1))
+                for entry in project_urls
+                if "," in entry
+            )
+        yield info.get("name"), repository_from_pypi_info(
+            {"project_urls": project_urls, "home_page": info.get("home_page")}
+        )
+
+
+def _read_crates(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    csv.field_size_limit(2**31 - 1)
+    if path.name.endswith((".tar.gz", ".tgz")):
+        with tarfile.open(path, "r:gz") as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith("/data/crates.csv"):
+                    with io.TextIOWrapper(archive.extractfile(member), encoding="utf-8") as f:
+                        yield from _crates_rows(f)
+                    return
+        return
+    with _open_text(path) as f:
+        yield from _crates_rows(f)
+
+
+def _crates_rows(f: io.TextIOBase) -> Iterator[Tuple[str, Optional[str]]]:
+    for row in csv.DictReader(f):
+        yield row.get("name"), row.get("repository") or row.get("homepage")
+
+
+def _read_maven(path: Path) -> Iterator[Tuple[str, Optional[str]]]:
+    # Versions of an artifact are read oldest first, so the newest POM with
+    # an <scm> overrides older ones
+    poms = sorted(
+        path.rglob("*.pom"),
+        key=lambda pom: (pom.parent.parent, version_key(pom.parent.name)),
+    )
+    for pom in poms:
+        # <repository>/<group path>/<artifact>/<version>/<artifact>-<version>.pom
+        version_dir = pom.parent
+        artifact_dir = version_dir.parent
+        try:
+            group = ".".join(artifact_dir.parent.relative_to(path).parts)
+            url = pom_scm_url(pom)
+        except Exception:
+            continue
+        if group:
+            yield f"{group}:{artifact_dir.name}", url
@@ -1,7 +1,100 @@
-"""Repository URL discovery using purl2src."""
+"""Repository URL discovery from metadata indexes, registries and published artifacts."""
 
-import subprocess
-from typing import Optional
+import io
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from ossval.analyzers.artifact_resolver import artifact_client, resolve_purls
+from ossval.analyzers.go_resolver import GoResolver
+from ossval.analyzers.local_metadata import LocalMetadataIndex
+from ossval.analyzers.maven_resolver import MavenResolver
+from ossval.analyzers.offline_index import OfflineIndex
+from ossval.analyzers.urls import is_valid_git_url, normalize_git_url, repository_from_pypi_info
+from ossval.http_client import cached_get
+from ossval.parsers.json_stream import JsonStreamReader
+
+# Index of local install metadata consulted before the registries; None disables it
+_local_index: Optional[LocalMetadataIndex] = None
+
+# Offline index built from bulk registry exports, consulted first; None disables it
+_offline_index: Optional[OfflineIndex] = None
+
+
+def set_offline_index(index: Optional[OfflineIndex]) -> None:
+    """
+    Set the offline registry index consulted before any other lookup.
+
+    Args:
+        index: OfflineIndex to use, or None to disable it
+    """
+    global _offline_index
+    _offline_index = index
+
+
+def set_local_metadata_index(index: Optional[LocalMetadataIndex]) -> None:
+    """
+    Set the local install metadata index consulted before registry lookups.
+
+    Args:
+        index: LocalMetadataIndex to use, or None to go to the registries directly
+    """
+    global _local_index
+    _local_index = index
+
+
+# Resolver of Maven artifacts from their POMs; created on first use if not set
+_maven_resolver: Optional[MavenResolver] = None
+
+
+def set_maven_resolver(resolver: Optional[MavenResolver]) -> None:
+    """
+    Set the resolver used for Maven artifacts.
+
+    Args:
+        resolver: MavenResolver to use, or None for a default one (Maven Central
+            and ``~/.m2``, without a disk cache) created on first use
+    """
+    global _maven_resolver
+    _maven_resolver = resolver
+
+
+# Resolver of Go module paths; created on first use if not set
+_go_resolver: Optional[GoResolver] = None
+
+
+def set_go_resolver(resolver: Optional[GoResolver]) -> None:
+    """
+    Set the resolver used for Go modules.
+
+    Args:
+        resolver: GoResolver to use, or None for a default one (without a
+            disk cache) created on first use
+    """
+    global _go_resolver
+    _go_resolver = resolver
+
+
+# Client that artifact downloads are sent over while an artifact session is open
+_artifact_client: Optional[httpx.AsyncClient] = None
+
+
+@asynccontextmanager
+async def artifact_session() -> AsyncIterator[None]:
+    """
+    Share one HTTP client between the artifact lookups of find_repository_url.
+
+    Without a session every lookup that falls back to the published artifact
+    opens and closes a client, with its own connection pool, of its own.
+    """
+    global _artifact_client
+    async with artifact_client() as client:
+        _artifact_client = client
+        try:
+            yield
+        finally:
+            _artifact_client = None
 
 
 def _generate_purl(package_name: str, ecosystem: str, version: Optional[str] = None) -> str:
@@ -19,8 +112,10 @@ async def find_repository_url(
     Find repository URL for a package.
     
     Strategy:
-    1. Try registry APIs first (fastest)
-    2. If that fails, use purl2src to get download URL, download package, extract repo URL from metadata
+    1. Look in the offline registry index (see set_offline_index)
+    2. Look in the metadata of locally installed packages (see set_local_metadata_index)
+    3. Try registry APIs
+    4. If that fails, read the manifest of the published artifact (see resolve_purls)
 
     Args:
         package_name: Package name
@@ -34,51 +129,26 @@ async def find_repository_url(
         return None
 
     ecosystem = ecosystem.lower()
-    
-    # First, try registry APIs (fastest)
+
+    # Neither the offline index nor local install metadata needs the network
+    if _offline_index is not None:
+        repo_url = _offline_index.lookup(package_name, ecosystem)
+        if repo_url:
+            return repo_url
+
+    if _local_index is not None:
+        repo_url = _local_index.lookup(package_name, ecosystem, version)
+        if repo_url:
+            return repo_url
+
+    # Then try registry APIs
     repo_url = await _find_repo_from_registry(package_name, ecosystem, version)
     if repo_url:
         return repo_url
     
-    # If registry lookup fails, try using purl2src to download and inspect
-    # Generate PURL
+    # If registry lookup fails, read the manifest inside the published artifact
     purl = _generate_purl(package_name, ecosystem, version)
-    
-    try:
-        # Use purl2src to get download URL
-        result = subprocess.run(
-            ["purl2src", purl, "--format", "json"],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        
-        if result.returncode == 0 and result.stdout:
-            import json
-            data = json.loads(result.stdout)
-            if isinstance(data, list) and len(data) > 0:
-                download_url = data[0].get("download_url")
-                if download_url:
-                    # Download and extract repo URL from package metadata
-                    repo_url = await _extract_repo_from_downloaded_package(
-                        download_url, package_name, ecosystem
-                    )
-                    if repo_url:
-                        return repo_url
-    except (subprocess.TimeoutExpired, FileNotFoundError, json.JSONDecodeError, Exception):
-        # If purl2src fails, return None
-        pass
-    
-    return None
-
-
-async def _extract_repo_from_downloaded_package(
-    download_url: str, package_name: str, ecosystem: str
-) -> Optional[str]:
-    """Download package and extract repository URL from metadata."""
-    # For now, skip this as it's expensive
-    # In the future, we could download, extract, and read package.json/pyproject.toml/etc.
-    return None
+    return (await resolve_purls([purl], client=_artifact_client)).get(purl)
 
 
 async def _find_repo_from_registry(
@@ -87,148 +157,115 @@ async def _find_repo_from_registry(
     """Fallback: Find repository URL by querying package registries."""
     try:
         if ecosystem == "pypi":
-            return await _find_pypi_repo(package_name)
+            return await _find_pypi_repo(package_name, version)
         elif ecosystem == "npm":
-            return await _find_npm_repo(package_name)
+            return await _find_npm_repo(package_name, version)
         elif ecosystem == "cargo":
             return await _find_cargo_repo(package_name)
         elif ecosystem == "go":
-            return _find_go_repo(package_name)
+            return await _find_go_repo(package_name)
         elif ecosystem == "rubygems":
             return await _find_rubygems_repo(package_name)
         elif ecosystem == "maven":
-            return _find_maven_repo(package_name)
+            return await _find_maven_repo(package_name, version)
     except Exception:
         pass
 
     return None
 
 
-def _is_valid_git_url(url: str) -> bool:
-    """Check if URL looks like a valid git repository."""
-    if not url:
-        return False
-
-    url_lower = url.lower()
-
-    # Check for git protocol prefixes
-    if url_lower.startswith(("git+", "git://", "git@")):
-        return True
-
-    # Check for .git suffix
-    if url_lower.endswith(".git") or url_lower.endswith(".git/"):
-        return True
-
-    # Check for common git hosting platforms by parsing domain
-    try:
-        # Add protocol if missing for parsing
-        parse_url = url_lower if "://" in url_lower else f"https://{url_lower}"
-        parsed = urlparse(parse_url)
-        return parsed.netloc in ["github.com", "gitlab.com", "bitbucket.org"]
-    except Exception:
-        return False
-
+def _read_json_keys(body: bytes, keys: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Decode selected top-level members of a JSON object.
 
-def _normalize_git_url(url: str) -> str:
-    """Normalize git URL to standard HTTPS format."""
-    from urllib.parse import urlparse
-    
-    if not url:
-        return url
-
-    # Remove git+ prefix
-    if url.startswith("git+"):
-        url = url[4:]
-
-    # Remove trailing slash
-    if url.endswith("/"):
-        url = url[:-1]
-
-    # Remove .git suffix if present (we'll add it back)
-    if url.endswith(".git"):
-        url = url[:-4]
-
-    # Convert ssh to https
-    if url.startswith("git@"):
-        # git@github.com:user/repo -> https://github.com/user/repo
-        url = url[4:]  # Remove "git@"
-        url = url.replace(":", "/", 1)  # Replace first ":" with "/"
-        url = f"https://{url}"
-
-    # Ensure it starts with http:// or https://
-    if not url.startswith(("http://", "https://")):
-        # Parse URL with dummy protocol to check domain safely
-        try:
-            parsed = urlparse(f"https://{url}")
-            if parsed.netloc in ["github.com", "gitlab.com", "bitbucket.org"]:
-                url = f"https://{url}"
-        except Exception:
-            pass
+    The body is decoded from UTF-8 one chunk at a time and reading stops as
+    soon as every wanted key has been seen, so trailing members (such as the
+    release lists of registry documents) are neither decoded nor parsed;
+    unwanted members before them are skipped without being built.
 
-    # Add .git suffix if it's a GitHub/GitLab/Bitbucket URL
-    try:
-        parsed = urlparse(url)
-        if parsed.netloc in ["github.com", "gitlab.com", "bitbucket.org"]:
-            if not url.endswith(".git"):
-                url = f"{url}.git"
-    except Exception:
-        pass
-
-    return url
+    Args:
+        body: JSON document
+        keys: Top-level keys to decode
 
+    Returns:
+        Mapping of the wanted keys that are present to their values
+    """
+    reader = JsonStreamReader(io.BytesIO(body))
+    wanted = set(keys)
+    found: Dict[str, Any] = {}
+    if not wanted:
+        return found
+    for key in reader.members():
+        if key not in wanted:
+            reader.skip()
+            continue
+        found[key] = reader.value()
+        wanted.discard(key)
+        if not wanted:
+            break
+    return found
+
+
+async def _find_pypi_repo(package_name: str, version: Optional[str] = None) -> Optional[str]:
+    """
+    Find repository URL from PyPI.
 
-async def _find_pypi_repo(package_name: str) -> Optional[str]:
-    """Find repository URL from PyPI."""
+    With a version, the release document is fetched instead of the project
+    document, which lists the files of every release.
+    """
     import httpx
-    
-    url = f"https://pypi.org/pypi/{package_name}/json"
+
+    urls = [f"https://pypi.org/pypi/{package_name}/json"]
+    if version:
+        urls.insert(0, f"https://pypi.org/pypi/{package_name}/{version}/json")
     async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            response = await client.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                info = data.get("info", {})
-                project_urls = info.get("project_urls", {})
-                # Try various URL fields
-                for key in ["Source", "Source Code", "Repository", "Homepage"]:
-                    if key in project_urls:
-                        repo_url = project_urls[key]
-                        if repo_url:
-                            # Check if it's a git URL
-                            if _is_valid_git_url(repo_url):
-                                return _normalize_git_url(repo_url)
-                # Try homepage
-                homepage = info.get("home_page")
-                if homepage and _is_valid_git_url(homepage):
-                    return _normalize_git_url(homepage)
-        except Exception:
-            pass
+        for url in urls:
+            try:
+                response = await cached_get(url, client=client)
+                if response.status_code == 404:
+                    # Unknown version: try the project document
+                    continue
+                if response.status_code == 200:
+                    info = _read_json_keys(response.content, ("info",)).get("info") or {}
+                    return repository_from_pypi_info(info)
+            except Exception:
+                pass
+            break
     return None
 
 
-async def _find_npm_repo(package_name: str) -> Optional[str]:
-    """Find repository URL from npm registry."""
+async def _find_npm_repo(package_name: str, version: Optional[str] = None) -> Optional[str]:
+    """
+    Find repository URL from npm registry.
+
+    Only the document of one version is fetched (the ``latest`` dist-tag when
+    the version is unknown) instead of the packument of every version.
+    """
     import httpx
-    
-    url = f"https://registry.npmjs.org/{package_name}"
+
+    urls = [f"https://registry.npmjs.org/{package_name}/latest"]
+    if version:
+        urls.insert(0, f"https://registry.npmjs.org/{package_name}/{version}")
     async with httpx.AsyncClient(timeout=10.0) as client:
-        try:
-            response = await client.get(url)
-            if response.status_code == 200:
-                data = response.json()
-                # Get latest version info
-                latest = data.get("dist-tags", {}).get("latest")
-                if latest:
-                    version_data = data.get("versions", {}).get(latest, {})
-                    repository = version_data.get("repository", {})
+        for url in urls:
+            try:
+                response = await cached_get(url, client=client)
+                if response.status_code == 404:
+                    # Unknown version or a range from a manifest: use latest
+                    continue
+                if response.status_code == 200:
+                    repository = _read_json_keys(response.content, ("repository",)).get(
+                        "repository", {}
+                    )
                     if isinstance(repository, dict):
                         repo_url = repository.get("url", "")
                     else:
                         repo_url = repository
-                    if repo_url and _is_valid_git_url(repo_url):
-                        return _normalize_git_url(repo_url)
-        except Exception:
-            pass
+                    if repo_url and is_valid_git_url(repo_url):
+                        return normalize_git_url(repo_url)
+            except Exception:
+                pass
+            break
     return None
 
 
@@ -239,79 +276,24 @@ async def _find_cargo_repo(package_name: str) -> Optional[str]:
     url = f"https://crates.io/api/v1/crates/{package_name}"
     async with httpx.AsyncClient(timeout=10.0) as client:
         try:
-            response = await client.get(url)
+            response = await cached_get(url, client=client)
             if response.status_code == 200:
                 data = response.json()
                 crate = data.get("crate", {})
                 repository = crate.get("repository")
-                if repository and _is_valid_git_url(repository):
-                    return _normalize_git_url(repository)
+                if repository and is_valid_git_url(repository):
+                    return normalize_git_url(repository)
         except Exception:
             pass
     return None
 
 
-def _find_go_repo(package_name: str) -> Optional[str]:
-    """
-    Find repository URL from Go module path.
-
-    Safely validates and constructs URLs from Go module paths.
-    """
-    if not package_name:
-        return None
-
-    # Validate that package_name doesn't contain dangerous characters
-    # that could lead to URL injection
-    dangerous_chars = ['@', '#', '?', '&', ' ', '\n', '\r', '\t']
-    if any(char in package_name for char in dangerous_chars):
-        return None
-
-    # Go modules often follow github.com/user/repo pattern
-    allowed_domains = ["github.com/", "gitlab.com/", "bitbucket.org/"]
-
-    for domain in allowed_domains:
-        if package_name.startswith(domain):
-            # Extract path after domain
-            path = package_name[len(domain):]
-
-            # Validate path structure (should be user/repo or user/repo/subpath)
-            if not path or path.startswith('/') or path.endswith('/'):
-                return None
-
-            # Check for path traversal attempts
-            if '..' in path or path.startswith('.'):
-                return None
-
-            # Validate path contains only safe characters
-            if not all(c.isalnum() or c in '/-_.' for c in path):
-                return None
-
-            # Construct safe URL
-            return f"https://{domain.rstrip('/')}/{path}.git"
-
-    # Try to infer from common patterns
-    if "." in package_name and "/" in package_name:
-        # Validate no path traversal
-        if '..' in package_name:
-            return None
-
-        # Might be a domain-based module path
-        parts = package_name.split("/")
-        if len(parts) >= 3:
-            # Validate domain part
-            domain = parts[0]
-            if not all(c.isalnum() or c in '.-' for c in domain):
-                return None
-
-            # Validate path parts
-            path = "/".join(parts[1:])
-            if not all(c.isalnum() or c in '/-_.' for c in path):
-                return None
-
-            # Assume it's a git repository
-            return f"https://{package_name}.git"
-
-    return None
+async def _find_go_repo(package_name: str) -> Optional[str]:
+    """Find repository URL from a Go module path, following vanity import meta tags."""
+    global _go_resolver
+    if _go_resolver is None:
+        _go_resolver = GoResolver()
+    return await _go_resolver.resolve(package_name)
 
 
 async def _find_rubygems_repo(package_name: str) -> Optional[str]:
@@ -321,38 +303,23 @@ async def _find_rubygems_repo(package_name: str) -> Optional[str]:
     url = f"https://rubygems.org/api/v1/gems/{package_name}.json"
     async with httpx.AsyncClient(timeout=10.0) as client:
         try:
-            response = await client.get(url)
+            response = await cached_get(url, client=client)
             if response.status_code == 200:
                 data = response.json()
                 source_code_uri = data.get("source_code_uri")
-                if source_code_uri and _is_valid_git_url(source_code_uri):
-                    return _normalize_git_url(source_code_uri)
+                if source_code_uri and is_valid_git_url(source_code_uri):
+                    return normalize_git_url(source_code_uri)
                 homepage_uri = data.get("homepage_uri")
-                if homepage_uri and _is_valid_git_url(homepage_uri):
-                    return _normalize_git_url(homepage_uri)
+                if homepage_uri and is_valid_git_url(homepage_uri):
+                    return normalize_git_url(homepage_uri)
         except Exception:
             pass
     return None
 
 
-def _find_maven_repo(package_name: str) -> Optional[str]:
-    """Find repository URL from Maven coordinates."""
-    # Maven coordinates: group:artifact
-    # Often maps to GitHub: github.com/group/artifact
-    if ":" in package_name:
-        parts = package_name.split(":")
-        if len(parts) >= 2:
-            group = parts[0]
-            artifact = parts[1]
-            # Common pattern: com.company.project -> github.com/company/project
-            if group.startswith("com."):
-                org = group.split(".")[-1]
-                return f"https://github.com/{org}/{artifact}.git"
-            elif group.startswith("org."):
-                org = group.split(".")[-1]
-                return f"https://github.com/{org}/{artifact}.git"
-    return None
-
-
-# Duplicate _normalize_git_url removed - using the one defined earlier
-
+async def _find_maven_repo(package_name: str, version: Optional[str] = None) -> Optional[str]:
+    """Find repository URL from the ``<scm>`` of the artifact POM or its parents."""
+    global _maven_resolver
+    if _maven_resolver is None:
+        _maven_resolver = MavenResolver()
+    return await _maven_resolver.resolve(package_name, version)
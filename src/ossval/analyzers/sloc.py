@@ -1,14 +1,16 @@
 """Source lines of code (SLOC) counting."""
 
-import os
 import shutil
 import subprocess
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterator, Optional
 
 from pygount import SourceAnalysis, SourceScanner
 
+from ossval.analyzers.classifier import classify_file
+from ossval.cache import AnalysisCache, cache_key
 from ossval.models import SLOCMetrics
 
 # Patterns to ignore (production code only, exclude tests and generated files)
@@ -41,7 +43,10 @@ IGNORE_PATTERNS = [
 
 
 async def analyze_sloc(
-    repository_url: str, cache_dir: Optional[str] = None, use_cache: bool = True
+    repository_url: str,
+    cache_dir: Optional[str] = None,
+    use_cache: bool = True,
+    repo_path: Optional[Path] = None,
 ) -> Optional[SLOCMetrics]:
     """
     Analyze SLOC for a repository by cloning it.
@@ -50,6 +55,7 @@ async def analyze_sloc(
         repository_url: Git repository URL
         cache_dir: Optional cache directory
         use_cache: Whether to use cache
+        repo_path: Optional existing checkout to analyze instead of cloning
 
     Returns:
         SLOCMetrics if successful, None otherwise
@@ -57,56 +63,88 @@ async def analyze_sloc(
     if not repository_url:
         return None
 
-    # Check cache first
-    if use_cache and cache_dir:
-        cache_path = Path(cache_dir) / "sloc" / _get_cache_key(repository_url)
-        if cache_path.exists():
+    # Check cache first (same namespace and key as the analysis pipeline)
+    cache = AnalysisCache(cache_dir) if use_cache and cache_dir else None
+    key = cache_key(repository_url)
+    if cache and repo_path is None:
+        cached = cache.get(key, "sloc")
+        if cached:
             try:
-                return _load_sloc_from_cache(cache_path)
+                return SLOCMetrics(**cached)
             except Exception:
                 pass
 
-    # Clone repository
-    temp_dir = None
     try:
-        temp_dir = tempfile.mkdtemp(prefix="ossval_")
-        repo_path = Path(temp_dir) / "repo"
+        if repo_path is not None:
+            sloc_data = _count_sloc_with_pygount(repo_path)
+        else:
+            with cloned_repository(repository_url) as cloned_path:
+                if cloned_path is None:
+                    # Clone failed - will be handled as warning
+                    return None
+                # Count SLOC using pygount
+                sloc_data = _count_sloc_with_pygount(cloned_path)
+
+        # Save to cache
+        if cache and sloc_data:
+            cache.set(key, sloc_data.model_dump(mode="json"), "sloc")
+
+        return sloc_data
+
+    except Exception:
+        return None
 
-        # Shallow clone
+
+def clone_repository(
+    repository_url: str, dest: Path, timeout: int = 60, history: bool = False
+) -> bool:
+    """
+    Clone a repository, shallow unless the history is needed.
+
+    Args:
+        repository_url: Git repository URL
+        dest: Destination directory (must not exist)
+        timeout: Clone timeout in seconds
+        history: Fetch the full commit history (without old file contents)
+            instead of only the latest commit
+
+    Returns:
+        True if the clone succeeded
+    """
+    # A blobless clone has every commit and tree for git log, and downloads
+    # file contents only for the checked-out revision
+    depth = ["--filter=blob:none"] if history else ["--depth", "1"]
+    try:
         result = subprocess.run(
-            ["git", "clone", "--depth", "1", repository_url, str(repo_path)],
+            ["git", "clone", *depth, repository_url, str(dest)],
             capture_output=True,
-            timeout=60,
+            timeout=timeout,
         )
+    except (subprocess.TimeoutExpired, OSError):
+        return False
 
-        if result.returncode != 0:
-            # Log error for debugging
-            error_msg = result.stderr.decode("utf-8", errors="ignore") if result.stderr else "Unknown error"
-            # Check if it's a timeout or network issue
-            if "timeout" in error_msg.lower() or "fatal" in error_msg.lower():
-                # Return None - will be handled as warning
-                return None
-            return None
+    return result.returncode == 0
 
-        # Count SLOC using pygount
-        sloc_data = _count_sloc_with_pygount(repo_path)
 
-        # Save to cache
-        if use_cache and cache_dir and sloc_data:
-            cache_path = Path(cache_dir) / "sloc" / _get_cache_key(repository_url)
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            _save_sloc_to_cache(cache_path, sloc_data)
+@contextmanager
+def cloned_repository(repository_url: str, history: bool = False) -> Iterator[Optional[Path]]:
+    """
+    Clone a repository into a temporary directory for the duration of a block.
 
-        return sloc_data
+    Yields the checkout path, or None if the clone failed. The temporary
+    directory is always removed on exit.
 
-    except subprocess.TimeoutExpired:
-        return None
-    except Exception:
-        return None
+    Args:
+        repository_url: Git repository URL
+        history: Fetch the full commit history (see clone_repository)
+    """
+    temp_dir = tempfile.mkdtemp(prefix="ossval_")
+    try:
+        repo_path = Path(temp_dir) / "repo"
+        yield repo_path if clone_repository(repository_url, repo_path, history=history) else None
     finally:
         # Cleanup
-        if temp_dir and os.path.exists(temp_dir):
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 def _count_sloc_with_pygount(repo_path: Path) -> Optional[SLOCMetrics]:
@@ -115,6 +153,8 @@ def _count_sloc_with_pygount(repo_path: Path) -> Optional[SLOCMetrics]:
     total_comment = 0
     total_blank = 0
     by_language: Dict[str, int] = {}
+    excluded_files: Dict[str, int] = {}
+    excluded_bytes: Dict[str, int] = {}
 
     try:
         from pygount.analysis import SourceAnalysis
@@ -126,32 +166,18 @@ def _count_sloc_with_pygount(repo_path: Path) -> Optional[SLOCMetrics]:
         sys.stderr = StringIO()
         
         try:
-            # Walk the directory manually to avoid permission issues
-            skip_dirs = {
-                "__pycache__", "node_modules", "target", "dist", "build",
-                ".git", ".svn", ".hg", "vendor", ".venv", "venv", "env",
-                "tests", "__tests__", "test", "spec", "testsuite"
-            }
-            skip_extensions = {".pyc", ".pyo", ".so", ".dll", ".dylib"}
-            
-            # Walk through the repository
-            for file_path in repo_path.rglob("*"):
-                # Skip directories
-                if file_path.is_dir():
+            for file_path in iter_sloc_files(repo_path):
+                category = classify_file(file_path)
+                if category is not None:
+                    key = category.value
+                    excluded_files[key] = excluded_files.get(key, 0) + 1
+                    try:
+                        size = file_path.stat().st_size
+                    except OSError:
+                        size = 0
+                    excluded_bytes[key] = excluded_bytes.get(key, 0) + size
                     continue
-                
-                # Skip if in a directory we want to ignore
-                if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
-                    continue
-                
-                # Skip binary files
-                if file_path.suffix in skip_extensions:
-                    continue
-                
-                # Skip test files
-                if "test" in file_path.name.lower() or "test" in str(file_path):
-                    continue
-                
+
                 try:
                     # Analyze the file - SourceAnalysis.from_file requires group parameter
                     analysis = SourceAnalysis.from_file(str(file_path), group='')
@@ -180,6 +206,8 @@ def _count_sloc_with_pygount(repo_path: Path) -> Optional[SLOCMetrics]:
             comment_lines=total_comment,
             blank_lines=total_blank,
             by_language=by_language,
+            excluded_files=excluded_files,
+            excluded_bytes=excluded_bytes,
         )
 
     except Exception:
@@ -187,6 +215,48 @@ def _count_sloc_with_pygount(repo_path: Path) -> Optional[SLOCMetrics]:
         return None
 
 
+def iter_sloc_files(repo_path: Path) -> Iterator[Path]:
+    """
+    Iterate over the files of a repository that count towards SLOC.
+
+    Dependency, build, VCS and test directories are skipped, as are test files
+    and compiled binaries.
+
+    Args:
+        repo_path: Path to repository
+
+    Yields:
+        File paths
+    """
+    # Walk the directory manually to avoid permission issues
+    skip_dirs = {
+        "__pycache__", "node_modules", "target", "dist", "build",
+        ".git", ".svn", ".hg", "vendor", ".venv", "venv", "env",
+        "tests", "__tests__", "test", "spec", "testsuite"
+    }
+    skip_extensions = {".pyc", ".pyo", ".so", ".dll", ".dylib"}
+
+    # Walk through the repository
+    for file_path in repo_path.rglob("*"):
+        # Skip directories
+        if file_path.is_dir():
+            continue
+
+        # Skip if in a directory we want to ignore
+        if any(skip_dir in file_path.parts for skip_dir in skip_dirs):
+            continue
+
+        # Skip binary files
+        if file_path.suffix in skip_extensions:
+            continue
+
+        # Skip test files
+        if "test" in file_path.name.lower() or "test" in str(file_path.relative_to(repo_path)):
+            continue
+
+        yield file_path
+
+
 def _should_ignore(path: Path | str) -> bool:
     """Check if path should be ignored."""
     path_str = str(path)
@@ -215,32 +285,3 @@ def _should_ignore_file(file_path: Path, repo_root: Path) -> bool:
             return True
 
     return False
-
-
-def _get_cache_key(repository_url: str) -> str:
-    """Generate cache key from repository URL."""
-    import hashlib
-
-    return hashlib.md5(repository_url.encode()).hexdigest()
-
-
-def _save_sloc_to_cache(cache_path: Path, sloc_data: SLOCMetrics) -> None:
-    """Save SLOC data to cache."""
-    import json
-
-    cache_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(cache_path, "w") as f:
-        json.dump(sloc_data.model_dump(), f)
-
-
-def _load_sloc_from_cache(cache_path: Path) -> Optional[SLOCMetrics]:
-    """Load SLOC data from cache."""
-    import json
-
-    if not cache_path.exists():
-        return None
-
-    with open(cache_path, "r") as f:
-        data = json.load(f)
-        return SLOCMetrics(**data)
-
@@ -0,0 +1,151 @@
+"""Repository URL normalization and package name rules shared by the resolvers."""
+
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+# Hosts whose repository URLs are recognized without a git prefix or suffix
+GIT_HOSTS = ("github.com", "gitlab.com", "bitbucket.org")
+
+# GitHub shorthand accepted in package.json "repository" fields
+_GITHUB_SHORTHAND = re.compile(r"^(?:github:)?(?P<path>[\w.-]+/[\w.-]+)$")
+
+# GitHub browse URLs such as https://github.com/rails/rails/tree/v7.1.0
+_GITHUB_BROWSE_URL = re.compile(r"^(?P<repo>https?://github\.com/[^/]+/[^/]+)/(?:tree|blob)/")
+
+# project_urls labels that may hold the repository, in order of preference
+_PYPI_URL_LABELS = ("Source", "Source Code", "Repository", "Homepage")
+
+
+def is_valid_git_url(url: str) -> bool:
+    """Check if URL looks like a valid git repository."""
+    if not url:
+        return False
+
+    url_lower = url.lower()
+
+    # Check for git protocol prefixes
+    if url_lower.startswith(("git+", "git://", "git@")):
+        return True
+
+    # Check for .git suffix
+    if url_lower.endswith(".git") or url_lower.endswith(".git/"):
+        return True
+
+    # Check for common git hosting platforms by parsing domain
+    try:
+        # Add protocol if missing for parsing
+        parse_url = url_lower if "://" in url_lower else f"https://{url_lower}"
+        parsed = urlparse(parse_url)
+        return parsed.netloc in GIT_HOSTS
+    except Exception:
+        return False
+
+
+def normalize_git_url(url: str) -> str:
+    """Normalize git URL to standard HTTPS format."""
+    if not url:
+        return url
+
+    # Remove git+ prefix
+    if url.startswith("git+"):
+        url = url[4:]
+
+    # Remove trailing slash
+    if url.endswith("/"):
+        url = url[:-1]
+
+    # Remove .git suffix if present (we'll add it back)
+    if url.endswith(".git"):
+        url = url[:-4]
+
+    # Convert ssh to https
+    if url.startswith("git@"):
+        # git@github.com:user/repo -> https://github.com/user/repo
+        url = url[4:]  # Remove "git@"
+        url = url.replace(":", "/", 1)  # Replace first ":" with "/"
+        url = f"https://{url}"
+
+    # Ensure it starts with http:// or https://
+    if not url.startswith(("http://", "https://")):
+        # Parse URL with dummy protocol to check domain safely
+        try:
+            parsed = urlparse(f"https://{url}")
+            if parsed.netloc in GIT_HOSTS:
+                url = f"https://{url}"
+        except Exception:
+            pass
+
+    # Add .git suffix if it's a GitHub/GitLab/Bitbucket URL
+    try:
+        parsed = urlparse(url)
+        if parsed.netloc in GIT_HOSTS:
+            if not url.endswith(".git"):
+                url = f"{url}.git"
+    except Exception:
+        pass
+
+    return url
+
+
+def normalize_repository_url(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a repository field of package metadata.
+
+    Accepts Maven ``scm:git:`` URLs, GitHub shorthand (``user/repo``,
+    ``github:user/repo``) and GitHub browse URLs.
+
+    Returns:
+        Normalized repository URL, or None if the value is not a git URL
+    """
+    if not value or not isinstance(value, str):
+        return None
+    value = value.strip()
+    if value.startswith("scm:git:"):
+        value = value[len("scm:git:"):]
+    shorthand = _GITHUB_SHORTHAND.match(value)
+    if shorthand:
+        value = f"https://github.com/{shorthand.group('path')}"
+    browse = _GITHUB_BROWSE_URL.match(value)
+    if browse:
+        value = browse.group("repo")
+    if is_valid_git_url(value):
+        return normalize_git_url(value)
+    return None
+
+
+def repository_from_pypi_info(info: Dict[str, Any]) -> Optional[str]:
+    """Pick the repository URL from the ``info`` member of a PyPI document."""
+    project_urls = info.get("project_urls") or {}
+    # Try various URL fields
+    for key in _PYPI_URL_LABELS:
+        repo_url = project_urls.get(key)
+        # Check if it's a git URL
+        if repo_url and is_valid_git_url(repo_url):
+            return normalize_git_url(repo_url)
+    # Try homepage
+    homepage = info.get("home_page")
+    if homepage and is_valid_git_url(homepage):
+        return normalize_git_url(homepage)
+    return None
+
+
+def normalize_pypi_name(name: str) -> str:
+    """Normalize a Python distribution name (PEP 503)."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def pom_scm_url(pom: Path) -> Optional[str]:
+    """Read the ``<scm>`` URL or connection of a POM file, before normalization."""
+    root = ET.parse(pom).getroot()
+    namespace = root.tag[: root.tag.index("}") + 1] if root.tag.startswith("{") else ""
+    scm = root.find(f"{namespace}scm")
+    if scm is None:
+        return None
+    for field in ("url", "connection", "developerConnection"):
+        element = scm.find(f"{namespace}{field}")
+        if element is not None and element.text and "${" not in element.text:
+            return element.text
+    return None
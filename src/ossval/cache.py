@@ -1,22 +1,235 @@
 """Disk caching for analysis results."""
 
+import base64
+import hashlib
+import io
 import json
+import re
+import shutil
+import tarfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 import diskcache
 
 
+class CachePolicy(NamedTuple):
+    """Expiry, stale-while-revalidate window and size quota of a cache namespace."""
+
+    # Time-to-live in days; None uses the cache-wide TTL
+    ttl_days: Optional[float] = None
+    # Size quota in bytes, enforced by diskcache eviction
+    size_limit: int = 2**27  # 128MB
+    # Days after the TTL during which an entry is still served, marked stale,
+    # while it is refreshed in the background
+    stale_days: float = 0
+
+
+# Namespaces used by the analysis pipeline
+NAMESPACE_POLICIES: Dict[str, CachePolicy] = {
+    "registry": CachePolicy(ttl_days=7, size_limit=2**26, stale_days=30),
+    "sloc": CachePolicy(),
+    "halstead": CachePolicy(),
+    "complexity": CachePolicy(),
+    "git_history": CachePolicy(ttl_days=7, size_limit=2**26),
+    "health": CachePolicy(ttl_days=1, size_limit=2**26, stale_days=7),
+    "cost": CachePolicy(size_limit=2**26),
+    # Parsed Maven POMs; released POMs are immutable
+    "pom": CachePolicy(ttl_days=365, size_limit=2**26),
+    # HTTP response bodies with their ETag/Last-Modified validators
+    "http": CachePolicy(size_limit=2**27),
+}
+
+
+# Counters kept per namespace
+STAT_COUNTERS = (
+    "hits",
+    "misses",
+    "sets",
+    "evictions",
+    "expirations",
+    "get_time_us",
+    "set_time_us",
+    "bytes_saved",
+    "memory_hits",
+    "memory_evictions",
+    "stale_hits",
+    "revalidations",
+)
+
+# Freshness of a cached value
+FRESH = "fresh"
+STALE = "stale"
+
+# Name under which statistics of the default namespace are reported
+DEFAULT_NAMESPACE = "default"
+
+_MISSING = object()
+
+# Format identifier and version of exported cache bundles
+BUNDLE_FORMAT = "ossval-cache-bundle"
+BUNDLE_VERSION = 1
+
+# Key of the object that stands for a bytes value in a bundle entry
+_BUNDLE_BYTES_KEY = "$base64"
+
+
+class _BundleEntry(NamedTuple):
+    """Cache entry read from a bundle."""
+
+    key: str
+    value: Any
+    stored_at: float
+    expire_at: Optional[float]
+
+
+# Directories of JSON metric files written by earlier versions, one file per
+# repository named by the MD5 digest of its URL; these never expire
+LEGACY_DIRS = ("sloc", "halstead", "complexity")
+_LEGACY_FILE_NAME = re.compile(r"^[0-9a-f]{32}(\.json)?$")
+
+# Key of the lock held in the statistics store while garbage collection runs,
+# and how long a lock left behind by a crashed process stays valid
+GC_LOCK_KEY = "ossval:gc-lock"
+GC_LOCK_SECONDS = 60 * 60
+
+
+def cache_key(*parts: Any) -> str:
+    """
+    Build a stable cache key from the inputs that determine a result.
+
+    Args:
+        parts: JSON-serializable values (e.g. ecosystem, name, version)
+
+    Returns:
+        SHA-256 hex digest of the canonical JSON encoding of ``parts``
+    """
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryTier:
+    """Bounded in-process LRU cache, limited by entry count and total value size."""
+
+    def __init__(self, max_entries: int = 10_000, max_bytes: int = 2**26):
+        """
+        Initialize the memory tier.
+
+        Args:
+            max_entries: Maximum number of entries (0 disables the tier)
+            max_bytes: Maximum total approximate size of values in bytes
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # (namespace, key) -> (value, absolute expiry time or None, size, store time or None)
+        self._entries: "OrderedDict[Tuple[Optional[str], str], Tuple[Any, Optional[float], int, Optional[float]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: Optional[str], key: str) -> Tuple[Any, int, Optional[float]]:
+        """Get (value, size, store time) of a live entry, or (_MISSING, 0, None)."""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return _MISSING, 0, None
+            value, expire_at, size, stored_at = entry
+            if expire_at is not None and expire_at <= time.time():
+                self._remove((namespace, key))
+                return _MISSING, 0, None
+            self._entries.move_to_end((namespace, key))
+            return value, size, stored_at
+
+    def set(
+        self,
+        namespace: Optional[str],
+        key: str,
+        value: Any,
+        expire_at: Optional[float],
+        size: int,
+        stored_at: Optional[float] = None,
+    ) -> int:
+        """
+        Store an entry, evicting least recently used entries over the limits.
+
+        Returns:
+            Number of evicted entries
+        """
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return 0
+        evicted = 0
+        with self._lock:
+            self._remove((namespace, key))
+            self._entries[(namespace, key)] = (value, expire_at, size, stored_at)
+            self.total_bytes += size
+            while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        return evicted
+
+    def _remove(self, entry_key: Tuple[Optional[str], str]) -> None:
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# Memory tiers shared by all AnalysisCache instances of a process, per cache directory
+_MEMORY_TIERS: Dict[str, MemoryTier] = {}
+_MEMORY_TIERS_LOCK = threading.Lock()
+
+
+def _shared_memory_tier(cache_dir: Path, max_entries: int, max_bytes: int) -> MemoryTier:
+    """Get the process-wide memory tier of a cache directory."""
+    with _MEMORY_TIERS_LOCK:
+        tier = _MEMORY_TIERS.get(str(cache_dir.resolve()))
+        if tier is None:
+            tier = MemoryTier(max_entries, max_bytes)
+            _MEMORY_TIERS[str(cache_dir.resolve())] = tier
+        else:
+            tier.max_entries = max_entries
+            tier.max_bytes = max_bytes
+        return tier
+
+
 class AnalysisCache:
-    """Disk-based cache for analysis results."""
+    """
+    Two-tier cache for analysis results.
+
+    Lookups go to a bounded in-process LRU tier first and to diskcache on a
+    miss; writes go through to both. Values returned from the memory tier are
+    shared objects and must not be mutated.
+    """
 
-    def __init__(self, cache_dir: Optional[str] = None, ttl_days: int = 30):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_days: int = 30,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        memory_entries: int = 10_000,
+        memory_bytes: int = 2**26,
+    ):
         """
         Initialize cache.
 
         Args:
             cache_dir: Cache directory path (default: ~/.cache/ossval)
             ttl_days: Time-to-live in days
+            policies: Optional per-namespace policies overriding NAMESPACE_POLICIES
+            memory_entries: Maximum entries in the in-process tier (0 disables it)
+            memory_bytes: Maximum size of the in-process tier in bytes (64MB)
         """
         if cache_dir:
             self.cache_dir = Path(cache_dir)
@@ -24,38 +237,657 @@ class AnalysisCache:
             self.cache_dir = Path.home() / ".cache" / "ossval"
 
         self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache = diskcache.Cache(str(self.cache_dir), size_limit=2**30)  # 1GB limit
+        # Access times are tracked so that eviction and gc remove least recently used entries
+        self.cache = diskcache.Cache(
+            str(self.cache_dir),
+            size_limit=2**30,  # 1GB limit
+            eviction_policy="least-recently-used",
+        )
+        self.memory = _shared_memory_tier(self.cache_dir, memory_entries, memory_bytes)
         self.ttl_seconds = ttl_days * 24 * 60 * 60
+        self.policies = {**NAMESPACE_POLICIES, **(policies or {})}
+        self._namespaces: Dict[str, diskcache.Cache] = {}
+        # Counters of this process: not yet persisted, and since creation
+        self._pending: Dict[str, Dict[str, int]] = {}
+        self._session: Dict[str, Dict[str, int]] = {}
+        self._stats: Optional[diskcache.Cache] = None
+
+    def namespace(self, name: Optional[str]) -> diskcache.Cache:
+        """
+        Get the diskcache of a namespace, opening it on first use.
+
+        Each namespace lives in its own directory so that it has its own size quota.
+
+        Args:
+            name: Namespace name, or None for the default namespace
+
+        Returns:
+            diskcache.Cache for the namespace
+        """
+        if name is None:
+            return self.cache
+        if name not in self._namespaces:
+            policy = self.policies.get(name, CachePolicy())
+            # Culling is done in maintain() so that evictions can be counted
+            self._namespaces[name] = diskcache.Cache(
+                str(self.cache_dir / "namespaces" / name),
+                size_limit=policy.size_limit,
+                cull_limit=0,
+                eviction_policy="least-recently-used",
+            )
+        return self._namespaces[name]
+
+    def namespace_ttl(self, name: Optional[str]) -> float:
+        """Get the TTL of a namespace in seconds."""
+        policy = self.policies.get(name) if name else None
+        if policy is None or policy.ttl_days is None:
+            return self.ttl_seconds
+        return policy.ttl_days * 24 * 60 * 60
+
+    def namespace_stale(self, name: Optional[str]) -> float:
+        """Get the stale-while-revalidate window of a namespace in seconds."""
+        policy = self.policies.get(name) if name else None
+        if policy is None:
+            return 0
+        return policy.stale_days * 24 * 60 * 60
+
+    def get(self, key: str, namespace: Optional[str] = None, default: Any = None) -> Any:
+        """Get value from cache, trying the memory tier before the disk tier."""
+        value, freshness = self.lookup(key, namespace)
+        return default if freshness is None else value
+
+    def lookup(self, key: str, namespace: Optional[str] = None) -> Tuple[Any, Optional[str]]:
+        """
+        Get a value together with its freshness.
+
+        Entries older than the namespace TTL but within its stale window are
+        returned as STALE; the caller is expected to refresh them.
+
+        Args:
+            key: Cache key
+            namespace: Namespace name, or None for the default namespace
+
+        Returns:
+            (value, FRESH or STALE), or (None, None) on a miss
+        """
+        start = time.perf_counter()
+        value, size, stored_at = self.memory.get(namespace, key)
+        from_memory = value is not _MISSING
+
+        if not from_memory:
+            try:
+                value, expire_at, stored_at = self.namespace(namespace).get(
+                    key, default=_MISSING, expire_time=True, tag=True
+                )
+            except Exception:
+                value, expire_at, stored_at = _MISSING, None, None
+
+            if value is _MISSING:
+                elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+                self._count(namespace, misses=1, get_time_us=elapsed_us)
+                return None, None
 
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
+            # Promote to the memory tier
+            size = _value_size(value)
+            evicted = self.memory.set(namespace, key, value, expire_at, size, stored_at)
+            self._count(namespace, memory_evictions=evicted)
+
+        freshness = FRESH
+        if stored_at is not None and time.time() - stored_at > self.namespace_ttl(namespace):
+            freshness = STALE
+
+        elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+        self._count(
+            namespace,
+            hits=1,
+            memory_hits=int(from_memory),
+            stale_hits=int(freshness == STALE),
+            get_time_us=elapsed_us,
+            bytes_saved=size,
+        )
+        return value, freshness
+
+    def set(self, key: str, value: Any, namespace: Optional[str] = None) -> None:
+        """Set value in both tiers with the namespace TTL plus its stale window."""
+        start = time.perf_counter()
+        now = time.time()
+        lifetime = self.namespace_ttl(namespace) + self.namespace_stale(namespace)
+        evicted = self.memory.set(
+            namespace, key, value, now + lifetime, _value_size(value), now
+        )
         try:
-            return self.cache.get(key, default=None)
+            # The tag records when the entry was stored
+            self.namespace(namespace).set(key, value, expire=lifetime, tag=now)
         except Exception:
-            return None
+            pass
+        elapsed_us = int((time.perf_counter() - start) * 1_000_000)
+        self._count(namespace, sets=1, set_time_us=elapsed_us, memory_evictions=evicted)
+
+    def _count(self, namespace: Optional[str], **deltas: int) -> None:
+        """Add to the counters of a namespace."""
+        name = namespace or DEFAULT_NAMESPACE
+        for counters in (self._pending, self._session):
+            namespace_counters = counters.setdefault(name, dict.fromkeys(STAT_COUNTERS, 0))
+            for counter, delta in deltas.items():
+                namespace_counters[counter] += delta
+
+    def record(self, namespace: Optional[str], **deltas: int) -> None:
+        """
+        Add to the counters of a namespace for events observed by a caller.
+
+        Args:
+            namespace: Namespace name, or None for the default namespace
+            deltas: Counter increments, e.g. ``revalidations=1``
+        """
+        self._count(namespace, **deltas)
+
+    def maintain(self) -> None:
+        """Remove expired entries and evict entries over the size quota of each open namespace."""
+        for name, cache in list(self._namespaces.items()):
+            try:
+                expired = cache.expire()
+                evicted = cache.cull()
+            except Exception:
+                continue
+            if expired or evicted:
+                self._count(name, expirations=expired, evictions=evicted)
 
-    def set(self, key: str, value: Any) -> None:
-        """Set value in cache with TTL."""
+    def flush(self) -> None:
+        """Run maintenance and persist the counters collected since the last flush."""
+        self.maintain()
+        pending, self._pending = self._pending, {}
         try:
-            self.cache.set(key, value, expire=self.ttl_seconds)
+            store = self._stats_store()
+            for name, counters in pending.items():
+                for counter, delta in counters.items():
+                    if delta:
+                        store.incr(f"{name}:{counter}", delta)
         except Exception:
             pass
 
+    def _stats_store(self) -> diskcache.Cache:
+        """Get the persistent statistics store, opening it on first use."""
+        if self._stats is None:
+            self._stats = diskcache.Cache(str(self.cache_dir / "stats"))
+        return self._stats
+
+    def stats(self, session: bool = False) -> Dict[str, Dict[str, float]]:
+        """
+        Get hit, miss, eviction and expiry counters and latencies per namespace.
+
+        Args:
+            session: Only report activity of this process instead of persisted totals
+
+        Returns:
+            Mapping of namespace to counters, with hit rate and average latencies in ms
+        """
+        totals: Dict[str, Dict[str, int]] = {}
+        if session:
+            sources = [self._session]
+        else:
+            sources = [self._pending]
+            try:
+                store = self._stats_store()
+                persisted: Dict[str, Dict[str, int]] = {}
+                for stat_key in store:
+                    if stat_key == GC_LOCK_KEY:
+                        continue
+                    name, counter = stat_key.rsplit(":", 1)
+                    persisted.setdefault(name, {})[counter] = store.get(stat_key, 0)
+                sources.append(persisted)
+            except Exception:
+                pass
+
+        for source in sources:
+            for name, counters in source.items():
+                namespace_totals = totals.setdefault(name, dict.fromkeys(STAT_COUNTERS, 0))
+                for counter, value in counters.items():
+                    if counter in namespace_totals:
+                        namespace_totals[counter] += value
+
+        return {name: _summarize_stats(counters) for name, counters in sorted(totals.items())}
+
+    def _namespace_names(self) -> list[str]:
+        """Names of configured namespaces and namespaces present on disk."""
+        names = set(self.policies)
+        namespaces_dir = self.cache_dir / "namespaces"
+        if namespaces_dir.is_dir():
+            names.update(path.name for path in namespaces_dir.iterdir() if path.is_dir())
+        return sorted(names)
+
     def clear(self) -> None:
-        """Clear all cache entries."""
+        """Clear all cache entries, statistics and legacy metric files."""
         try:
+            self.memory.clear()
             self.cache.clear()
+            for name in self._namespace_names():
+                self.namespace(name).clear()
+            self._stats_store().clear()
+            self._pending = {}
+            for path in self._legacy_files():
+                _remove_path(path)
+        except Exception:
+            pass
+
+    def _legacy_files(self) -> list[Path]:
+        """Metric JSON files written by earlier versions."""
+        files = []
+        for dir_name in LEGACY_DIRS:
+            legacy_dir = self.cache_dir / dir_name
+            if legacy_dir.is_dir():
+                files.extend(
+                    path
+                    for path in legacy_dir.iterdir()
+                    if path.is_file() and _LEGACY_FILE_NAME.match(path.name)
+                )
+        return files
+
+    def disk_usage(self) -> Dict[str, int]:
+        """
+        Get the on-disk size of every kind of cache artifact.
+
+        Returns:
+            Bytes used by diskcache entries, statistics and legacy metric files,
+            plus their total
+        """
+        usage = {"entries": 0, "stats": 0, "legacy": 0}
+        try:
+            usage["entries"] = self.cache.volume() + sum(
+                self.namespace(name).volume() for name in self._namespace_names()
+            )
+            usage["stats"] = self._stats_store().volume()
+            usage["legacy"] = sum(_path_size(path) for path in self._legacy_files())
         except Exception:
             pass
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def gc(
+        self, max_bytes: Optional[int] = None, max_age_days: Optional[float] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Garbage-collect all on-disk artifacts of the cache directory.
+
+        Expired entries and legacy metric files are always removed. Entries
+        stored more than ``max_age_days`` ago go next (reads do not renew an
+        entry: its age counts from when it was stored, like its TTL), then
+        least recently used entries until everything fits in ``max_bytes``.
+        Only one process collects a cache directory at a time; other
+        processes keep reading and writing while it runs.
+
+        Args:
+            max_bytes: Size target for all artifacts together, in bytes
+            max_age_days: Remove entries stored more than this many days ago
+
+        Returns:
+            Removed entries, removed files, freed bytes and the size before and
+            after, or None if another process is already collecting
+        """
+        try:
+            if not self._stats_store().add(GC_LOCK_KEY, time.time(), expire=GC_LOCK_SECONDS):
+                return None
+        except Exception:
+            return None
+
+        try:
+            self.flush()
+            size_before = self.disk_usage()["total"]
+            caches = {name: self.namespace(name) for name in self._namespace_names()}
+            caches[DEFAULT_NAMESPACE] = self.cache
+            entries_before = sum(len(cache) for cache in caches.values())
+            removed_files = 0
+
+            for path in self._legacy_files():
+                removed_files += _remove_path(path)
+            for name, cache in caches.items():
+                self._count(name, expirations=cache.expire())
+
+            if max_age_days is not None:
+                cutoff = time.time() - max_age_days * 24 * 60 * 60
+                for name, cache in caches.items():
+                    namespace = None if cache is self.cache else name
+                    lifetime = self.namespace_ttl(namespace) + self.namespace_stale(namespace)
+                    # Entries expire a fixed lifetime after they are stored, so
+                    # those stored before the cutoff expire by cutoff + lifetime
+                    self._count(name, expirations=cache.expire(now=cutoff + lifetime))
+
+            if max_bytes is not None:
+                excess = self.disk_usage()["total"] - max_bytes
+                if excess > 0:
+                    evictions = self._shrink(caches, excess)
+                    for name, evicted in evictions.items():
+                        self._count(name, evictions=evicted)
+
+            self.memory.clear()
+            self.flush()
+            entries_after = sum(len(cache) for cache in caches.values())
+            size_after = self.disk_usage()["total"]
+        finally:
+            try:
+                self._stats_store().delete(GC_LOCK_KEY)
+            except Exception:
+                pass
+
+        return {
+            "removed_entries": max(entries_before - entries_after, 0),
+            "removed_files": removed_files,
+            "freed_bytes": max(size_before - size_after, 0),
+            "size_before": size_before,
+            "size_after": size_after,
+        }
+
+    def _shrink(self, caches: Dict[str, diskcache.Cache], excess: int) -> Dict[str, int]:
+        """
+        Evict least recently used entries of each cache in proportion to its size.
+
+        Returns:
+            Number of evicted entries per namespace
+        """
+        total = sum(cache.volume() for cache in caches.values())
+        evictions = {}
+        for name, cache in caches.items():
+            volume = cache.volume()
+            if not total or not volume:
+                continue
+            target = max(volume - excess * volume // total - 1, 0)
+            limit = cache.size_limit
+            try:
+                cache.reset("size_limit", target)
+                evictions[name] = cache.cull()
+            finally:
+                cache.reset("size_limit", limit)
+        return evictions
+
+    def close(self) -> None:
+        """Close all open cache files."""
+        self.cache.close()
+        for cache in self._namespaces.values():
+            cache.close()
+        if self._stats is not None:
+            self._stats.close()
+
+    def export_bundle(
+        self, bundle_path: str, namespaces: Optional[list[str]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Export cache namespaces to a compressed, versioned bundle.
+
+        The bundle is a gzipped tar archive with one JSON Lines file per
+        namespace and a manifest holding the format version and the SHA-256
+        of every file. Values are written as JSON, with bytes (such as cached
+        HTTP bodies) base64-encoded; entries whose values cannot be encoded
+        are skipped and counted.
+
+        Args:
+            bundle_path: Path of the bundle to write
+            namespaces: Namespaces to export (default: all)
+
+        Returns:
+            Per namespace, the number of exported and skipped entries
+        """
+        from ossval import __version__
+
+        now = time.time()
+        manifest: Dict[str, Any] = {
+            "format": BUNDLE_FORMAT,
+            "version": BUNDLE_VERSION,
+            "ossval_version": __version__,
+            "created_at": now,
+            "namespaces": {},
+        }
+        results: Dict[str, Dict[str, int]] = {}
+
+        with tarfile.open(bundle_path, "w:gz") as bundle:
+            for name in namespaces or self._namespace_names():
+                cache = self.namespace(name)
+                lines = []
+                skipped = 0
+                for key in cache.iterkeys():
+                    value, expire_at, stored_at = cache.get(
+                        key, default=_MISSING, expire_time=True, tag=True
+                    )
+                    if value is _MISSING:
+                        continue
+                    try:
+                        lines.append(json.dumps({
+                            "key": key,
+                            "value": value,
+                            "stored_at": stored_at if stored_at is not None else now,
+                            "expire_at": expire_at,
+                        }, separators=(",", ":"), default=_encode_bundle_value))
+                    except (TypeError, ValueError):
+                        skipped += 1
+                data = "".join(line + "\n" for line in lines).encode("utf-8")
+                member = f"namespaces/{name}.jsonl"
+                _add_bundle_member(bundle, member, data)
+                manifest["namespaces"][name] = {
+                    "file": member,
+                    "entries": len(lines),
+                    "sha256": hashlib.sha256(data).hexdigest(),
+                }
+                results[name] = {"exported": len(lines), "skipped": skipped}
+
+            _add_bundle_member(
+                bundle, "manifest.json", json.dumps(manifest, indent=2).encode("utf-8")
+            )
+
+        return results
+
+    def import_bundle(self, bundle_path: str) -> Dict[str, Dict[str, int]]:
+        """
+        Merge a bundle written by export_bundle into this cache.
+
+        Every file is checked against the manifest, and every entry for
+        well-formedness, before anything is written. On conflicts the more recently stored entry wins; entries
+        that have already expired are skipped.
+
+        Args:
+            bundle_path: Path of the bundle to read
+
+        Returns:
+            Per namespace, the number of imported, kept (newer local) and expired entries
+
+        Raises:
+            ValueError: If the bundle is not a supported, intact cache bundle
+        """
+        try:
+            bundle = tarfile.open(bundle_path, "r:gz")
+        except (OSError, tarfile.TarError) as e:
+            raise ValueError(f"Not a cache bundle: {e}") from e
+
+        with bundle:
+            try:
+                manifest = json.loads(_read_bundle_member(bundle, "manifest.json"))
+            except UnicodeDecodeError as e:
+                raise ValueError(f"Not a cache bundle: {e}") from e
+            if not isinstance(manifest, dict) or manifest.get("format") != BUNDLE_FORMAT:
+                raise ValueError("Not a cache bundle: unknown format")
+            if manifest.get("version") != BUNDLE_VERSION:
+                raise ValueError(
+                    f"Unsupported cache bundle version: {manifest.get('version')}"
+                )
+            namespaces = manifest.get("namespaces")
+            if not isinstance(namespaces, dict):
+                raise ValueError("Cache bundle is corrupt: manifest has no namespaces")
+
+            # Verify everything before merging anything
+            contents = {}
+            for name, meta in namespaces.items():
+                # Namespace names become directory names
+                if not name.replace("_", "").replace("-", "").isalnum():
+                    raise ValueError(f"Cache bundle has an invalid namespace: {name!r}")
+                if not isinstance(meta, dict) or not all(
+                    isinstance(meta.get(field), str) for field in ("file", "sha256")
+                ):
+                    raise ValueError(f"Cache bundle is corrupt: bad manifest entry for {name}")
+                data = _read_bundle_member(bundle, meta["file"])
+                if hashlib.sha256(data).hexdigest() != meta["sha256"]:
+                    raise ValueError(f"Cache bundle is corrupt: checksum mismatch for {name}")
+                contents[name] = _parse_bundle_entries(name, data)
+
+        now = time.time()
+        results: Dict[str, Dict[str, int]] = {}
+        for name, entries in contents.items():
+            cache = self.namespace(name)
+            counts = {"imported": 0, "kept": 0, "expired": 0}
+            for entry in entries:
+                if entry.expire_at is not None and entry.expire_at <= now:
+                    counts["expired"] += 1
+                    continue
+                _, local_stored_at = cache.get(entry.key, default=_MISSING, tag=True)
+                if local_stored_at is not None and local_stored_at >= entry.stored_at:
+                    counts["kept"] += 1
+                    continue
+                cache.set(
+                    entry.key,
+                    entry.value,
+                    expire=entry.expire_at - now if entry.expire_at is not None else None,
+                    tag=entry.stored_at,
+                )
+                counts["imported"] += 1
+            results[name] = counts
+
+        # Imported entries may be newer than what the memory tier holds
+        self.memory.clear()
+        return results
 
     def info(self) -> dict[str, Any]:
         """Get cache information."""
         try:
+            namespaces = {}
+            for name in self._namespace_names():
+                cache = self.namespace(name)
+                namespaces[name] = {"size": cache.volume(), "count": len(cache)}
             return {
                 "cache_dir": str(self.cache_dir),
-                "size": self.cache.volume(),
-                "count": len(self.cache),
+                "size": self.cache.volume() + sum(ns["size"] for ns in namespaces.values()),
+                "count": len(self.cache) + sum(ns["count"] for ns in namespaces.values()),
+                "namespaces": namespaces,
+                "memory": {"count": len(self.memory), "size": self.memory.total_bytes},
+                "disk": self.disk_usage(),
+                "stats": self.stats(),
             }
         except Exception:
-            return {"cache_dir": str(self.cache_dir), "size": 0, "count": 0}
+            return {
+                "cache_dir": str(self.cache_dir),
+                "size": 0,
+                "count": 0,
+                "namespaces": {},
+                "memory": {"count": 0, "size": 0},
+                "disk": {},
+                "stats": {},
+            }
+
+
+def _path_size(path: Path) -> int:
+    """Size of a file, or of all files below a directory, in bytes."""
+    try:
+        if path.is_file():
+            return path.stat().st_size
+        return sum(child.stat().st_size for child in path.rglob("*") if child.is_file())
+    except OSError:
+        return 0
+
+
+def _remove_path(path: Path) -> int:
+    """Remove a file or directory tree; returns 1 if it was removed."""
+    try:
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+        return 1
+    except OSError:
+        return 0
+
+
+def _add_bundle_member(bundle: tarfile.TarFile, name: str, data: bytes) -> None:
+    """Add an in-memory file to a bundle archive."""
+    member = tarfile.TarInfo(name)
+    member.size = len(data)
+    member.mtime = int(time.time())
+    bundle.addfile(member, io.BytesIO(data))
+
+
+def _read_bundle_member(bundle: tarfile.TarFile, name: str) -> bytes:
+    """Read a file from a bundle archive without extracting it to disk."""
+    try:
+        member = bundle.extractfile(name)
+    except KeyError:
+        member = None
+    if member is None:
+        raise ValueError(f"Cache bundle is missing {name}")
+    return member.read()
+
+
+def _encode_bundle_value(value: Any) -> Any:
+    """JSON stand-in for values json cannot encode; bytes become base64."""
+    if isinstance(value, bytes):
+        return {_BUNDLE_BYTES_KEY: base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot export a value of type {type(value).__name__}")
+
+
+def _decode_bundle_object(obj: Dict[str, Any]) -> Any:
+    """Restore bytes encoded by _encode_bundle_value."""
+    if len(obj) == 1 and isinstance(obj.get(_BUNDLE_BYTES_KEY), str):
+        return base64.b64decode(obj[_BUNDLE_BYTES_KEY], validate=True)
+    return obj
+
+
+def _parse_bundle_entries(name: str, data: bytes) -> list[_BundleEntry]:
+    """
+    Decode and validate the entries of a bundle namespace file.
+
+    Raises:
+        ValueError: If a line is not a well-formed entry
+    """
+    entries = []
+    try:
+        lines = data.decode("utf-8").splitlines()
+    except UnicodeDecodeError as e:
+        raise ValueError(f"Cache bundle is corrupt: {name} is not UTF-8") from e
+    for number, line in enumerate(lines, 1):
+        try:
+            entry = json.loads(line, object_hook=_decode_bundle_object)
+        except ValueError as e:
+            raise ValueError(f"Cache bundle is corrupt: {name} line {number}: {e}") from e
+        if (
+            not isinstance(entry, dict)
+            or not isinstance(entry.get("key"), str)
+            or "value" not in entry
+            or not _is_number(entry.get("stored_at"))
+            or not (entry.get("expire_at") is None or _is_number(entry["expire_at"]))
+        ):
+            raise ValueError(f"Cache bundle is corrupt: {name} line {number} is not an entry")
+        entries.append(
+            _BundleEntry(entry["key"], entry["value"], entry["stored_at"], entry.get("expire_at"))
+        )
+    return entries
+
+
+def _is_number(value: Any) -> bool:
+    """Whether a decoded JSON value is a number."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _value_size(value: Any) -> int:
+    """Approximate serialized size of a cached value in bytes."""
+    if isinstance(value, bytes):
+        return len(value)
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except Exception:
+        return 0
+
 
+def _summarize_stats(counters: Dict[str, int]) -> Dict[str, float]:
+    """Add hit rate and average get/set latency (ms) to raw counters."""
+    lookups = counters["hits"] + counters["misses"]
+    summary: Dict[str, float] = dict(counters)
+    summary["disk_hits"] = counters["hits"] - counters["memory_hits"]
+    summary["hit_rate"] = counters["hits"] / lookups if lookups else 0.0
+    summary["avg_get_ms"] = counters["get_time_us"] / lookups / 1000 if lookups else 0.0
+    summary["avg_set_ms"] = (
+        counters["set_time_us"] / counters["sets"] / 1000 if counters["sets"] else 0.0
+    )
+    return summary
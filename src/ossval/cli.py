@@ -3,16 +3,39 @@
 import asyncio
 import os
 from pathlib import Path
+from typing import Optional
+from xml.etree import ElementTree as ET
 
 import click
 
 from ossval import __version__
+from ossval.analyzers.offline_index import OfflineIndex, build_index, default_index_path
 from ossval.cache import AnalysisCache
-from ossval.core import analyze, quick_estimate
+from ossval.core import analyze, quick_estimate, warm_cache
 from ossval.models import AnalysisConfig, Region, ProjectType
 from ossval.output import format_csv, format_json, format_text
 
 
+def _github_tokens(value: Optional[str]) -> dict:
+    """Split a comma-separated token list into the github_token/github_tokens config fields."""
+    tokens = [token.strip() for token in (value or "").split(",") if token.strip()]
+    return {"github_token": tokens[0] if tokens else None, "github_tokens": tokens[1:]}
+
+
+def _parse_rate_limits(ctx, param, values) -> dict:
+    """Parse repeated HOST=RPS options into a host rate mapping."""
+    limits = {}
+    for value in values:
+        host, _, rate = value.partition("=")
+        try:
+            limits[host.strip().lower()] = float(rate)
+        except ValueError:
+            raise click.BadParameter(f"expected HOST=RPS, got {value!r}")
+        if not host.strip() or limits[host.strip().lower()] < 0:
+            raise click.BadParameter(f"expected HOST=RPS, got {value!r}")
+    return limits
+
+
 @click.group()
 @click.version_option(version=__version__)
 def main():
@@ -20,15 +43,159 @@ def main():
     pass
 
 
+# Options of analyze and cache warm that decide what is resolved, analyzed and
+# cached, so that a warmed cache serves the matching analyze run
+_ANALYSIS_OPTIONS = [
+    click.option(
+        "--region",
+        "-r",
+        type=click.Choice([r.value for r in Region], case_sensitive=False),
+        default="global_average",
+        help="Region for salary calculation",
+    ),
+    click.option(
+        "--no-local-metadata",
+        is_flag=True,
+        help="Don't resolve repositories from locally installed package metadata",
+    ),
+    click.option(
+        "--offline-index",
+        type=click.Path(exists=True, dir_okay=False),
+        help="Offline registry index written by 'ossval index build' (default: the built one, if any)",
+    ),
+    click.option(
+        "--cache-dir",
+        type=click.Path(),
+        help="Cache directory path",
+    ),
+    click.option(
+        "--workers",
+        "-w",
+        type=click.IntRange(min=1, max=64),
+        default=1,
+        help="Worker processes for per-file code analysis",
+    ),
+    click.option(
+        "--github-token",
+        envvar="GITHUB_TOKEN",
+        help="GitHub API token, or comma-separated tokens to rotate (or set GITHUB_TOKEN env var)",
+    ),
+    click.option(
+        "--methodology",
+        type=click.Choice(["cocomo2", "sloccount"], case_sensitive=False),
+        default="cocomo2",
+        help="Cost estimation methodology",
+    ),
+    click.option(
+        "--type",
+        "-t",
+        type=click.Choice([pt.value for pt in ProjectType], case_sensitive=False),
+        help="Override project type detection",
+    ),
+    click.option(
+        "--halstead-sample",
+        type=click.IntRange(min=1),
+        metavar="FILES",
+        help="Analyze a stratified sample of at most FILES files for Halstead metrics",
+    ),
+    click.option(
+        "--halstead-sample-bytes",
+        type=click.IntRange(min=1),
+        metavar="BYTES",
+        help="Byte budget for the Halstead file sample",
+    ),
+    click.option(
+        "--max-file-bytes",
+        type=click.IntRange(min=1),
+        metavar="BYTES",
+        help="Skip files larger than BYTES during code analysis",
+    ),
+    click.option(
+        "--file-timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        metavar="SECONDS",
+        help="Skip files whose analysis takes longer than SECONDS",
+    ),
+    click.option(
+        "--repo-timeout",
+        type=click.FloatRange(min=0, min_open=True),
+        metavar="SECONDS",
+        help="Time budget for analyzing each repository",
+    ),
+    click.option(
+        "--rate-limit",
+        "rate_limits",
+        multiple=True,
+        callback=_parse_rate_limits,
+        metavar="HOST=RPS",
+        help="Requests per second for a registry/API host, e.g. crates.io=1 (repeatable)",
+    ),
+    click.option(
+        "--maven-repo",
+        "maven_repos",
+        multiple=True,
+        metavar="DIR|URL",
+        help="Maven repository directory or URL searched for POMs before Maven Central (repeatable)",
+    ),
+    click.option(
+        "--cache-max-bytes",
+        type=click.IntRange(min=0),
+        metavar="BYTES",
+        help="Garbage-collect the cache after the run when it is larger than BYTES",
+    ),
+]
+
+
+def _analysis_options(command):
+    """Add the options shared by analyze and cache warm to a command."""
+    for option in reversed(_ANALYSIS_OPTIONS):
+        command = option(command)
+    return command
+
+
+def _analysis_config(
+    region,
+    no_local_metadata,
+    offline_index,
+    cache_dir,
+    workers,
+    github_token,
+    methodology,
+    type,
+    halstead_sample,
+    halstead_sample_bytes,
+    max_file_bytes,
+    file_timeout,
+    repo_timeout,
+    rate_limits,
+    maven_repos,
+    cache_max_bytes,
+    **settings,
+) -> AnalysisConfig:
+    """Build the AnalysisConfig of analyze or cache warm from the shared options."""
+    return AnalysisConfig(
+        region=Region(region),
+        local_metadata=not no_local_metadata,
+        offline_index=offline_index,
+        cache_dir=cache_dir,
+        analysis_workers=workers,
+        **_github_tokens(github_token or os.getenv("GITHUB_TOKEN")),
+        methodology=methodology,
+        project_type_override=ProjectType(type) if type else None,
+        halstead_sample_files=halstead_sample,
+        halstead_sample_bytes=halstead_sample_bytes,
+        max_file_bytes=max_file_bytes,
+        file_timeout=file_timeout,
+        repo_timeout=repo_timeout,
+        host_rate_limits=rate_limits,
+        maven_repositories=list(maven_repos),
+        cache_max_bytes=cache_max_bytes,
+        **settings,
+    )
+
+
 @main.command()
 @click.argument("filepath", type=click.Path(exists=True))
-@click.option(
-    "--region",
-    "-r",
-    type=click.Choice([r.value for r in Region], case_sensitive=False),
-    default="global_average",
-    help="Region for salary calculation",
-)
 @click.option(
     "--format",
     "-f",
@@ -52,11 +219,6 @@ def main():
     is_flag=True,
     help="Don't use disk cache",
 )
-@click.option(
-    "--cache-dir",
-    type=click.Path(),
-    help="Cache directory path",
-)
 @click.option(
     "--concurrency",
     "-c",
@@ -64,53 +226,28 @@ def main():
     default=4,
     help="Max parallel operations",
 )
-@click.option(
-    "--github-token",
-    envvar="GITHUB_TOKEN",
-    help="GitHub API token (or set GITHUB_TOKEN env var)",
-)
-@click.option(
-    "--methodology",
-    type=click.Choice(["cocomo2", "sloccount"], case_sensitive=False),
-    default="cocomo2",
-    help="Cost estimation methodology",
-)
-@click.option(
-    "--type",
-    "-t",
-    type=click.Choice([pt.value for pt in ProjectType], case_sensitive=False),
-    help="Override project type detection",
-)
+@_analysis_options
 @click.option("--verbose", "-v", is_flag=True, help="Verbose output")
 @click.option("--quiet", "-q", is_flag=True, help="Quiet mode")
 def analyze_cmd(
     filepath,
-    region,
     format,
     output,
     no_clone,
     no_cache,
-    cache_dir,
     concurrency,
-    github_token,
-    methodology,
-    type,
     verbose,
     quiet,
+    **options,
 ):
     """Analyze SBOM or lockfile and calculate OSS value."""
-    # Build config
-    config = AnalysisConfig(
-        region=Region(region),
+    config = _analysis_config(
         clone_repos=not no_clone,
         use_cache=not no_cache,
-        cache_dir=cache_dir,
         concurrency=concurrency,
-        github_token=github_token or os.getenv("GITHUB_TOKEN"),
-        methodology=methodology,
-        project_type_override=ProjectType(type) if type else None,
         verbose=verbose,
         quiet=quiet,
+        **options,
     )
 
     if not quiet:
@@ -274,6 +411,130 @@ def cache_clear(cache_dir):
     click.echo("Cache cleared.")
 
 
+@cache.command("warm")
+@click.argument("filepath", type=click.Path(exists=True))
+@click.option(
+    "--concurrency",
+    "-c",
+    type=click.IntRange(min=1, max=32),
+    default=16,
+    help="Max parallel operations",
+)
+@_analysis_options
+@click.option("--quiet", "-q", is_flag=True, help="Quiet mode")
+def cache_warm(filepath, concurrency, quiet, **options):
+    """
+    Resolve, clone and analyze every package of FILEPATH into the cache.
+
+    Pass the analysis options of the analyze runs the cache is meant to serve:
+    they decide how repositories are resolved and which cache entries are written.
+    """
+    config = _analysis_config(concurrency=concurrency, quiet=quiet, **options)
+
+    done = 0
+
+    def report(package):
+        # The package count is unknown until the SBOM has been read through
+        nonlocal done
+        done += 1
+        click.echo(f"\rWarming cache: {done:,} packages done", nl=False, err=True)
+
+    try:
+        counts = asyncio.run(warm_cache(filepath, config, progress=None if quiet else report))
+    except (ValueError, ET.ParseError) as e:
+        raise click.ClickException(str(e))
+    finally:
+        if done:
+            click.echo(err=True)
+
+    if not quiet:
+        click.echo(
+            f"Cached {counts['analyzed']}/{counts['resolved']} repositories "
+            f"for {counts['packages']} packages ({counts['failed']} failed)",
+            err=True,
+        )
+
+
+@cache.command("export")
+@click.argument("bundle", type=click.Path(dir_okay=False))
+@click.option(
+    "--cache-dir",
+    type=click.Path(),
+    help="Cache directory path",
+)
+@click.option(
+    "--namespace",
+    "-n",
+    "namespaces",
+    multiple=True,
+    help="Namespace to export (repeatable, default: all)",
+)
+def cache_export(bundle, cache_dir, namespaces):
+    """Export cache namespaces to a compressed BUNDLE file."""
+    cache = AnalysisCache(cache_dir=cache_dir)
+    results = cache.export_bundle(bundle, list(namespaces) or None)
+    for name, counts in results.items():
+        line = f"  {name}: {counts['exported']:,} entries"
+        if counts["skipped"]:
+            line += f", {counts['skipped']:,} skipped (not serializable)"
+        click.echo(line)
+    click.echo(f"Exported {sum(c['exported'] for c in results.values()):,} entries to {bundle}.")
+    skipped = sum(c["skipped"] for c in results.values())
+    if skipped:
+        click.echo(f"Warning: skipped {skipped:,} entries that cannot be serialized.", err=True)
+
+
+@cache.command("import")
+@click.argument("bundle", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--cache-dir",
+    type=click.Path(),
+    help="Cache directory path",
+)
+def cache_import(bundle, cache_dir):
+    """Merge a BUNDLE written by cache export into the cache."""
+    cache = AnalysisCache(cache_dir=cache_dir)
+    try:
+        results = cache.import_bundle(bundle)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    for name, counts in results.items():
+        click.echo(
+            f"  {name}: {counts['imported']:,} imported, {counts['kept']:,} kept (newer locally), "
+            f"{counts['expired']:,} expired"
+        )
+    click.echo(f"Imported {sum(c['imported'] for c in results.values()):,} entries.")
+
+
+@cache.command("gc")
+@click.option(
+    "--cache-dir",
+    type=click.Path(),
+    help="Cache directory path",
+)
+@click.option(
+    "--max-bytes",
+    type=click.IntRange(min=0),
+    help="Evict least recently used artifacts until the cache fits in this many bytes",
+)
+@click.option(
+    "--max-age-days",
+    type=click.FloatRange(min=0),
+    help="Remove cache entries stored more than this many days ago",
+)
+def cache_gc(cache_dir, max_bytes, max_age_days):
+    """Remove expired, stale and least recently used cache artifacts."""
+    cache = AnalysisCache(cache_dir=cache_dir)
+    result = cache.gc(max_bytes=max_bytes, max_age_days=max_age_days)
+    if result is None:
+        raise click.ClickException("Another process is already collecting this cache")
+    click.echo(
+        f"Removed {result['removed_entries']:,} entries and {result['removed_files']:,} files, "
+        f"freed {result['freed_bytes']:,} bytes "
+        f"({result['size_before']:,} -> {result['size_after']:,} bytes)."
+    )
+
+
 @cache.command("info")
 @click.option(
     "--cache-dir",
@@ -287,6 +548,95 @@ def cache_info(cache_dir):
     click.echo(f"Cache directory: {info['cache_dir']}")
     click.echo(f"Cache size: {info['size']:,} bytes")
     click.echo(f"Cache entries: {info['count']:,}")
+    for name, namespace in info["namespaces"].items():
+        click.echo(f"  {name}: {namespace['count']:,} entries, {namespace['size']:,} bytes")
+    if info["disk"]:
+        click.echo(
+            f"Disk usage: {info['disk']['total']:,} bytes "
+            f"({info['disk']['legacy']:,} bytes of legacy files)"
+        )
+
+    if info["stats"]:
+        click.echo("Statistics:")
+    for name, stats in info["stats"].items():
+        click.echo(
+            f"  {name}: {stats['hits']:,} hits ({stats['memory_hits']:,} memory, "
+            f"{stats['disk_hits']:,} disk, {stats['stale_hits']:,} stale), "
+            f"{stats['misses']:,} misses "
+            f"({stats['hit_rate']:.1%}), {stats['evictions']:,} evictions, "
+            f"{stats['expirations']:,} expirations, "
+            f"avg get {stats['avg_get_ms']:.2f} ms, avg set {stats['avg_set_ms']:.2f} ms, "
+            f"{stats['bytes_saved']:,} bytes saved, {stats['revalidations']:,} revalidated"
+        )
+
+
+@main.group()
+def index():
+    """Manage the offline registry index."""
+    pass
+
+
+@index.command("build")
+@click.option(
+    "--npm",
+    "npm",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="npm registry replicate as JSON lines (repeatable)",
+)
+@click.option(
+    "--pypi",
+    "pypi",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="PyPI JSON metadata dump as JSON lines (repeatable)",
+)
+@click.option(
+    "--crates",
+    "crates",
+    multiple=True,
+    type=click.Path(exists=True, dir_okay=False),
+    help="crates.io database dump (db-dump.tar.gz or crates.csv, repeatable)",
+)
+@click.option(
+    "--maven",
+    "maven",
+    multiple=True,
+    type=click.Path(exists=True, file_okay=False),
+    help="Maven repository mirror directory of POMs (repeatable)",
+)
+@click.option(
+    "--output",
+    "-o",
+    type=click.Path(dir_okay=False),
+    help=f"Index file to write (default: {default_index_path()})",
+)
+def index_build(npm, pypi, crates, maven, output):
+    """Build the offline registry index from bulk metadata exports."""
+    if not (npm or pypi or crates or maven):
+        raise click.UsageError("Give at least one of --npm, --pypi, --crates or --maven")
+    output = output or default_index_path()
+    counts = build_index(output, npm=npm, pypi=pypi, crates=crates, maven=maven)
+    for ecosystem, count in sorted(counts.items()):
+        click.echo(f"  {ecosystem}: {count:,} packages")
+    click.echo(f"Indexed {sum(counts.values()):,} packages in {output}.")
+
+
+@index.command("info")
+@click.argument("path", required=False, type=click.Path(exists=True, dir_okay=False))
+def index_info(path):
+    """Show the packages in an offline registry index."""
+    path = path or default_index_path()
+    if not Path(path).is_file():
+        raise click.ClickException(f"No index at {path}; build one with 'ossval index build'")
+    offline_index = OfflineIndex(path)
+    try:
+        counts = offline_index.counts()
+    finally:
+        offline_index.close()
+    click.echo(f"Index: {path}")
+    for ecosystem, count in counts.items():
+        click.echo(f"  {ecosystem}: {count:,} packages")
 
 
 if __name__ == "__main__":
@@ -1,32 +1,73 @@
 """Core analysis orchestration."""
 
 import asyncio
+import io
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
 from urllib.parse import urlparse
 
+from pydantic import BaseModel
+
 from ossval import __version__
 from ossval.analyzers import (
     analyze_complexity,
-    analyze_directory_halstead,
     analyze_git_history,
     analyze_health,
-    analyze_sloc,
+    analyze_repository,
     calculate_maintainability_index,
     find_repository_url,
 )
+from ossval.analyzers.fused import SKIP_BUDGET, SKIP_SIZE, SKIP_TIMEOUT
+from ossval.analyzers.go_resolver import GoResolver
+from ossval.analyzers.health import HealthBatcher
+from ossval.analyzers.local_metadata import LocalMetadataIndex
+from ossval.analyzers.maven_resolver import MavenResolver
+from ossval.analyzers.offline_index import OfflineIndex, default_index_path
+from ossval.analyzers.repo_finder import (
+    artifact_session,
+    set_go_resolver,
+    set_local_metadata_index,
+    set_maven_resolver,
+    set_offline_index,
+)
+from ossval.analyzers.sloc import cloned_repository
+from ossval.cache import FRESH, STALE, AnalysisCache, cache_key
 from ossval.data.project_types import detect_project_type
 from ossval.estimators import COCOMO2Estimator, SLOCCountEstimator
+from ossval.http_client import (
+    RateLimitExceededError,
+    TokenPool,
+    set_host_rate_limits,
+    set_http_cache,
+)
 from ossval.models import (
     AnalysisConfig,
     AnalysisResult,
+    ComplexityMetrics,
+    CostEstimate,
+    FetchStatus,
+    GitHistoryMetrics,
+    HalsteadMetrics,
+    HealthMetrics,
     Package,
     ProjectType,
     Region,
+    SLOCMetrics,
     SourceType,
 )
-from ossval.parsers.base import BaseParser
+from ossval.parsers.base import BaseParser, ParseResult
 from ossval.parsers.cargo import CargoParser
 from ossval.parsers.cyclonedx import CycloneDXParser
 from ossval.parsers.go_mod import GoModParser
@@ -40,9 +81,10 @@ from ossval.parsers.poetry import PoetryLockParser
 from ossval.parsers.pyproject import PyProjectParser
 from ossval.parsers.requirements import RequirementsParser
 from ossval.parsers.simple import SimpleParser
+from ossval.parsers.sniff import SNIFF_BYTES, Sniffed, sniff, sniff_file
 from ossval.parsers.spdx import SPDXParser
 from ossval.parsers.yarn import YarnLockParser
-from ossval.cache import AnalysisCache
+from ossval.singleflight import SingleFlight
 
 
 def parse_sbom(filepath: str) -> List[Package]:
@@ -55,11 +97,9 @@ def parse_sbom(filepath: str) -> List[Package]:
     Returns:
         List of Package objects
     """
-    parser = _select_parser(filepath)
-    if not parser:
+    parse_result = _parse_file(filepath)
+    if parse_result is None:
         raise ValueError(f"No parser found for file: {filepath}")
-
-    parse_result = parser.parse(filepath)
     return parse_result.packages
 
 
@@ -83,27 +123,121 @@ PARSERS: List[BaseParser] = [
 ]
 
 
-def _select_parser(filepath: str) -> Optional[BaseParser]:
-    """Select appropriate parser for file."""
+def _select_parser(filepath: str, sniffed: Optional[Sniffed] = None) -> Optional[BaseParser]:
+    """Select appropriate parser for file from its name and sniffed head."""
+    if sniffed is None:
+        sniffed = sniff_file(filepath)
     for parser in PARSERS:
-        if parser.can_parse(filepath):
+        if parser.matches(filepath, sniffed):
             return parser
     return None
 
 
+def _open_buffered(filepath: str) -> io.BufferedReader:
+    """Open a file for reading with a buffer large enough to peek the sniffed head."""
+    return io.BufferedReader(io.FileIO(filepath, "rb"), buffer_size=SNIFF_BYTES)
+
+
+def _parse_file(filepath: str) -> Optional[ParseResult]:
+    """
+    Identify the format of a file and parse it, reading it once.
+
+    The head used for sniffing stays in the buffer of the open file, which is
+    handed to the selected parser, so no parser reads or parses the input a
+    second time.
+
+    Returns:
+        ParseResult, or None if no parser handles the file
+    """
+    with _open_buffered(filepath) as f:
+        sniffed = sniff(filepath, f.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+        parser = _select_parser(filepath, sniffed)
+        if parser is None:
+            return None
+        return parser.parse_buffer(filepath, f)
+
+
+def iter_sbom(filepath: str, result: Optional[ParseResult] = None) -> Iterator[Package]:
+    """
+    Yield the packages of an SBOM or lockfile as they are parsed.
+
+    Unlike parse_sbom, formats with an incremental parser (CycloneDX JSON
+    and XML) are never loaded whole: each package is yielded as soon as its
+    component has been read, so analysis can start before parsing finishes
+    and memory stays flat however large the SBOM is. The parser is chosen
+    when this function is called, so an unsupported file fails right away.
+
+    Args:
+        filepath: Path to SBOM/lockfile
+        result: Optional ParseResult that receives the source type and file,
+            and the error that stops parsing instead of it being raised; the
+            packages read before the error are still yielded. Packages are
+            not collected in it.
+
+    Returns:
+        Iterator over Package objects
+
+    Raises:
+        ValueError: If no parser handles the file
+    """
+    f = _open_buffered(filepath)
+    try:
+        sniffed = sniff(filepath, f.peek(SNIFF_BYTES)[:SNIFF_BYTES])
+        parser = _select_parser(filepath, sniffed)
+        if parser is None:
+            raise ValueError(f"No parser found for file: {filepath}")
+    except BaseException:
+        f.close()
+        raise
+    if result is not None:
+        result.source_type = parser.source_type
+        result.source_file = filepath
+    return _read_packages(parser, filepath, f, result)
+
+
+def _read_packages(
+    parser: BaseParser, filepath: str, f: io.BufferedReader, result: Optional[ParseResult]
+) -> Iterator[Package]:
+    """Yield the packages of an open file, closing it once they are read."""
+    with f:
+        if result is None:
+            yield from parser.iter_packages(filepath, f)
+            return
+        try:
+            yield from parser.iter_packages(filepath, f)
+        except Exception as e:
+            # ElementTree.ParseError is a SyntaxError, not a ValueError
+            result.errors.append(f"Failed to parse {filepath}: {e}")
+
+
 async def _analyze_package(
     package: Package,
     config: AnalysisConfig,
     cache: Optional[AnalysisCache] = None,
+    refreshes: Optional[Dict[Tuple[str, str], asyncio.Task]] = None,
 ) -> Package:
-    """Analyze a single package (async)."""
+    """
+    Analyze a single package (async).
+
+    Stale registry and health entries are used as-is and refreshed by tasks
+    added to ``refreshes``; without it they are revalidated before use.
+    """
     # Find repository URL if not present
     if not package.repository_url and package.ecosystem:
-        repo_url = await find_repository_url(
-            package.name, package.ecosystem, package.version
+        name, ecosystem, version = package.name, package.ecosystem, package.version
+        repo_url, freshness = await _cached_fetch(
+            cache,
+            "registry",
+            cache_key(ecosystem, name, version),
+            lambda: _flights.do(
+                ("registry", ecosystem, name, version),
+                lambda: find_repository_url(name, ecosystem, version),
+            ),
+            refreshes,
         )
         if repo_url:
             package.repository_url = repo_url
+            package.freshness["registry"] = freshness
 
     # Detect project type (or use override)
     if config.project_type_override:
@@ -116,49 +250,20 @@ async def _analyze_package(
         package.project_type = project_type
         package.project_type_detection = detection_details
 
-    # Analyze SLOC if repository URL is available and cloning is enabled
-    repo_path = None
+    # Analyze SLOC, Halstead, complexity and git history if repository URL is
+    # available and cloning is enabled
     if config.clone_repos and package.repository_url:
-        cache_dir = str(cache.cache_dir) if cache else None
         try:
-            sloc = await analyze_sloc(
-                package.repository_url,
-                cache_dir=cache_dir,
-                use_cache=config.use_cache,
-            )
-            if sloc and sloc.total > 0:
-                package.sloc = sloc
-                package.language = _infer_language_from_sloc(sloc)
-
-                # Store repo path for additional analysis
-                if cache_dir:
-                    repo_name = package.repository_url.split("/")[-1].replace(".git", "")
-                    repo_path = Path(cache_dir) / "repos" / repo_name
-            elif sloc is None:
-                # Failed to get SLOC - add warning
-                package.warnings.append(
-                    f"Could not analyze SLOC (clone or analysis failed)"
-                )
+            await _analyze_repository_code(package, config, cache)
         except Exception as e:
             package.warnings.append(f"Error analyzing SLOC: {str(e)}")
-
-    # Analyze Halstead metrics if we have a cloned repository
-    if repo_path and repo_path.exists():
-        try:
-            halstead = analyze_directory_halstead(repo_path)
-            if halstead:
-                package.halstead = halstead
-        except Exception as e:
-            package.warnings.append(f"Error analyzing Halstead metrics: {str(e)}")
-
-    # Analyze git history if we have a cloned repository
-    if repo_path and repo_path.exists():
-        try:
-            git_history = await analyze_git_history(repo_path, use_cache=config.use_cache)
-            if git_history:
-                package.git_history = git_history
-        except Exception as e:
-            package.warnings.append(f"Error analyzing git history: {str(e)}")
+    elif package.repository_url and cache:
+        # Without cloning, git history can still come from an earlier run
+        _, package.git_history = _load_cached_metrics(
+            cache, "git_history", cache_key(package.repository_url), GitHistoryMetrics
+        )
+        if package.git_history:
+            package.freshness["git_history"] = FRESH
 
     # Analyze complexity (if we have code)
     # Note: For now, we'll use default complexity if no code is available
@@ -179,20 +284,351 @@ async def _analyze_package(
         except Exception as e:
             package.warnings.append(f"Error calculating maintainability index: {str(e)}")
 
-    # Analyze health metrics (GitHub only)
-    if package.repository_url:
-        try:
-            parsed = urlparse(package.repository_url.lower())
-            if parsed.netloc == "github.com":
-                health = await analyze_health(package.repository_url, config.github_token)
-                if health:
-                    package.health = health
-        except Exception:
-            pass
-
     return package
 
 
+async def _analyze_package_health(
+    package: Package,
+    config: AnalysisConfig,
+    cache: Optional[AnalysisCache] = None,
+    refreshes: Optional[Dict[Tuple[str, str], asyncio.Task]] = None,
+    health_batcher: Optional[HealthBatcher] = None,
+    token_pool: Optional[TokenPool] = None,
+) -> None:
+    """
+    Fetch health metrics of a GitHub package, batched when a batcher is given.
+
+    A lookup the GitHub rate limit does not allow is marked deferred instead
+    of failing; nothing is cached for it, so the next run retries.
+    """
+    if not package.repository_url:
+        return
+    try:
+        parsed = urlparse(package.repository_url.lower())
+        if parsed.netloc == "github.com":
+            repository_url = package.repository_url
+
+            async def fetch_health() -> Optional[dict]:
+                if health_batcher:
+                    health = await health_batcher.fetch(repository_url)
+                else:
+                    health = await analyze_health(
+                        repository_url, config.github_token, token_pool=token_pool
+                    )
+                return health.model_dump(mode="json") if health else None
+
+            health, freshness = await _cached_fetch(
+                cache,
+                "health",
+                cache_key(repository_url),
+                lambda: _flights.do(("health", repository_url), fetch_health),
+                refreshes,
+            )
+            package.health_status = FetchStatus.COMPLETE
+            if health:
+                package.health = HealthMetrics(**health)
+                package.freshness["health"] = freshness
+    except RateLimitExceededError as e:
+        package.health_status = FetchStatus.DEFERRED
+        package.warnings.append(f"Health metrics deferred: GitHub {e}")
+    except Exception:
+        pass
+
+
+async def _analyze_repository_code(
+    package: Package,
+    config: AnalysisConfig,
+    cache: Optional[AnalysisCache] = None,
+) -> None:
+    """
+    Clone a package repository once and run SLOC, Halstead, complexity and git history analysis.
+
+    Cached results are reused; the repository is only cloned if at least one
+    metric is missing from the cache. The code metrics come from a single
+    fused pass over the files of the checkout, and git history from its log.
+    Packages sharing a repository that are analyzed at the same time share
+    one clone and analysis.
+    """
+    repository_url = package.repository_url
+    code = await _flights.do(
+        (
+            "code",
+            repository_url,
+            config.halstead_sample_files,
+            config.halstead_sample_bytes,
+            config.max_file_bytes,
+            config.file_timeout,
+            config.repo_timeout,
+        ),
+        lambda: _compute_repository_code(repository_url, config, cache),
+    )
+    sloc, halstead, complexity = code["sloc"], code["halstead"], code["complexity"]
+    freshness = code["freshness"]
+    package.warnings.extend(code["warnings"])
+
+    if sloc and sloc.total > 0:
+        package.sloc = sloc
+        package.language = _infer_language_from_sloc(sloc)
+        package.freshness["sloc"] = freshness["sloc"]
+    elif sloc is None:
+        # Failed to get SLOC - add warning
+        package.warnings.append(
+            f"Could not analyze SLOC (clone or analysis failed)"
+        )
+
+    if halstead:
+        package.halstead = halstead
+        package.freshness["halstead"] = freshness["halstead"]
+    if complexity:
+        package.complexity = complexity
+        package.freshness["complexity"] = freshness["complexity"]
+    if code["git_history"]:
+        package.git_history = code["git_history"]
+        package.freshness["git_history"] = freshness["git_history"]
+
+
+async def _compute_repository_code(
+    repository_url: str,
+    config: AnalysisConfig,
+    cache: Optional[AnalysisCache] = None,
+) -> Dict[str, Any]:
+    """
+    Get code and git history metrics of a repository from the cache or a fresh analysis.
+
+    Returns:
+        Dict with the sloc, halstead, complexity and git_history metrics
+        (each possibly None), their freshness and analysis warnings
+    """
+    sloc_key = cache_key(repository_url)
+    halstead_key = cache_key(
+        repository_url, config.halstead_sample_files, config.halstead_sample_bytes
+    )
+    complexity_key = cache_key(repository_url)
+    git_history_key = cache_key(repository_url)
+
+    sloc = None
+    halstead_hit = complexity_hit = git_history_hit = False
+    halstead = complexity = git_history = None
+    warnings: List[str] = []
+    if cache:
+        _, sloc = _load_cached_metrics(cache, "sloc", sloc_key, SLOCMetrics)
+        halstead_hit, halstead = _load_cached_metrics(
+            cache, "halstead", halstead_key, HalsteadMetrics
+        )
+        complexity_hit, complexity = _load_cached_metrics(
+            cache, "complexity", complexity_key, ComplexityMetrics
+        )
+        _, git_history = _load_cached_metrics(
+            cache, "git_history", git_history_key, GitHistoryMetrics
+        )
+        git_history_hit = git_history is not None
+    freshness = {
+        "sloc": FRESH if sloc is not None else LIVE,
+        "halstead": FRESH if halstead_hit else LIVE,
+        "complexity": FRESH if complexity_hit else LIVE,
+        "git_history": FRESH if git_history_hit else LIVE,
+    }
+
+    code_hit = sloc is not None and halstead_hit and complexity_hit
+    if not code_hit or not git_history_hit:
+        with cloned_repository(repository_url, history=not git_history_hit) as repo_path:
+            if repo_path is not None and not git_history_hit:
+                try:
+                    git_history = await analyze_git_history(
+                        repo_path, use_cache=config.use_cache
+                    )
+                except Exception as e:
+                    warnings.append(f"Error analyzing git history: {str(e)}")
+                if cache and git_history:
+                    _save_cached_metrics(cache, "git_history", git_history_key, git_history)
+            if repo_path is not None and not code_hit:
+                # One fused pass: each file is read and parsed once
+                analysis = await asyncio.to_thread(
+                    analyze_repository,
+                    repo_path,
+                    sample_files=config.halstead_sample_files,
+                    sample_bytes=config.halstead_sample_bytes,
+                    workers=config.analysis_workers,
+                    max_file_bytes=config.max_file_bytes,
+                    file_timeout=config.file_timeout,
+                    time_budget=config.repo_timeout,
+                )
+                warnings.extend(_skip_warnings(analysis.skipped, config))
+                sloc = analysis.sloc
+                if not halstead_hit:
+                    halstead = analysis.halstead
+                if not complexity_hit:
+                    complexity = analysis.complexity
+
+                # Results missing skipped files are not cached
+                if cache and not analysis.skipped:
+                    if sloc:
+                        _save_cached_metrics(cache, "sloc", sloc_key, sloc)
+                    if not halstead_hit:
+                        _save_cached_metrics(cache, "halstead", halstead_key, halstead)
+                    if not complexity_hit:
+                        _save_cached_metrics(cache, "complexity", complexity_key, complexity)
+
+    return {
+        "sloc": sloc,
+        "halstead": halstead,
+        "complexity": complexity,
+        "git_history": git_history,
+        "freshness": freshness,
+        "warnings": warnings,
+    }
+
+
+# Sentinel distinguishing a cache miss from a cached None result
+_MISSING = object()
+
+# Freshness of a metric computed or fetched during this run
+LIVE = "live"
+
+# Seconds a run waits at the end for background refreshes of stale entries
+REVALIDATE_GRACE_SECONDS = 2.0
+
+# Registry lookups, clones/analyses and health lookups in flight, shared by
+# every package of the process that needs the same result
+_flights = SingleFlight()
+
+
+async def _cached_fetch(
+    cache: Optional[AnalysisCache],
+    namespace: str,
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    refreshes: Optional[Dict[Tuple[str, str], asyncio.Task]] = None,
+) -> Tuple[Any, str]:
+    """
+    Get a value through the cache with stale-while-revalidate.
+
+    A fresh entry is returned directly. A stale entry is returned at once
+    and a background refresh is added to ``refreshes``; without it the entry
+    is revalidated now and kept only if the fetch fails. ``None`` results
+    are not cached.
+
+    Returns:
+        (value, freshness) where freshness is FRESH, STALE or LIVE
+    """
+    stale = None
+    if cache:
+        value, freshness = cache.lookup(key, namespace)
+        if value is not None and freshness == FRESH:
+            return value, FRESH
+        if value is not None and freshness == STALE:
+            if refreshes is not None:
+                if (namespace, key) not in refreshes:
+                    refreshes[(namespace, key)] = asyncio.create_task(
+                        _refresh(cache, namespace, key, fetch)
+                    )
+                return value, STALE
+            stale = value
+
+    value = await fetch()
+    if value is None:
+        return (stale, STALE) if stale is not None else (None, LIVE)
+    if cache:
+        cache.set(key, value, namespace)
+    return value, LIVE
+
+
+async def _refresh(
+    cache: AnalysisCache, namespace: str, key: str, fetch: Callable[[], Awaitable[Any]]
+) -> None:
+    """Refresh a stale cache entry in the background."""
+    try:
+        value = await fetch()
+    except Exception:
+        return
+    if value is not None:
+        cache.set(key, value, namespace)
+
+
+def _local_metadata_index(
+    filepath: str | List[Package], config: AnalysisConfig
+) -> Optional[LocalMetadataIndex]:
+    """Index of local install metadata for the directory of the input file and the working directory."""
+    if not config.local_metadata:
+        return None
+    project_dirs = [Path.cwd()]
+    if isinstance(filepath, str):
+        project_dirs.insert(0, Path(filepath).resolve().parent)
+    return LocalMetadataIndex(project_dirs=dict.fromkeys(project_dirs))
+
+
+def _offline_index(config: AnalysisConfig) -> Optional[OfflineIndex]:
+    """Open the configured offline registry index, or the default one if it was built."""
+    path = Path(config.offline_index) if config.offline_index else default_index_path()
+    if not path.is_file():
+        return None
+    try:
+        return OfflineIndex(path)
+    except Exception:
+        return None
+
+
+def _auto_gc(cache: AnalysisCache, config: AnalysisConfig) -> None:
+    """Garbage-collect the cache if it has grown over the configured quota."""
+    if config.cache_max_bytes is None:
+        return
+    if cache.disk_usage()["total"] > config.cache_max_bytes:
+        cache.gc(max_bytes=config.cache_max_bytes)
+
+
+async def _drain_refreshes(
+    refreshes: Dict[Tuple[str, str], asyncio.Task], timeout: float
+) -> None:
+    """Give background refreshes a bounded grace period, then cancel the rest."""
+    if not refreshes:
+        return
+    _, pending = await asyncio.wait(refreshes.values(), timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _skip_warnings(skipped: Dict[str, int], config: AnalysisConfig) -> List[str]:
+    """Describe files skipped by the analysis limits as package warnings."""
+    warnings = []
+    if skipped.get(SKIP_SIZE):
+        warnings.append(
+            f"Skipped {skipped[SKIP_SIZE]} files larger than {config.max_file_bytes} bytes"
+        )
+    if skipped.get(SKIP_TIMEOUT):
+        warnings.append(
+            f"Skipped {skipped[SKIP_TIMEOUT]} files that exceeded the "
+            f"{config.file_timeout}s per-file time limit"
+        )
+    if skipped.get(SKIP_BUDGET):
+        warnings.append(
+            f"Repository time budget of {config.repo_timeout}s exhausted; "
+            f"{skipped[SKIP_BUDGET]} files not analyzed"
+        )
+    return warnings
+
+
+def _load_cached_metrics(
+    cache: AnalysisCache, namespace: str, key: str, model: Type[BaseModel]
+) -> Tuple[bool, Optional[BaseModel]]:
+    """Load cached metrics. Returns (hit, metrics); metrics may be None on a hit."""
+    data = cache.get(key, namespace, default=_MISSING)
+    if data is _MISSING:
+        return False, None
+    try:
+        return True, model(**data) if data is not None else None
+    except Exception:
+        return False, None
+
+
+def _save_cached_metrics(
+    cache: AnalysisCache, namespace: str, key: str, metrics: Optional[BaseModel]
+) -> None:
+    """Save metrics (or a None result) to the cache as plain JSON-compatible data."""
+    cache.set(key, metrics.model_dump(mode="json") if metrics else None, namespace)
+
+
 def _infer_language_from_sloc(sloc) -> Optional[str]:
     """Infer primary language from SLOC data."""
     if not sloc or not sloc.by_language:
@@ -205,28 +641,61 @@ def _infer_language_from_sloc(sloc) -> Optional[str]:
 
 
 async def _analyze_packages_parallel(
-    packages: List[Package],
+    packages: Iterable[Package],
     config: AnalysisConfig,
     cache: Optional[AnalysisCache] = None,
+    progress: Optional[Callable[[Package], None]] = None,
+    refreshes: Optional[Dict[Tuple[str, str], asyncio.Task]] = None,
 ) -> List[Package]:
-    """Analyze packages in parallel with concurrency limit."""
+    """
+    Analyze packages in parallel with concurrency limit.
+
+    With a GitHub token, health metrics are fetched in batched GraphQL
+    queries; these lookups wait outside the concurrency limit so that the
+    repositories of many packages can share one request.
+
+    ``packages`` may be a generator (see iter_sbom): each package is
+    scheduled as soon as it is produced, so analysis overlaps parsing.
+    """
     semaphore = asyncio.Semaphore(config.concurrency)
+    # GitHub keeps separate REST and GraphQL quotas per token
+    tokens = [token for token in [config.github_token, *config.github_tokens] if token]
+    rest_pool = TokenPool(tokens, max_wait=config.rate_limit_wait)
+    health_batcher = None
+    if tokens:
+        health_batcher = HealthBatcher(
+            tokens[0],
+            token_pool=TokenPool(tokens, max_wait=config.rate_limit_wait),
+            rest_pool=rest_pool,
+        )
     tasks = []
 
     async def analyze_with_semaphore(pkg: Package) -> Package:
-        async with semaphore:
-            return await _analyze_package(pkg, config, cache)
+        try:
+            async with semaphore:
+                pkg = await _analyze_package(pkg, config, cache, refreshes)
+            await _analyze_package_health(
+                pkg, config, cache, refreshes, health_batcher, rest_pool
+            )
+            return pkg
+        finally:
+            if progress:
+                progress(pkg)
 
+    scheduled = []
     for package in packages:
-        tasks.append(analyze_with_semaphore(package))
+        scheduled.append(package)
+        tasks.append(asyncio.ensure_future(analyze_with_semaphore(package)))
+        # Let started tasks run while the rest of the input is parsed
+        await asyncio.sleep(0)
 
     results = await asyncio.gather(*tasks, return_exceptions=True)
 
     analyzed_packages = []
-    for i, result in enumerate(results):
+    for package, result in zip(scheduled, results):
         if isinstance(result, Exception):
-            packages[i].errors.append(str(result))
-            analyzed_packages.append(packages[i])
+            package.errors.append(str(result))
+            analyzed_packages.append(package)
         else:
             analyzed_packages.append(result)
 
@@ -234,7 +703,9 @@ async def _analyze_packages_parallel(
 
 
 def _estimate_costs(
-    packages: List[Package], config: AnalysisConfig
+    packages: List[Package],
+    config: AnalysisConfig,
+    cache: Optional[AnalysisCache] = None,
 ) -> List[Package]:
     """Estimate costs for all packages."""
     # Select estimator
@@ -247,7 +718,19 @@ def _estimate_costs(
 
     for package in packages:
         if package.sloc and package.sloc.total > 0:
-            cost_estimate = estimator.estimate(package, config.region)
+            # Key on every input the estimators read
+            cost_inputs = package.model_dump(
+                mode="json",
+                include={"project_type", "sloc", "complexity", "halstead", "git_history", "health"},
+            )
+            key = cache_key(config.methodology.lower(), config.region.value, cost_inputs)
+            cost_estimate = None
+            if cache:
+                _, cost_estimate = _load_cached_metrics(cache, "cost", key, CostEstimate)
+            if cost_estimate is None:
+                cost_estimate = estimator.estimate(package, config.region)
+                if cache:
+                    _save_cached_metrics(cache, "cost", key, cost_estimate)
             package.cost_estimate = cost_estimate
 
     return packages
@@ -331,40 +814,63 @@ async def analyze(
 
     # Initialize cache
     cache = AnalysisCache(
-        cache_dir=config.cache_dir, ttl_days=config.cache_ttl_days
+        cache_dir=config.cache_dir,
+        ttl_days=config.cache_ttl_days,
+        memory_entries=config.cache_memory_entries,
+        memory_bytes=config.cache_memory_bytes,
     ) if config.use_cache else None
+    # Registry and GitHub requests revalidate responses stored in the cache and
+    # are spaced out per host
+    set_http_cache(cache)
+    set_host_rate_limits(config.host_rate_limits)
+    set_local_metadata_index(_local_metadata_index(filepath, config))
+    set_offline_index(_offline_index(config))
+    set_maven_resolver(MavenResolver(config.maven_repositories, cache=cache))
+    set_go_resolver(GoResolver(cache=cache))
 
     # Parse input
     if isinstance(filepath, list):
         # Already a list of packages
-        packages = filepath
+        package_stream: Iterable[Package] = filepath
         source_type = SourceType.SIMPLE
         source_file = "inline"
+        parse_errors: List[str] = []
     else:
-        # Parse file
-        parser = _select_parser(filepath)
-        if not parser:
-            return AnalysisResult(
-                errors=[f"No parser found for file: {filepath}"],
-                warnings=[],
-            )
-
-        parse_result = parser.parse(filepath)
-        packages = parse_result.packages
+        # Parse the file while its packages are analyzed
+        parse_result = ParseResult(packages=[], source_type=SourceType.SIMPLE, source_file=filepath)
+        try:
+            package_stream = iter_sbom(filepath, parse_result)
+        except ValueError as e:
+            return AnalysisResult(errors=[str(e)], warnings=[])
         source_type = parse_result.source_type
         source_file = parse_result.source_file
-
-    # Analyze packages
-    analyzed_packages = await _analyze_packages_parallel(packages, config, cache)
+        # Filled in if the file turns out to be malformed part-way through
+        parse_errors = parse_result.errors
+
+    # Analyze packages; stale cache entries are refreshed in the background
+    refreshes: Dict[Tuple[str, str], asyncio.Task] = {}
+    async with artifact_session():
+        analyzed_packages = await _analyze_packages_parallel(
+            package_stream, config, cache, refreshes=refreshes
+        )
+        # Refreshes may still be resolving repositories over the session
+        await _drain_refreshes(refreshes, REVALIDATE_GRACE_SECONDS)
 
     # Estimate costs
-    analyzed_packages = _estimate_costs(analyzed_packages, config)
+    analyzed_packages = _estimate_costs(analyzed_packages, config, cache)
+
+    # Persist cache statistics of this run
+    cache_stats = None
+    if cache:
+        cache.flush()
+        _auto_gc(cache, config)
+        cache_stats = cache.stats(session=True)
 
     # Identify critical packages
     critical_packages = _identify_critical_packages(analyzed_packages)
 
     # Calculate summary statistics
-    total_packages = len(packages)
+    total_packages = len(analyzed_packages)
     analyzed_count = len([p for p in analyzed_packages if p.cost_estimate])
     # Count packages without SLOC (not errors, just missing data)
     packages_without_sloc = len([p for p in analyzed_packages if not p.sloc])
@@ -426,8 +932,17 @@ async def analyze(
                 "region": config.region.value,
                 "clone_repos": config.clone_repos,
                 "methodology": config.methodology,
+                "halstead_sample_files": config.halstead_sample_files,
+                "halstead_sample_bytes": config.halstead_sample_bytes,
+                "max_file_bytes": config.max_file_bytes,
+                "file_timeout": config.file_timeout,
+                "repo_timeout": config.repo_timeout,
                 "project_type_override": config.project_type_override.value if config.project_type_override else None,
             },
+            "cache": cache_stats,
+            "health_deferred": len(
+                [p for p in analyzed_packages if p.health_status == FetchStatus.DEFERRED]
+            ),
         },
         summary={
             "total_packages": total_packages,
@@ -443,13 +958,70 @@ async def analyze(
         },
         packages=analyzed_packages,
         critical_packages=critical_packages,
-        errors=[],
+        errors=parse_errors,
         warnings=[],
     )
 
     return result
 
 
+async def warm_cache(
+    filepath: str | List[Package],
+    config: Optional[AnalysisConfig] = None,
+    progress: Optional[Callable[[Package], None]] = None,
+) -> Dict[str, int]:
+    """
+    Fill the cache for every package of an SBOM without building a report.
+
+    Repository URLs are resolved, repositories cloned and all metrics computed
+    and stored, so that later ``analyze`` runs only read from the cache.
+
+    Args:
+        filepath: Path to SBOM/lockfile or list of Package objects
+        config: Optional analysis configuration; caching and cloning are always enabled
+        progress: Optional callback invoked as each package finishes
+
+    Returns:
+        Counts of packages, resolved repositories, analyzed repositories and failures
+
+    Raises:
+        ValueError: If no parser handles the file, or it is malformed; packages
+            read before a malformed part are still warmed
+    """
+    config = (config or AnalysisConfig()).model_copy(
+        update={"use_cache": True, "clone_repos": True}
+    )
+    cache = AnalysisCache(
+        cache_dir=config.cache_dir,
+        ttl_days=config.cache_ttl_days,
+        memory_entries=config.cache_memory_entries,
+        memory_bytes=config.cache_memory_bytes,
+    )
+    set_http_cache(cache)
+    set_host_rate_limits(config.host_rate_limits)
+    set_local_metadata_index(_local_metadata_index(filepath, config))
+    set_offline_index(_offline_index(config))
+    set_maven_resolver(MavenResolver(config.maven_repositories, cache=cache))
+    set_go_resolver(GoResolver(cache=cache))
+
+    parse_result = ParseResult(packages=[], source_type=SourceType.SIMPLE, source_file="inline")
+    packages = filepath if isinstance(filepath, list) else iter_sbom(filepath, parse_result)
+    async with artifact_session():
+        analyzed = await _analyze_packages_parallel(packages, config, cache, progress)
+    _estimate_costs(analyzed, config, cache)
+    cache.flush()
+    _auto_gc(cache, config)
+    if parse_result.errors:
+        raise ValueError(parse_result.errors[0])
+
+    return {
+        "packages": len(analyzed),
+        "resolved": len([p for p in analyzed if p.repository_url]),
+        "analyzed": len([p for p in analyzed if p.sloc]),
+        "failed": len([p for p in analyzed if p.errors]),
+    }
+
+
 def quick_estimate(
     sloc: int,
     region: Region = Region.GLOBAL_AVERAGE,
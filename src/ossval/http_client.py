@@ -0,0 +1,374 @@
+"""Shared HTTP client layer: conditional-request response cache and rate-limit scheduling."""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence
+from urllib.parse import urlparse
+
+import httpx
+
+from ossval.cache import AnalysisCache, cache_key
+
+# Cache namespace of stored responses
+HTTP_NAMESPACE = "http"
+
+# Response headers kept with a cached body
+_STORED_HEADERS = ("content-type", "etag", "last-modified", "link")
+
+# Cache used by cached_get; None disables conditional requests
+_http_cache: Optional[AnalysisCache] = None
+
+# Sustained requests per second per host; a host may burst up to one second
+# worth of requests. crates.io asks crawlers for at most one request per
+# second and RubyGems documents a limit of 10.
+HOST_RATE_LIMITS: Dict[str, float] = {
+    "pypi.org": 10.0,
+    "registry.npmjs.org": 20.0,
+    "crates.io": 1.0,
+    "rubygems.org": 10.0,
+    "api.github.com": 10.0,
+}
+
+
+class TokenBucket:
+    """Token bucket spacing out requests to one host."""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (default: one second worth of tokens, at least 1)
+        """
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a token, going into debt if the bucket is empty.
+
+        Returns:
+            Seconds to wait before the reserved request may be sent
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+# Buckets per host, created on first use from the configured rates
+_host_rates: Dict[str, float] = dict(HOST_RATE_LIMITS)
+_host_buckets: Dict[str, TokenBucket] = {}
+_host_buckets_lock = threading.Lock()
+
+
+def set_host_rate_limits(limits: Optional[Dict[str, float]] = None) -> None:
+    """
+    Configure per-host request rates.
+
+    Args:
+        limits: Requests per second per host, overriding HOST_RATE_LIMITS;
+            a rate of 0 disables limiting for that host
+    """
+    global _host_rates
+    rates = {**HOST_RATE_LIMITS, **(limits or {})}
+    with _host_buckets_lock:
+        if rates != _host_rates:
+            _host_rates = rates
+            _host_buckets.clear()
+
+
+async def throttle(url: str) -> None:
+    """
+    Wait for the token bucket of a URL's host.
+
+    Buckets are independent, so requests to different hosts interleave
+    while each host sees at most its configured rate.
+
+    Args:
+        url: URL about to be requested
+    """
+    host = (urlparse(url).hostname or "").lower()
+    rate = _host_rates.get(host)
+    if not rate:
+        return
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None:
+            bucket = _host_buckets[host] = TokenBucket(rate)
+    await bucket.acquire()
+
+
+def set_http_cache(cache: Optional[AnalysisCache]) -> None:
+    """
+    Set the cache that stores HTTP responses and their validators.
+
+    Args:
+        cache: AnalysisCache to use, or None to send plain requests
+    """
+    global _http_cache
+    _http_cache = cache
+
+
+def get_http_cache() -> Optional[AnalysisCache]:
+    """Get the cache that stores HTTP responses, if any."""
+    return _http_cache
+
+
+async def cached_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: float = 10.0,
+    client: Optional[httpx.AsyncClient] = None,
+) -> httpx.Response:
+    """
+    GET a URL, revalidating a stored response instead of downloading it again.
+
+    Responses with an ``ETag`` or ``Last-Modified`` header are stored with
+    their body. The next request for the same URL sends ``If-None-Match`` /
+    ``If-Modified-Since``; on ``304 Not Modified`` the stored body is
+    returned as a 200 response. GitHub does not count 304 responses against
+    the rate limit. The ``Authorization`` header is not part of the cache
+    key, so responses are shared between tokens. The request waits for the
+    token bucket of its host first (see ``throttle``).
+
+    Args:
+        url: URL to fetch
+        headers: Optional request headers
+        params: Optional query parameters
+        timeout: Request timeout in seconds (when no client is given)
+        client: Optional client to send the request with
+
+    Returns:
+        The response, or a response rebuilt from the cache on 304
+    """
+    cache = _http_cache
+    request_headers = dict(headers or {})
+    key = None
+    stored = None
+    if cache is not None:
+        vary = {name.lower(): value for name, value in request_headers.items()}
+        vary.pop("authorization", None)
+        key = cache_key("GET", url, sorted((params or {}).items()), sorted(vary.items()))
+        stored = cache.get(key, HTTP_NAMESPACE)
+        if stored:
+            if stored["headers"].get("etag"):
+                request_headers["If-None-Match"] = stored["headers"]["etag"]
+            if stored["headers"].get("last-modified"):
+                request_headers["If-Modified-Since"] = stored["headers"]["last-modified"]
+
+    await throttle(url)
+    if client is None:
+        async with httpx.AsyncClient(timeout=timeout) as own_client:
+            response = await own_client.get(url, headers=request_headers, params=params)
+    else:
+        response = await client.get(url, headers=request_headers, params=params)
+
+    if cache is None or key is None:
+        return response
+
+    if response.status_code == 304 and stored:
+        # Validators may be updated by a 304; the stored value itself is shared
+        stored_headers = dict(stored["headers"])
+        for name in ("etag", "last-modified"):
+            if response.headers.get(name):
+                stored_headers[name] = response.headers[name]
+        cache.set(key, {"headers": stored_headers, "body": stored["body"]}, HTTP_NAMESPACE)
+        cache.record(HTTP_NAMESPACE, revalidations=1)
+        return httpx.Response(
+            200, headers=stored_headers, content=stored["body"], request=response.request
+        )
+
+    if response.status_code == 200 and (
+        response.headers.get("etag") or response.headers.get("last-modified")
+    ):
+        cache.set(
+            key,
+            {
+                "headers": {
+                    name: response.headers[name]
+                    for name in _STORED_HEADERS
+                    if name in response.headers
+                },
+                "body": response.content,
+            },
+            HTTP_NAMESPACE,
+        )
+    return response
+
+
+# Messages of GitHub secondary rate-limit rejections, lowercased
+_SECONDARY_RATE_LIMIT_MARKERS = (b"secondary rate limit", b"abuse detection")
+
+
+class RateLimitExceededError(Exception):
+    """Raised when every token stays rate limited for longer than the caller will wait."""
+
+    def __init__(self, reset_at: float):
+        """
+        Initialize the exception.
+
+        Args:
+            reset_at: Epoch time at which the earliest token becomes usable again
+        """
+        super().__init__(
+            f"rate limit exhausted until {time.strftime('%H:%M:%S', time.localtime(reset_at))}"
+        )
+        self.reset_at = reset_at
+
+
+class _TokenState:
+    """Rate-limit state of one token, from the headers of its last response."""
+
+    def __init__(self, token: Optional[str]):
+        self.token = token
+        # Requests left in the current window; None until a response reports it
+        self.remaining: Optional[int] = None
+        # Epoch time at which the window resets
+        self.reset_at = 0.0
+        # Epoch time before which the token must not be used (403/429 backoff)
+        self.blocked_until = 0.0
+
+    def available_at(self) -> float:
+        """Earliest epoch time at which the token can be used."""
+        if self.remaining is not None and self.remaining <= 0:
+            return max(self.reset_at, self.blocked_until)
+        return self.blocked_until
+
+
+class TokenPool:
+    """
+    Rate-limit-aware scheduler for requests to an API with per-token quotas.
+
+    Each request goes out with the token that has the most requests left, as
+    reported by the ``X-RateLimit-Remaining`` / ``X-RateLimit-Reset`` headers.
+    A 403 or 429 rate-limit response blocks its token until ``Retry-After`` or
+    the reset time and the request is retried, with jittered exponential
+    backoff, on the next usable token. When no token becomes usable within
+    ``max_wait`` seconds, RateLimitExceededError is raised so that the caller can
+    defer the work.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[Optional[str]] = (),
+        max_wait: float = 60.0,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            tokens: API tokens; empty for one anonymous client
+            max_wait: Maximum seconds to wait for a rate-limited token
+            max_retries: Retries of a rate-limited request
+            base_delay: Base of the exponential backoff in seconds
+        """
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._states = [_TokenState(token) for token in dict.fromkeys(tokens)] or [
+            _TokenState(None)
+        ]
+
+    async def request(
+        self, send: Callable[[Optional[str]], Awaitable[httpx.Response]]
+    ) -> httpx.Response:
+        """
+        Send a request with the best available token.
+
+        Args:
+            send: Coroutine function sending the request with a token (None if anonymous)
+
+        Returns:
+            The first response that is not rate limited
+
+        Raises:
+            RateLimitExceededError: If the request stays rate limited
+        """
+        for attempt in range(self.max_retries + 1):
+            state = await self._acquire()
+            response = await send(state.token)
+            self._update(state, response)
+            if not _is_rate_limited(response):
+                return response
+            if attempt < self.max_retries:
+                await asyncio.sleep(_backoff_delay(attempt, self.base_delay, self.max_wait))
+        raise RateLimitExceededError(min(state.available_at() for state in self._states))
+
+    async def _acquire(self) -> _TokenState:
+        """Pick the usable token with the most requests left, waiting if none is usable."""
+        while True:
+            now = time.time()
+            usable = [state for state in self._states if state.available_at() <= now]
+            if usable:
+                state = max(
+                    usable,
+                    key=lambda s: s.remaining if s.remaining is not None and s.reset_at > now else 2**31,
+                )
+                if state.remaining is not None:
+                    # Reserve a request so that concurrent callers spread over tokens
+                    state.remaining = state.remaining - 1 if state.reset_at > now else None
+                return state
+            available_at = min(state.available_at() for state in self._states)
+            if available_at - now > self.max_wait:
+                raise RateLimitExceededError(available_at)
+            await asyncio.sleep(available_at - now + random.uniform(0, self.base_delay))
+
+    def _update(self, state: _TokenState, response: httpx.Response) -> None:
+        """Record the rate-limit headers of a response."""
+        headers = response.headers
+        try:
+            if "x-ratelimit-remaining" in headers:
+                state.remaining = int(headers["x-ratelimit-remaining"])
+            if "x-ratelimit-reset" in headers:
+                state.reset_at = float(headers["x-ratelimit-reset"])
+        except ValueError:
+            pass
+        if _is_rate_limited(response):
+            retry_after = headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                state.blocked_until = time.time() + int(retry_after)
+            elif state.remaining == 0:
+                state.blocked_until = state.reset_at
+            else:
+                # Secondary rate limit without a hint: back off for a minute
+                state.blocked_until = time.time() + 60
+
+
+def _is_rate_limited(response: httpx.Response) -> bool:
+    """Whether a response is a rate-limit rejection rather than a real 403."""
+    if response.status_code == 429:
+        return True
+    if response.status_code != 403:
+        return False
+    if response.headers.get("x-ratelimit-remaining") == "0" or "retry-after" in response.headers:
+        return True
+    # GitHub secondary rate limits keep quota left and often send no
+    # retry-after; only the message tells them apart from a real 403
+    try:
+        body = response.content.lower()
+    except httpx.ResponseNotRead:
+        return False
+    return any(marker in body for marker in _SECONDARY_RATE_LIMIT_MARKERS)
+
+
+def _backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Exponential backoff with full jitter."""
+    return random.uniform(0, min(max_delay, base_delay * 2**attempt))
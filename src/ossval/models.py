@@ -59,6 +59,21 @@ class ComplexityLevel(str, Enum):
     VERY_COMPLEX = "very_complex"
 
 
+class FileCategory(str, Enum):
+    """Categories of files excluded from source analysis."""
+
+    BINARY = "binary"
+    GENERATED = "generated"
+    MINIFIED = "minified"
+
+
+class FetchStatus(str, Enum):
+    """Outcome of fetching remote metrics."""
+
+    COMPLETE = "complete"
+    DEFERRED = "deferred"
+
+
 class SourceType(str, Enum):
     """Source file types."""
 
@@ -94,6 +109,13 @@ class SLOCMetrics(BaseModel):
     by_language: Dict[str, int] = Field(
         default_factory=dict, description="SLOC by programming language"
     )
+    excluded_files: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Files excluded as binary, generated or minified, by category",
+    )
+    excluded_bytes: Dict[str, int] = Field(
+        default_factory=dict, description="Size of excluded files in bytes, by category"
+    )
 
 
 class ComplexityMetrics(BaseModel):
@@ -124,6 +146,17 @@ class HalsteadMetrics(BaseModel):
     effort: float = Field(description="Effort to implement/understand")
     time_seconds: float = Field(description="Time required to program (seconds)")
     bugs: float = Field(description="Estimated number of bugs (volume / 3000)")
+    files_analyzed: Optional[int] = Field(
+        None, description="Number of source files actually analyzed"
+    )
+    files_total: Optional[int] = Field(
+        None, description="Number of candidate source files in the repository"
+    )
+    sample_relative_error: Optional[float] = Field(
+        None,
+        description="Estimated relative standard error of the extrapolated volume "
+        "(only set when a file sample was analyzed)",
+    )
 
 
 class GitHistoryMetrics(BaseModel):
@@ -219,7 +252,14 @@ class Package(BaseModel):
     )
     git_history: Optional[GitHistoryMetrics] = Field(None, description="Git history metrics")
     health: Optional[HealthMetrics] = Field(None, description="Health metrics")
+    health_status: Optional[FetchStatus] = Field(
+        None, description="Whether the health lookup completed or was deferred by rate limits"
+    )
     cost_estimate: Optional[CostEstimate] = Field(None, description="Cost estimate")
+    freshness: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Where each metric came from: fresh or stale cache entry, or live",
+    )
     is_critical: bool = Field(
         False, description="True if package is critical (high value + risk factors)"
     )
@@ -239,12 +279,64 @@ class AnalysisConfig(BaseModel):
 
     region: Region = Field(Region.GLOBAL_AVERAGE, description="Region for salary calculation")
     clone_repos: bool = Field(True, description="Whether to clone repositories for SLOC analysis")
+    local_metadata: bool = Field(
+        True,
+        description="Resolve repository URLs from locally installed package metadata before registries",
+    )
+    offline_index: Optional[str] = Field(
+        None,
+        description="Offline registry index to resolve repository URLs from first "
+        "(default: the one written by 'ossval index build', if present)",
+    )
+    maven_repositories: List[str] = Field(
+        default_factory=list,
+        description="Maven repository directories or base URLs searched for POMs "
+        "after ~/.m2 and before Maven Central",
+    )
     use_cache: bool = Field(True, description="Whether to use disk cache")
     cache_dir: Optional[str] = Field(None, description="Cache directory path")
     cache_ttl_days: int = Field(30, description="Cache TTL in days")
+    cache_memory_entries: int = Field(
+        10_000, ge=0, description="Maximum entries in the in-process cache tier (0 disables it)"
+    )
+    cache_memory_bytes: int = Field(
+        2**26, ge=0, description="Maximum size of the in-process cache tier in bytes"
+    )
+    cache_max_bytes: Optional[int] = Field(
+        None, ge=0, description="Garbage-collect the cache at the end of a run when it is larger than this"
+    )
     concurrency: int = Field(4, ge=1, le=32, description="Max parallel operations")
     github_token: Optional[str] = Field(None, description="GitHub API token")
+    github_tokens: List[str] = Field(
+        default_factory=list,
+        description="Additional GitHub API tokens, rotated when one is rate limited",
+    )
+    host_rate_limits: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Requests per second per registry/API host, overriding the defaults (0 = unlimited)",
+    )
+    rate_limit_wait: float = Field(
+        60.0, ge=0, description="Seconds to wait for a rate limit reset before deferring a lookup"
+    )
+    analysis_workers: int = Field(
+        1, ge=1, le=64, description="Worker processes for per-file code analysis"
+    )
     methodology: str = Field("cocomo2", description="Cost estimation methodology")
+    halstead_sample_files: Optional[int] = Field(
+        None, ge=1, description="Max files for sampled Halstead analysis (None = all files)"
+    )
+    halstead_sample_bytes: Optional[int] = Field(
+        None, ge=1, description="Max bytes for sampled Halstead analysis (None = no limit)"
+    )
+    max_file_bytes: Optional[int] = Field(
+        None, ge=1, description="Skip files larger than this many bytes in code analysis"
+    )
+    file_timeout: Optional[float] = Field(
+        None, gt=0, description="Per-file time limit for code analysis in seconds"
+    )
+    repo_timeout: Optional[float] = Field(
+        None, gt=0, description="Per-repository time budget for code analysis in seconds"
+    )
     verbose: bool = Field(False, description="Verbose output")
     quiet: bool = Field(False, description="Quiet mode (minimal output)")
     project_type_override: Optional[ProjectType] = Field(None, description="Override project type detection")
@@ -3,9 +3,10 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import BinaryIO, Iterator, List, Optional
 
 from ossval.models import Package, SourceType
+from ossval.parsers.sniff import Sniffed
 
 
 @dataclass
@@ -29,6 +30,9 @@ class ParseResult:
 class BaseParser(ABC):
     """Abstract base class for all parsers."""
 
+    # Source type of the files this parser reads, reported in results
+    source_type: SourceType = SourceType.SIMPLE
+
     @abstractmethod
     def can_parse(self, filepath: str) -> bool:
         """
@@ -55,6 +59,57 @@ class BaseParser(ABC):
         """
         pass
 
+    def matches(self, filepath: str, sniffed: Sniffed) -> bool:
+        """
+        Check if this parser handles a file, given its sniffed head.
+
+        Parsers that recognize content override this to use ``sniffed``
+        instead of reading the file again; the default checks the filename
+        through can_parse.
+
+        Args:
+            filepath: Path to the file to check
+            sniffed: Head of the file and the format identified from it
+
+        Returns:
+            True if this parser can handle the file
+        """
+        return self.can_parse(filepath)
+
+    def parse_buffer(self, filepath: str, buffer: BinaryIO) -> ParseResult:
+        """
+        Parse a file from a buffer that is already open.
+
+        Parsers of large documents override this to read ``buffer`` (which
+        is positioned at the start of the file) so that the file is read
+        once; the default parses ``filepath``.
+
+        Args:
+            filepath: Path to the file
+            buffer: Open binary buffer of the file
+
+        Returns:
+            ParseResult with extracted packages
+        """
+        return self.parse(filepath)
+
+    def iter_packages(self, filepath: str, buffer: BinaryIO) -> Iterator[Package]:
+        """
+        Yield the packages of a file as they are parsed.
+
+        Parsers of formats that can be read incrementally override this so
+        that packages reach the caller without the whole document being held
+        in memory; the default yields the packages of parse_buffer.
+
+        Args:
+            filepath: Path to the file
+            buffer: Open binary buffer of the file
+
+        Returns:
+            Iterator over the extracted packages
+        """
+        yield from self.parse_buffer(filepath, buffer).packages
+
     def _normalize_version(self, version: Optional[str]) -> Optional[str]:
         """Normalize version string (remove leading v, etc.)."""
         if not version:
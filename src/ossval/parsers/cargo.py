@@ -22,6 +22,8 @@ except ImportError:
 class CargoParser(BaseParser):
     """Parser for Rust Cargo.toml and Cargo.lock files."""
 
+    source_type = SourceType.CARGO
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is Cargo.toml or Cargo.lock."""
         path = Path(filepath)
@@ -45,7 +47,7 @@ class CargoParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.CARGO,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -1,166 +1,181 @@
 """CycloneDX SBOM parser."""
 
-import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
 from xml.etree import ElementTree as ET
 
 from ossval.models import Package, SourceType
 from ossval.parsers.base import BaseParser, ParseResult
+from ossval.parsers.json_stream import JsonStreamReader
+from ossval.parsers.sniff import CYCLONEDX_JSON, CYCLONEDX_XML, Sniffed, sniff_file
 
 
 class CycloneDXParser(BaseParser):
     """Parser for CycloneDX SBOM format (JSON and XML)."""
 
+    source_type = SourceType.CYCLONEDX
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is CycloneDX format."""
-        path = Path(filepath)
-        if path.suffix.lower() in [".json", ".xml"]:
-            try:
-                if path.suffix.lower() == ".json":
-                    with open(filepath, "r") as f:
-                        data = json.load(f)
-                        return data.get("bomFormat") == "CycloneDX" or "components" in data
-                else:
-                    tree = ET.parse(filepath)
-                    root = tree.getroot()
-                    # Check for CycloneDX namespace
-                    return (
-                        root.tag.endswith("bom")
-                        or "{http://cyclonedx.org/schema/bom/1.4}" in root.tag
-                        or "{http://cyclonedx.org/schema/bom/1.3}" in root.tag
-                    )
-            except Exception:
-                return False
-        return False
+        return self.matches(filepath, sniff_file(filepath))
+
+    def matches(self, filepath: str, sniffed: Sniffed) -> bool:
+        """Check if a sniffed file is CycloneDX JSON or XML."""
+        suffix = Path(filepath).suffix.lower()
+        return (suffix == ".json" and sniffed.kind == CYCLONEDX_JSON) or (
+            suffix == ".xml" and sniffed.kind == CYCLONEDX_XML
+        )
 
     def parse(self, filepath: str) -> ParseResult:
         """Parse CycloneDX SBOM file."""
-        path = Path(filepath)
+        with open(filepath, "rb") as f:
+            return self.parse_buffer(filepath, f)
+
+    def parse_buffer(self, filepath: str, buffer: BinaryIO) -> ParseResult:
+        """Parse CycloneDX SBOM from an open buffer."""
         errors = []
         warnings = []
         packages: List[Package] = []
 
         try:
-            if path.suffix.lower() == ".json":
-                packages = self._parse_json(filepath)
-            else:
-                packages = self._parse_xml(filepath)
+            for package in self.iter_packages(filepath, buffer):
+                packages.append(package)
         except Exception as e:
             errors.append(f"Failed to parse CycloneDX file: {str(e)}")
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.CYCLONEDX,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
         )
 
-    def _parse_json(self, filepath: str) -> List[Package]:
-        """Parse CycloneDX JSON format."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
-
-        packages = []
-        components = data.get("components", [])
+    def iter_packages(self, filepath: str, buffer: BinaryIO) -> Iterator[Package]:
+        """
+        Yield the library components of a CycloneDX SBOM as they are read.
 
-        for component in components:
-            name = component.get("name", "")
-            version = component.get("version")
-            pkg_type = component.get("type", "library")
+        Both formats are parsed incrementally: only one component is decoded
+        at a time, and other sections (``dependencies``, ``vulnerabilities``,
+        ``metadata``) are skipped without being built, so memory does not
+        grow with the size of the document. Nested components are included.
+        """
+        if Path(filepath).suffix.lower() == ".json":
+            return self._parse_json(buffer)
+        return self._parse_xml(buffer)
 
-            # Skip non-library components (application, container, etc.)
-            if pkg_type != "library":
+    def _parse_json(self, buffer: BinaryIO) -> Iterator[Package]:
+        """Parse CycloneDX JSON format."""
+        reader = JsonStreamReader(buffer)
+        for key in reader.members():
+            if key != "components":
+                reader.skip()
                 continue
-
+            for _ in reader.items():
+                yield from self._json_component_packages(reader.value())
+
+    def _json_component_packages(self, component: Dict[str, Any]) -> Iterator[Package]:
+        """Packages of a JSON component and of the components nested in it."""
+        if not isinstance(component, dict):
+            return
+        # Skip non-library components (application, container, etc.)
+        if component.get("type", "library") == "library":
             # Extract ecosystem from purl (Package URL)
-            purl = component.get("purl", "")
-            ecosystem = self._extract_ecosystem_from_purl(purl)
+            ecosystem = self._extract_ecosystem_from_purl(component.get("purl", ""))
 
             # Extract repository URL
-            external_refs = component.get("externalReferences", [])
             repository_url = None
-            for ref in external_refs:
+            for ref in component.get("externalReferences", []):
                 if ref.get("type") == "vcs" or ref.get("type") == "repository":
                     repository_url = ref.get("url")
                     break
 
             # Extract language
-            properties = component.get("properties", [])
             language = None
-            for prop in properties:
+            for prop in component.get("properties", []):
                 if prop.get("name") == "cdx:language":
                     language = prop.get("value")
                     break
 
-            package = Package(
-                name=name,
-                version=self._normalize_version(version),
+            yield Package(
+                name=component.get("name", ""),
+                version=self._normalize_version(component.get("version")),
                 ecosystem=ecosystem,
                 language=language,
                 repository_url=repository_url,
             )
-            packages.append(package)
 
-        return packages
+        for child in component.get("components", []):
+            yield from self._json_component_packages(child)
 
-    def _parse_xml(self, filepath: str) -> List[Package]:
+    def _parse_xml(self, buffer: BinaryIO) -> Iterator[Package]:
         """Parse CycloneDX XML format."""
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-
-        # Handle namespaces
-        ns = {"bom": "http://cyclonedx.org/schema/bom/1.4"}
-        if not root.tag.startswith("{"):
-            ns = {}
-
-        packages = []
-        components = root.findall(".//bom:component", ns) or root.findall(".//component")
-
-        for component in components:
-            name_elem = component.find("bom:name", ns) or component.find("name")
-            version_elem = component.find("bom:version", ns) or component.find("version")
-            type_elem = component.find("bom:type", ns) or component.find("type")
-
-            if name_elem is None:
+        # Local names and elements of the open elements
+        path: List[str] = []
+        open_elements: List[ET.Element] = []
+        for event, elem in ET.iterparse(buffer, events=("start", "end")):
+            if event == "start":
+                path.append(_local_name(elem.tag))
+                open_elements.append(elem)
                 continue
 
-            name = name_elem.text or ""
-            version = version_elem.text if version_elem is not None else None
-            pkg_type = type_elem.text if type_elem is not None else "library"
-
-            # Skip non-library components
-            if pkg_type != "library":
-                continue
+            name = path.pop()
+            open_elements.pop()
+            # Components of the BOM: bom/components/component, and those
+            # nested under them (metadata/component is the subject, not a dependency)
+            if name == "component" and len(path) >= 2 and path[1] == "components":
+                package = self._xml_component_package(elem)
+                if package is not None:
+                    yield package
+                elem.clear()
+            if len(path) == 2:
+                # An entry of a top-level section (component, dependency,
+                # vulnerability) is done; drop it from the tree
+                elem.clear()
+                open_elements[-1].remove(elem)
+
+    def _xml_component_package(self, component: ET.Element) -> Optional[Package]:
+        """Package of an XML component, or None for non-library components."""
+        children = {_local_name(child.tag): child for child in component}
+        name_elem = children.get("name")
+        if name_elem is None:
+            return None
 
-            # Extract purl
-            purl_elem = component.find("bom:purl", ns) or component.find("purl")
-            purl = purl_elem.text if purl_elem is not None else ""
-            ecosystem = self._extract_ecosystem_from_purl(purl)
+        # type is an attribute in the schema; older producers wrote an element
+        pkg_type = component.get("type")
+        if pkg_type is None:
+            type_elem = children.get("type")
+            pkg_type = type_elem.text if type_elem is not None else "library"
 
-            # Extract repository URL from external references
-            ext_refs = component.findall(".//bom:externalReference", ns) or component.findall(
-                ".//externalReference"
-            )
-            repository_url = None
-            for ref in ext_refs:
-                ref_type = ref.find("bom:type", ns) or ref.find("type")
-                ref_url = ref.find("bom:url", ns) or ref.find("url")
-                if ref_type is not None and ref_type.text in ["vcs", "repository"]:
-                    if ref_url is not None:
-                        repository_url = ref_url.text
-                        break
-
-            package = Package(
-                name=name,
-                version=self._normalize_version(version),
-                ecosystem=ecosystem,
-                repository_url=repository_url,
-            )
-            packages.append(package)
+        # Skip non-library components
+        if pkg_type != "library":
+            return None
 
-        return packages
+        version_elem = children.get("version")
+        purl_elem = children.get("purl")
+        purl = purl_elem.text if purl_elem is not None else ""
+
+        # Extract repository URL from external references
+        repository_url = None
+        references = children.get("externalReferences")
+        for ref in references if references is not None else []:
+            ref_children = {_local_name(child.tag): child for child in ref}
+            ref_type = ref.get("type")
+            if ref_type is None and "type" in ref_children:
+                ref_type = ref_children["type"].text
+            ref_url = ref_children.get("url")
+            if ref_type in ["vcs", "repository"] and ref_url is not None:
+                repository_url = (ref_url.text or "").strip() or None
+                break
+
+        return Package(
+            name=name_elem.text or "",
+            version=self._normalize_version(
+                version_elem.text if version_elem is not None else None
+            ),
+            ecosystem=self._extract_ecosystem_from_purl(purl),
+            repository_url=repository_url,
+        )
 
     def _extract_ecosystem_from_purl(self, purl: str) -> str | None:
         """Extract ecosystem from Package URL (pkg:type/namespace/name@version)."""
@@ -190,3 +205,7 @@ class CycloneDXParser(BaseParser):
 
         return None
 
+
+def _local_name(tag: str) -> str:
+    """Element name without its namespace."""
+    return tag.rsplit("}", 1)[-1]
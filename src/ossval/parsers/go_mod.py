@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class GoModParser(BaseParser):
     """Parser for Go go.mod files."""
 
+    source_type = SourceType.GO_MOD
+
     # Pattern: module path with optional version
     REQUIRE_PATTERN = re.compile(r"^\s*require\s+([^\s]+)\s+([^\s]+)\s*$")
     REQUIRE_BLOCK_START = re.compile(r"^\s*require\s*\($")
@@ -76,7 +78,7 @@ class GoModParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.GO_MOD,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class GoSumParser(BaseParser):
     """Parser for go.sum files."""
 
+    source_type = SourceType.GO_SUM
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is go.sum."""
         path = Path(filepath)
@@ -52,7 +54,7 @@ class GoSumParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.GO_SUM,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class GradleParser(BaseParser):
     """Parser for Gradle build.gradle files."""
 
+    source_type = SourceType.GRADLE
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is build.gradle."""
         path = Path(filepath)
@@ -78,7 +80,7 @@ class GradleParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.GRADLE,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -0,0 +1,160 @@
+"""Pull reader for large JSON documents that decodes only the values asked for."""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Iterator
+
+# Bytes read from the input at a time
+CHUNK_BYTES = 2**16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Complete strings and nesting characters; a lone quote starts a string
+# that is cut off at the end of the buffer
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"')
+
+_DECODER = json.JSONDecoder()
+
+
+class JsonStreamReader:
+    """
+    Event-style reader over a JSON byte stream.
+
+    The document is walked with members() and items(); at each position the
+    caller either decodes the value with value() or skips it with skip().
+    Skipped values are scanned without being decoded or kept, so memory
+    stays bounded by the largest decoded value plus one read chunk, however
+    large the document is.
+    """
+
+    def __init__(self, buffer: BinaryIO, chunk_bytes: int = CHUNK_BYTES):
+        """
+        Initialize the reader.
+
+        Args:
+            buffer: Binary stream positioned at the start of the document
+            chunk_bytes: Bytes read at a time
+        """
+        self._read = buffer.read
+        self._chunk_bytes = chunk_bytes
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._text = ""
+        self._pos = 0
+        self._eof = False
+
+    def members(self) -> Iterator[str]:
+        """
+        Iterate over the keys of the object at the current position.
+
+        After each key the reader is positioned at its value, which the
+        caller must consume with value(), skip() or a nested walk.
+        """
+        self._expect("{")
+        first = True
+        while True:
+            char = self._peek()
+            if char == "}":
+                self._pos += 1
+                return
+            if not first:
+                self._expect(",")
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("expected an object key")
+            self._expect(":")
+            first = False
+            yield key
+
+    def items(self) -> Iterator[None]:
+        """
+        Iterate over the elements of the array at the current position.
+
+        At each step the reader is positioned at the element, which the
+        caller must consume.
+        """
+        self._expect("[")
+        first = True
+        while True:
+            char = self._peek()
+            if char == "]":
+                self._pos += 1
+                return
+            if not first:
+                self._expect(",")
+            first = False
+            yield None
+
+    def value(self) -> Any:
+        """Decode the value at the current position."""
+        if not self._peek():
+            raise ValueError("unexpected end of JSON input")
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._text, self._pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if not self._fill():
+                    raise
+                continue
+            if end < len(self._text) or self._eof:
+                self._pos = end
+                return value
+            # A number ending the buffer may continue in the next chunk
+            self._fill()
+
+    def skip(self) -> None:
+        """Skip the value at the current position without decoding it."""
+        first = self._peek()
+        if not first:
+            raise ValueError("unexpected end of JSON input")
+        if first not in "{[":
+            # Scalars and strings are small; decode and drop them
+            self.value()
+            return
+        depth = 0
+        while True:
+            for match in _TOKEN.finditer(self._text, self._pos):
+                token = match.group()
+                if token == '"':
+                    # A string that continues in the next chunk
+                    self._pos = match.start()
+                    break
+                self._pos = match.end()
+                if token in "{[":
+                    depth += 1
+                elif token in "}]":
+                    depth -= 1
+                    if depth == 0:
+                        return
+            else:
+                self._pos = len(self._text)
+            if not self._fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def _fill(self) -> bool:
+        """Read another chunk, dropping consumed text; False at end of input."""
+        if self._eof:
+            return False
+        chunk = self._read(self._chunk_bytes)
+        if not chunk:
+            self._eof = True
+        text = self._decoder.decode(chunk, final=not chunk)
+        self._text = self._text[self._pos:] + text
+        self._pos = 0
+        return bool(chunk) or bool(text)
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, or "" at the end of input."""
+        while True:
+            self._pos = _WHITESPACE.match(self._text, self._pos).end()
+            if self._pos < len(self._text):
+                return self._text[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, char: str) -> None:
+        """Consume a structural character."""
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"expected {char!r}, found {found!r}")
+        self._pos += 1
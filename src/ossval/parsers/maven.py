@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class MavenParser(BaseParser):
     """Parser for Maven pom.xml files."""
 
+    source_type = SourceType.MAVEN
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is pom.xml."""
         path = Path(filepath)
@@ -72,7 +74,7 @@ class MavenParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.MAVEN,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class PackageJsonParser(BaseParser):
     """Parser for npm package.json files."""
 
+    source_type = SourceType.PACKAGE_JSON
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is package.json."""
         path = Path(filepath)
@@ -51,7 +53,7 @@ class PackageJsonParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.PACKAGE_JSON,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
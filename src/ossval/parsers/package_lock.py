@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class PackageLockParser(BaseParser):
     """Parser for package-lock.json files."""
 
+    source_type = SourceType.PACKAGE_LOCK
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is package-lock.json."""
         path = Path(filepath)
@@ -58,7 +60,7 @@ class PackageLockParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.PACKAGE_LOCK,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class PipfileLockParser(BaseParser):
     """Parser for Pipfile.lock files."""
 
+    source_type = SourceType.PIPFILE
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is Pipfile.lock."""
         path = Path(filepath)
@@ -53,7 +55,7 @@ class PipfileLockParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.PIPFILE,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
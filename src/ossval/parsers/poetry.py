@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class PoetryLockParser(BaseParser):
     """Parser for poetry.lock files."""
 
+    source_type = SourceType.POETRY
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is poetry.lock."""
         path = Path(filepath)
@@ -52,7 +54,7 @@ class PoetryLockParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.POETRY,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
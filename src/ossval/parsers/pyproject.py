@@ -22,6 +22,8 @@ except ImportError:
 class PyProjectParser(BaseParser):
     """Parser for Python pyproject.toml files."""
 
+    source_type = SourceType.REQUIREMENTS
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is pyproject.toml."""
         path = Path(filepath)
@@ -37,7 +39,7 @@ class PyProjectParser(BaseParser):
             errors.append("No TOML parser available. Install tomli for Python < 3.11")
             return ParseResult(
                 packages=[],
-                source_type=SourceType.REQUIREMENTS,
+                source_type=self.source_type,
                 source_file=filepath,
                 errors=errors,
                 warnings=warnings,
@@ -102,7 +104,7 @@ class PyProjectParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.REQUIREMENTS,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
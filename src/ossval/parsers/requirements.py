@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class RequirementsParser(BaseParser):
     """Parser for Python requirements.txt files."""
 
+    source_type = SourceType.REQUIREMENTS
+
     # Pattern: package==version or package>=version, etc.
     REQUIREMENT_PATTERN = re.compile(
         r"^([a-zA-Z0-9_-]+[a-zA-Z0-9_.-]*)\s*(==|>=|<=|>|<|~=|\^|!=)\s*([0-9.]+.*)$"
@@ -78,7 +80,7 @@ class RequirementsParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.REQUIREMENTS,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
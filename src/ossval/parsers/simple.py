@@ -6,11 +6,14 @@ from typing import List
 
 from ossval.models import Package, SourceType
 from ossval.parsers.base import BaseParser, ParseResult
+from ossval.parsers.sniff import Sniffed, sniff_file
 
 
 class SimpleParser(BaseParser):
     """Parser for simple text format with one package per line."""
 
+    source_type = SourceType.SIMPLE
+
     # Patterns for different package formats
     PATTERNS = {
         "pip": re.compile(r"^([a-zA-Z0-9_-]+)\s*==\s*([0-9.]+.*)$"),  # requests==2.31.0
@@ -23,24 +26,24 @@ class SimpleParser(BaseParser):
 
     def can_parse(self, filepath: str) -> bool:
         """Check if file looks like a simple text package list."""
+        return self.matches(filepath, sniff_file(filepath))
+
+    def matches(self, filepath: str, sniffed: Sniffed) -> bool:
+        """Check if the first line of a sniffed file looks like a package."""
         path = Path(filepath)
         # Accept .txt files or files with no extension
         if path.suffix.lower() in [".txt", ""] or path.name in [
             "requirements.txt",
             "packages.txt",
         ]:
-            try:
-                with open(filepath, "r") as f:
-                    first_line = f.readline().strip()
-                    # Check if it matches any of our patterns
-                    for pattern in self.PATTERNS.values():
-                        if pattern.match(first_line):
-                            return True
-                    # Also accept if it's a simple package name
-                    if first_line and not first_line.startswith("#"):
-                        return True
-            except Exception:
-                pass
+            first_line = sniffed.head.split(b"\n", 1)[0].decode("utf-8", "replace").strip()
+            # Check if it matches any of our patterns
+            for pattern in self.PATTERNS.values():
+                if pattern.match(first_line):
+                    return True
+            # Also accept if it's a simple package name
+            if first_line and not first_line.startswith("#"):
+                return True
         return False
 
     def parse(self, filepath: str) -> ParseResult:
@@ -70,7 +73,7 @@ class SimpleParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.SIMPLE,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
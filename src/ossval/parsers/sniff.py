@@ -0,0 +1,118 @@
+"""Format identification from the first bytes of an input file."""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+# Bytes read to identify a format
+SNIFF_BYTES = 64 * 1024
+
+# Formats recognized from content
+CYCLONEDX_JSON = "cyclonedx-json"
+CYCLONEDX_XML = "cyclonedx-xml"
+SPDX_JSON = "spdx-json"
+SPDX_TAG_VALUE = "spdx-tag-value"
+
+# JSON strings and structural characters
+_JSON_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]:,]')
+
+# XML declarations, comments, processing instructions and doctypes before the root element
+_XML_PROLOG = re.compile(rb"\s*(?:<\?.*?\?>|<!--.*?-->|<!DOCTYPE[^>]*>)", re.S)
+_XML_ROOT = re.compile(rb"\s*<(?:[\w.-]+:)?([\w.-]+)[\s/>]")
+
+
+@dataclass
+class Sniffed:
+    """Head of an input file and the format identified from it."""
+
+    head: bytes
+    # One of the format constants, or None if only the filename can tell
+    kind: Optional[str] = None
+
+
+def sniff(filepath: str, head: bytes) -> Sniffed:
+    """
+    Identify the format of an input from its first bytes.
+
+    JSON documents are recognized from their top-level keys (``bomFormat``,
+    ``components``, ``spdxVersion``, ``SPDXID``), which producers write
+    first; XML documents from their root element; SPDX tag-value from its
+    first tag. Nothing beyond the head is read or parsed.
+
+    Args:
+        filepath: Path of the input (for its suffix)
+        head: First bytes of the input (see SNIFF_BYTES)
+
+    Returns:
+        Sniffed head and format
+    """
+    text = head.lstrip(b"\xef\xbb\xbf").lstrip()
+    kind = None
+    if text.startswith(b"{"):
+        members = _top_level_members(text.decode("utf-8", "replace"))
+        if members.get("bomFormat") == "CycloneDX" or "components" in members:
+            kind = CYCLONEDX_JSON
+        elif "spdxVersion" in members or "SPDXID" in members:
+            kind = SPDX_JSON
+    elif text.startswith(b"<"):
+        if _xml_root(text) == b"bom":
+            kind = CYCLONEDX_XML
+    elif Path(filepath).suffix.lower() in (".spdx", ".txt", ""):
+        first_line = text.split(b"\n", 1)[0]
+        if b"SPDXVersion:" in first_line or b"SPDXID:" in first_line:
+            kind = SPDX_TAG_VALUE
+    return Sniffed(head=head, kind=kind)
+
+
+def sniff_file(filepath: str) -> Sniffed:
+    """Read the head of a file and identify its format (see sniff)."""
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(SNIFF_BYTES)
+    except OSError:
+        head = b""
+    return sniff(filepath, head)
+
+
+def _top_level_members(text: str) -> Dict[str, Optional[str]]:
+    """
+    Top-level keys of a (possibly truncated) JSON object.
+
+    Returns:
+        Mapping of each key to its value if that is a string, None otherwise
+    """
+    members: Dict[str, Optional[str]] = {}
+    depth = 0
+    key = None
+    previous = None
+    for match in _JSON_TOKEN.finditer(text):
+        token = match.group(0)
+        if token in "{[":
+            depth += 1
+        elif token in "}]":
+            depth -= 1
+        elif depth == 1 and token.startswith('"'):
+            if previous == ":" and key is not None:
+                members[key] = token[1:-1]
+                key = None
+            else:
+                key = token[1:-1]
+        elif depth == 1 and token == ":" and key is not None:
+            members[key] = None
+        elif depth == 1 and token == ",":
+            key = None
+        previous = token
+    return members
+
+
+def _xml_root(text: bytes) -> Optional[bytes]:
+    """Local name of the root element of an XML document."""
+    position = 0
+    while True:
+        prolog = _XML_PROLOG.match(text, position)
+        if not prolog or prolog.end() == position:
+            break
+        position = prolog.end()
+    root = _XML_ROOT.match(text, position)
+    return root.group(1) if root else None
@@ -3,35 +3,29 @@
 import json
 import re
 from pathlib import Path
-from typing import List
+from typing import BinaryIO, List
 from urllib.parse import urlparse
 
 from ossval.models import Package, SourceType
 from ossval.parsers.base import BaseParser, ParseResult
+from ossval.parsers.sniff import SPDX_JSON, SPDX_TAG_VALUE, Sniffed, sniff_file
 
 
 class SPDXParser(BaseParser):
     """Parser for SPDX SBOM format (JSON and tag-value)."""
 
+    source_type = SourceType.SPDX
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is SPDX format."""
-        path = Path(filepath)
-        if path.suffix.lower() == ".json":
-            try:
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                    return "spdxVersion" in data or "SPDXID" in data
-            except Exception:
-                return False
-        elif path.suffix.lower() in [".spdx", ".txt", ""]:
-            # Tag-value format
-            try:
-                with open(filepath, "r") as f:
-                    first_line = f.readline()
-                    return "SPDXVersion:" in first_line or "SPDXID:" in first_line
-            except Exception:
-                return False
-        return False
+        return self.matches(filepath, sniff_file(filepath))
+
+    def matches(self, filepath: str, sniffed: Sniffed) -> bool:
+        """Check if a sniffed file is SPDX JSON or tag-value."""
+        suffix = Path(filepath).suffix.lower()
+        return (suffix == ".json" and sniffed.kind == SPDX_JSON) or (
+            suffix in [".spdx", ".txt", ""] and sniffed.kind == SPDX_TAG_VALUE
+        )
 
     @staticmethod
     def _is_git_url(url: str) -> bool:
@@ -68,6 +62,11 @@ class SPDXParser(BaseParser):
 
     def parse(self, filepath: str) -> ParseResult:
         """Parse SPDX SBOM file."""
+        with open(filepath, "rb") as f:
+            return self.parse_buffer(filepath, f)
+
+    def parse_buffer(self, filepath: str, buffer: BinaryIO) -> ParseResult:
+        """Parse SPDX SBOM from an open buffer."""
         path = Path(filepath)
         errors = []
         warnings = []
@@ -75,24 +74,23 @@ class SPDXParser(BaseParser):
 
         try:
             if path.suffix.lower() == ".json":
-                packages = self._parse_json(filepath)
+                packages = self._parse_json(buffer)
             else:
-                packages = self._parse_tag_value(filepath)
+                packages = self._parse_tag_value(buffer)
         except Exception as e:
             errors.append(f"Failed to parse SPDX file: {str(e)}")
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.SPDX,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
         )
 
-    def _parse_json(self, filepath: str) -> List[Package]:
+    def _parse_json(self, buffer: BinaryIO) -> List[Package]:
         """Parse SPDX JSON format."""
-        with open(filepath, "r") as f:
-            data = json.load(f)
+        data = json.load(buffer)
 
         packages = []
         packages_data = data.get("packages", [])
@@ -134,53 +132,52 @@ class SPDXParser(BaseParser):
 
         return packages
 
-    def _parse_tag_value(self, filepath: str) -> List[Package]:
+    def _parse_tag_value(self, buffer: BinaryIO) -> List[Package]:
         """Parse SPDX tag-value format."""
         packages = []
         current_package = {}
         in_package = False
 
-        with open(filepath, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-
-                if line.startswith("PackageName:"):
-                    if in_package and current_package.get("name"):
-                        # Save previous package
-                        packages.append(self._create_package_from_dict(current_package))
-                        current_package = {}
-                    current_package["name"] = line.split(":", 1)[1].strip()
-                    in_package = True
-                elif line.startswith("PackageVersion:") and in_package:
-                    current_package["version"] = line.split(":", 1)[1].strip()
-                elif line.startswith("ExternalRef:") and in_package:
-                    # ExternalRef: PACKAGE-MANAGER pkg:npm/package@version
-                    ref_line = line.split(":", 1)[1].strip()
-                    if "pkg:" in ref_line:
-                        # Extract purl
-                        purl_match = re.search(r"pkg:([^\s]+)", ref_line)
-                        if purl_match:
-                            purl = purl_match.group(1)
-                            ecosystem = self._extract_ecosystem_from_purl(f"pkg:{purl}")
-                            if ecosystem:
-                                current_package["ecosystem"] = ecosystem
-                    else:
-                        # Try to extract repository URL
-                        url_match = re.search(r"(https?://[^\s]+|git\+[^\s]+)", ref_line)
-                        if url_match and self._is_git_url(url_match.group(1)):
-                            current_package["repository_url"] = url_match.group(1)
-                elif line.startswith("PackageDownloadLocation:") and in_package:
-                    download_loc = line.split(":", 1)[1].strip()
-                    if self._is_git_url(download_loc):
-                        current_package["repository_url"] = (
-                            download_loc.replace("git+", "").split("#")[0]
-                        )
-
-            # Don't forget the last package
-            if in_package and current_package.get("name"):
-                packages.append(self._create_package_from_dict(current_package))
+        for raw_line in buffer:
+            line = raw_line.decode("utf-8", "replace").strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("PackageName:"):
+                if in_package and current_package.get("name"):
+                    # Save previous package
+                    packages.append(self._create_package_from_dict(current_package))
+                    current_package = {}
+                current_package["name"] = line.split(":", 1)[1].strip()
+                in_package = True
+            elif line.startswith("PackageVersion:") and in_package:
+                current_package["version"] = line.split(":", 1)[1].strip()
+            elif line.startswith("ExternalRef:") and in_package:
+                # ExternalRef: PACKAGE-MANAGER pkg:npm/package@version
+                ref_line = line.split(":", 1)[1].strip()
+                if "pkg:" in ref_line:
+                    # Extract purl
+                    purl_match = re.search(r"pkg:([^\s]+)", ref_line)
+                    if purl_match:
+                        purl = purl_match.group(1)
+                        ecosystem = self._extract_ecosystem_from_purl(f"pkg:{purl}")
+                        if ecosystem:
+                            current_package["ecosystem"] = ecosystem
+                else:
+                    # Try to extract repository URL
+                    url_match = re.search(r"(https?://[^\s]+|git\+[^\s]+)", ref_line)
+                    if url_match and self._is_git_url(url_match.group(1)):
+                        current_package["repository_url"] = url_match.group(1)
+            elif line.startswith("PackageDownloadLocation:") and in_package:
+                download_loc = line.split(":", 1)[1].strip()
+                if self._is_git_url(download_loc):
+                    current_package["repository_url"] = (
+                        download_loc.replace("git+", "").split("#")[0]
+                    )
+
+        # Don't forget the last package
+        if in_package and current_package.get("name"):
+            packages.append(self._create_package_from_dict(current_package))
 
         return packages
 
@@ -11,6 +11,8 @@ from ossval.parsers.base import BaseParser, ParseResult
 class YarnLockParser(BaseParser):
     """Parser for yarn.lock files."""
 
+    source_type = SourceType.YARN
+
     def can_parse(self, filepath: str) -> bool:
         """Check if file is yarn.lock."""
         path = Path(filepath)
@@ -57,7 +59,7 @@ class YarnLockParser(BaseParser):
 
         return ParseResult(
             packages=packages,
-            source_type=SourceType.YARN,
+            source_type=self.source_type,
             source_file=filepath,
             errors=errors,
             warnings=warnings,
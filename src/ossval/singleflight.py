@@ -0,0 +1,61 @@
+"""Coalescing of identical in-flight operations."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Run each operation at most once at a time per key.
+
+    A call whose key is already in flight awaits the running call's result
+    (or exception) instead of starting the work again. Once the call
+    completes the key is released, so later calls run anew; caching the
+    result is up to the caller.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        # Number of calls that joined an in-flight call
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def keys(self) -> List[Hashable]:
+        """Keys of the calls in flight."""
+        return list(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` unless a call with the same key is in flight, and return its result.
+
+        Args:
+            key: Operation and arguments identifying the work
+            fn: Coroutine function doing the work
+
+        Returns:
+            The result of the shared call
+        """
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda done: self._release(key, done))
+        else:
+            self.coalesced += 1
+        # A cancelled caller must not cancel the work other callers wait for
+        return await asyncio.shield(future)
+
+    def _release(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        """Forget a completed call."""
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        if not future.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled
+            future.exception()
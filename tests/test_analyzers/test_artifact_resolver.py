@@ -0,0 +1,131 @@
+"""Tests for in-process PURL resolution from published artifacts."""
+
+import gzip
+import io
+import json
+import tarfile
+
+import httpx
+import pytest
+
+from ossval.analyzers.artifact_resolver import parse_purl, resolve_purls
+
+
+def _tar(members, compressed=True, long_names=False):
+    """Build a tar archive from (name, bytes) pairs."""
+    buffer = io.BytesIO()
+    fmt = tarfile.GNU_FORMAT if long_names else tarfile.PAX_FORMAT
+    with tarfile.open(fileobj=buffer, mode="w:gz" if compressed else "w", format=fmt) as archive:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+def test_parse_purl():
+    """Test PURL parsing into ossval ecosystems and names."""
+    assert parse_purl("pkg:npm/%40babel/core@7.0.0") == ("npm", "@babel/core", "7.0.0")
+    assert parse_purl("pkg:npm/@babel/core@7.0.0") == ("npm", "@babel/core", "7.0.0")
+    assert parse_purl("pkg:maven/com.google.guava/guava@32.0.0?type=jar") == (
+        "maven",
+        "com.google.guava:guava",
+        "32.0.0",
+    )
+    assert parse_purl("pkg:gem/rails@7.1.0") == ("rubygems", "rails", "7.1.0")
+    assert parse_purl("pkg:pypi/requests") == ("pypi", "requests", None)
+    assert parse_purl("npm/left-pad") is None
+
+
+async def test_resolve_purls_reads_manifests():
+    """Test manifest extraction for each artifact kind over one client."""
+    long_dir = "x" * 120
+    artifacts = {
+        "/left-pad/-/left-pad-1.3.0.tgz": _tar(
+            [("package/README.md", b"readme"), ("package/package.json", json.dumps({"repository": "stevemao/left-pad"}).encode())]
+        ),
+        "/packages/source/f/flask_login/flask_login-0.6.3.tar.gz": _tar(
+            [
+                (
+                    f"{long_dir}/PKG-INFO",
+                    b"Metadata-Version: 2.1\nName: Flask-Login\n"
+                    b"Project-URL: Source Code, https://github.com/maxcountryman/flask-login\n\n",
+                )
+            ]
+        ),
+        "/crates/serde_json/serde_json-1.0.0.crate": _tar(
+            [(f"{long_dir}-1.0.0/Cargo.toml", b'[package]\nrepository = "https://github.com/serde-rs/json"\n')],
+            long_names=True,
+        ),
+        "/downloads/rails-7.1.0.gem": _tar(
+            [
+                (
+                    "metadata.gz",
+                    gzip.compress(
+                        b"--- !ruby/object:Gem::Specification\nmetadata:\n"
+                        b"  source_code_uri: https://github.com/rails/rails/tree/v7.1.0\n"
+                        b"homepage: https://rubyonrails.org\n"
+                    ),
+                ),
+                ("data.tar.gz", b"\0" * 2048),
+            ],
+            compressed=False,
+        ),
+    }
+    requested = []
+
+    def handler(request):
+        requested.append(request.url.host)
+        content = artifacts.get(request.url.path)
+        return httpx.Response(200, content=content) if content else httpx.Response(404)
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await resolve_purls(
+            [
+                "pkg:npm/left-pad@1.3.0",
+                "pkg:pypi/Flask-Login@0.6.3",
+                "pkg:cargo/serde_json@1.0.0",
+                "pkg:gem/rails@7.1.0",
+                "pkg:npm/missing@1.0.0",
+                "pkg:npm/left-pad",
+                "pkg:npm/left-pad@1.3.0",
+            ],
+            client=client,
+        )
+
+    assert results == {
+        "pkg:npm/left-pad@1.3.0": "https://github.com/stevemao/left-pad.git",
+        "pkg:pypi/Flask-Login@0.6.3": "https://github.com/maxcountryman/flask-login.git",
+        "pkg:cargo/serde_json@1.0.0": "https://github.com/serde-rs/json.git",
+        "pkg:gem/rails@7.1.0": "https://github.com/rails/rails.git",
+        "pkg:npm/missing@1.0.0": None,
+        "pkg:npm/left-pad": None,
+    }
+    # Duplicates are resolved once and unversioned PURLs need no request
+    assert requested.count("registry.npmjs.org") == 2
+
+
+@pytest.mark.parametrize("chunk_size", [1, 97, 4096])
+async def test_artifact_download_stops_after_manifest(chunk_size):
+    """Test that the archive is only read up to the manifest member."""
+    archive = _tar(
+        [
+            ("package/package.json", b'{"repository": "https://github.com/a/b"}'),
+            ("package/big.bin", bytes(range(256)) * 4096),
+        ]
+    )
+    sent = []
+
+    async def body():
+        for offset in range(0, len(archive), chunk_size):
+            sent.append(chunk_size)
+            yield archive[offset : offset + chunk_size]
+
+    def handler(request):
+        return httpx.Response(200, content=body())
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        results = await resolve_purls(["pkg:npm/b@1.0.0"], client=client)
+
+    assert results == {"pkg:npm/b@1.0.0": "https://github.com/a/b.git"}
+    assert sum(sent) < len(archive)
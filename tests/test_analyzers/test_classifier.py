@@ -0,0 +1,69 @@
+"""Tests for binary, generated and minified file classification."""
+
+from pathlib import Path
+
+from ossval.analyzers.classifier import classify_file
+from ossval.analyzers.fused import analyze_repository
+from ossval.analyzers.halstead import collect_source_files
+from ossval.models import FileCategory
+
+
+def test_classify_binary():
+    """Test that NUL bytes mark a file as binary."""
+    assert classify_file(Path("blob.dat"), b"\x89PNG\r\n\x1a\n\0\0\0") == FileCategory.BINARY
+
+
+def test_classify_generated_markers():
+    """Test generator header markers."""
+    go_header = b"// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n"
+    assert classify_file(Path("api.go"), go_header) == FileCategory.GENERATED
+    assert classify_file(Path("x.js"), b"/**\n * @generated\n */\nmodule.exports = {};\n") == (
+        FileCategory.GENERATED
+    )
+
+
+def test_classify_generated_names():
+    """Test lockfiles and protobuf outputs are recognized by name."""
+    assert classify_file(Path("package-lock.json"), b"{}\n") == FileCategory.GENERATED
+    assert classify_file(Path("service_pb2.py"), b"import grpc\n") == FileCategory.GENERATED
+
+
+def test_classify_minified():
+    """Test .min. names and long-line content are treated as minified."""
+    assert classify_file(Path("jquery.min.js"), b"var a=1;\n") == FileCategory.MINIFIED
+
+    bundle = b"!function(e){" + b"var a=e.b||{};" * 600 + b"}();"
+    assert classify_file(Path("bundle.js"), bundle) == FileCategory.MINIFIED
+
+    dump = b"\n".join(b"INSERT INTO t VALUES " + b"(1,'x')," * 60 for _ in range(10))
+    assert classify_file(Path("dump.sql"), dump) == FileCategory.MINIFIED
+
+
+def test_classify_ordinary_source():
+    """Test that ordinary source files are not classified."""
+    source = b"def add(a, b):\n    # Add two numbers\n    return a + b\n"
+    assert classify_file(Path("add.py"), source) is None
+    assert classify_file(Path("empty.py"), b"") is None
+
+
+def test_classify_reads_head_from_disk(tmp_path):
+    """Test classification when only a path is given."""
+    target = tmp_path / "image.bin"
+    target.write_bytes(b"\0" * 100)
+
+    assert classify_file(target) == FileCategory.BINARY
+
+
+def test_excluded_files_reported_in_sloc(tmp_path):
+    """Test that excluded files add no lines and are counted per category."""
+    (tmp_path / "app.js").write_text("function add(a, b) {\n  return a + b;\n}\n")
+    (tmp_path / "app.min.js").write_text("function add(a,b){return a+b}\n")
+    (tmp_path / "api.pb.go").write_text("package api\n\nvar X = 1\n")
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\0\0\0\0")
+
+    analysis = analyze_repository(tmp_path)
+
+    assert analysis.sloc.by_language == {"JavaScript": 2}
+    assert analysis.sloc.excluded_files == {"minified": 1, "generated": 1, "binary": 1}
+    assert analysis.sloc.excluded_bytes["binary"] == 8
+    assert collect_source_files(tmp_path) == [tmp_path / "app.js"]
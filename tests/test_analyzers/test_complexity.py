@@ -0,0 +1,141 @@
+"""Tests for cyclomatic complexity analyzer."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from ossval.analyzers.complexity import analyze_complexity, map_files
+from ossval.analyzers.fused import analyze_directory_complexity, analyze_file
+from ossval.analyzers.halstead import TREE_SITTER_AVAILABLE
+from ossval.models import ComplexityLevel
+
+
+def test_analyze_complexity_python_source():
+    """Test complexity analysis of a Python source string."""
+    code = """
+def check(a, b):
+    if a > b:
+        return a
+    elif a < b:
+        return b
+    return 0
+"""
+    metrics = analyze_complexity(code)
+
+    assert metrics.cyclomatic_complexity_max == 3
+    assert metrics.complexity_level == ComplexityLevel.TRIVIAL
+
+
+def test_analyze_python_file_complexity(tmp_path):
+    """Test per-function complexities for a Python file, including methods."""
+    source = tmp_path / "mod.py"
+    source.write_text("""
+def simple():
+    return 1
+
+class Worker:
+    def run(self, items):
+        for item in items:
+            if item and item.ready:
+                yield item
+""")
+
+    record = analyze_file(source)
+
+    assert record is not None
+    assert sorted(record.function_complexities) == [1, 4]
+
+
+def test_analyze_file_complexity_unsupported(tmp_path):
+    """Test that files in unsupported languages have no function complexities."""
+    source = tmp_path / "notes.txt"
+    source.write_text("if this then that")
+
+    record = analyze_file(source)
+    assert record is None or record.function_complexities == ()
+
+
+@pytest.mark.skipif(not TREE_SITTER_AVAILABLE, reason="Requires tree-sitter for multi-language support")
+def test_analyze_javascript_file_complexity(tmp_path):
+    """Test decision point counting for JavaScript functions."""
+    source = tmp_path / "app.js"
+    source.write_text("""
+function pick(a, b) {
+    if (a && b) {
+        return a;
+    }
+    for (let i = 0; i < 3; i++) {}
+    return a ? a : b;
+}
+
+const noop = () => 1;
+""")
+
+    assert sorted(analyze_file(source).function_complexities) == [1, 5]
+
+
+@pytest.mark.skipif(not TREE_SITTER_AVAILABLE, reason="Requires tree-sitter for multi-language support")
+def test_analyze_go_file_complexity(tmp_path):
+    """Test that nested functions are counted separately."""
+    source = tmp_path / "main.go"
+    source.write_text("""
+package main
+
+func outer(x int) int {
+    f := func(y int) int {
+        if y > 0 {
+            return y
+        }
+        return 0
+    }
+    switch x {
+    case 1:
+        return f(x)
+    case 2:
+        return 2
+    }
+    return 0
+}
+""")
+
+    assert sorted(analyze_file(source).function_complexities) == [2, 3]
+
+
+def test_analyze_directory_complexity():
+    """Test repository-level aggregation of function complexities."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        (tmppath / "a.py").write_text("def a():\n    return 1\n")
+        (tmppath / "b.py").write_text(
+            "def b(x):\n    if x:\n        return 1\n    while x:\n        x -= 1\n    return 0\n"
+        )
+
+        metrics = analyze_directory_complexity(tmppath)
+
+    assert metrics is not None
+    assert metrics.cyclomatic_complexity_sum == 4
+    assert metrics.cyclomatic_complexity_max == 3
+    assert metrics.cyclomatic_complexity_avg == 2.0
+    assert metrics.complexity_level == ComplexityLevel.TRIVIAL
+
+
+def test_analyze_directory_complexity_no_functions(tmp_path):
+    """Test that a directory without functions returns None."""
+    (tmp_path / "consts.py").write_text("X = 1\n")
+
+    assert analyze_directory_complexity(tmp_path) is None
+
+
+def test_map_files_parallel_matches_serial(tmp_path):
+    """Test that worker processes give the same results as in-process analysis."""
+    files = []
+    for i in range(70):
+        source = tmp_path / f"m{i}.py"
+        source.write_text(f"def f(x):\n    if x > {i}:\n        return x\n    return {i}\n")
+        files.append(source)
+
+    serial = map_files(analyze_file, files, workers=1)
+    parallel = map_files(analyze_file, files, workers=2)
+
+    assert parallel == serial
@@ -0,0 +1,178 @@
+"""Tests for the fused single-pass repository analyzer."""
+
+import pytest
+
+from ossval.analyzers.fused import (
+    AnalysisLimits,
+    _get_parser,
+    analyze_directory_complexity,
+    analyze_directory_halstead,
+    analyze_file,
+    analyze_repository,
+)
+from ossval.analyzers.halstead import (
+    TREE_SITTER_AVAILABLE,
+    aggregate_halstead,
+    analyze_source_file,
+)
+from ossval.analyzers.sloc import _count_sloc_with_pygount
+
+PYTHON_SOURCE = '''"""Module docstring."""
+
+import os
+
+
+def check(a, b):
+    # compare values
+    if a > b and b > 0:
+        return a
+    return os.sep
+'''
+
+JS_SOURCE = """// helper
+function pick(a, b) {
+  /* choose */
+  return a > b ? a : b;
+}
+
+const label = `value ${pick(1, 2)}`;
+"""
+
+
+def _make_repo(root):
+    (root / "src").mkdir()
+    (root / "src" / "mod.py").write_text(PYTHON_SOURCE)
+    (root / "src" / "pick.js").write_text(JS_SOURCE)
+    return root
+
+
+def test_analyze_file_python_lines_and_metrics(tmp_path):
+    """Test that one pass yields pygount-style lines, Halstead counts and complexity."""
+    source = tmp_path / "mod.py"
+    source.write_text(PYTHON_SOURCE)
+
+    record = analyze_file(source)
+
+    assert record is not None
+    assert record.language == "Python"
+    assert (record.code_lines, record.comment_lines) == (5, 2)
+    assert record.halstead_counts is not None
+    assert record.function_complexities == (3,)
+
+
+def test_analyze_file_matches_halstead_analyzer(tmp_path):
+    """Test that fused Halstead counts equal the standalone analyzer."""
+    source = tmp_path / "mod.py"
+    source.write_text(PYTHON_SOURCE)
+
+    record = analyze_file(source)
+    standalone = analyze_source_file(source)
+
+    distinct_operators, distinct_operands, operators, operands = record.halstead_counts
+    assert distinct_operators + distinct_operands == standalone.vocabulary
+    assert operators + operands == standalone.length
+
+
+def test_analyze_file_without_parse(tmp_path):
+    """Test that line-only analysis skips Halstead and complexity."""
+    source = tmp_path / "mod.py"
+    source.write_text(PYTHON_SOURCE)
+
+    record = analyze_file(source, parse=False)
+
+    assert record.code_lines == 5
+    assert record.halstead_counts is None
+    assert record.function_complexities == ()
+
+
+@pytest.mark.skipif(not TREE_SITTER_AVAILABLE, reason="tree-sitter not available")
+def test_analyze_repository_matches_separate_passes(tmp_path):
+    """Test that the fused pass agrees with pygount and the per-file Halstead analyzer."""
+    repo = _make_repo(tmp_path)
+
+    analysis = analyze_repository(repo)
+    sloc = _count_sloc_with_pygount(repo)
+    halstead = aggregate_halstead(
+        [analyze_source_file(repo / "src" / name) for name in ("mod.py", "pick.js")]
+    )
+
+    assert analysis.sloc.by_language["Python"] == sloc.by_language["Python"]
+    assert (analysis.sloc.total, analysis.sloc.comment_lines) == (sloc.total, sloc.comment_lines)
+    assert analysis.halstead.volume == pytest.approx(halstead.volume)
+    # The directory-level helpers are the same pass without line counting
+    assert analyze_directory_halstead(repo).volume == pytest.approx(analysis.halstead.volume)
+    assert analyze_directory_complexity(repo) == analysis.complexity
+
+
+@pytest.mark.skipif(not TREE_SITTER_AVAILABLE, reason="tree-sitter not available")
+def test_parsers_are_per_thread():
+    """Test that threads never share a tree-sitter parser (and its timeout state)."""
+    import threading
+
+    parsers = []
+    thread = threading.Thread(target=lambda: parsers.append(_get_parser("python")))
+    thread.start()
+    thread.join()
+
+    assert _get_parser("python") is _get_parser("python")
+    assert parsers[0] is not None
+    assert parsers[0] is not _get_parser("python")
+
+
+def test_analyze_repository_sampling_keeps_full_sloc(tmp_path):
+    """Test that a Halstead sample budget does not reduce line counts."""
+    for i in range(10):
+        (tmp_path / f"mod{i}.py").write_text(PYTHON_SOURCE)
+
+    full = analyze_repository(tmp_path)
+    sampled = analyze_repository(tmp_path, sample_files=3)
+
+    assert sampled.sloc.total == full.sloc.total
+    assert sampled.halstead.files_analyzed == 3
+    assert sampled.halstead.files_total == 10
+
+
+def test_analyze_repository_empty(tmp_path):
+    """Test analysis of a repository with no source files."""
+    analysis = analyze_repository(tmp_path)
+
+    assert analysis.sloc is None
+    assert analysis.halstead is None
+    assert analysis.complexity is None
+
+
+def test_analyze_repository_skips_large_files(tmp_path):
+    """Test that files over the byte limit are skipped and counted."""
+    (tmp_path / "small.py").write_text(PYTHON_SOURCE)
+    (tmp_path / "large.py").write_text(PYTHON_SOURCE * 50)
+
+    analysis = analyze_repository(tmp_path, max_file_bytes=1000)
+
+    assert analysis.skipped == {"size": 1}
+    assert analysis.sloc.code_lines == 5
+    assert analysis.complexity.cyclomatic_complexity_sum == 3
+
+
+@pytest.mark.skipif(not TREE_SITTER_AVAILABLE, reason="tree-sitter not available")
+def test_analyze_file_timeout(tmp_path):
+    """Test that a file whose parse runs past its deadline is skipped."""
+    source = tmp_path / "big.py"
+    source.write_text("x = [\n" + "    1,\n" * 200000 + "]\n")
+
+    record = analyze_file(source, limits=AnalysisLimits(file_timeout=1e-6))
+
+    assert record.skipped == "timeout"
+    # The shared parser must not resume the abandoned parse
+    (tmp_path / "mod.py").write_text(PYTHON_SOURCE)
+    assert analyze_file(tmp_path / "mod.py").code_lines == 5
+
+
+def test_analyze_repository_time_budget(tmp_path):
+    """Test that files reached after the repository budget are skipped."""
+    for i in range(3):
+        (tmp_path / f"mod{i}.py").write_text(PYTHON_SOURCE)
+
+    analysis = analyze_repository(tmp_path, time_budget=1e-9)
+
+    assert analysis.skipped == {"budget": 3}
+    assert analysis.sloc is None
@@ -0,0 +1,121 @@
+"""Tests for Go vanity import resolution."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from ossval.analyzers import go_resolver
+from ossval.analyzers.go_resolver import GoResolver, _PrefixTrie
+from ossval.cache import AnalysisCache
+
+GO_IMPORTS = {
+    "golang.org/x/net": "golang.org/x/net git https://go.googlesource.com/net",
+    "k8s.io/api": "k8s.io/api git https://github.com/kubernetes/api",
+    "go.uber.org/zap": "go.uber.org/zap git https://github.com/uber-go/zap",
+}
+
+
+@pytest.fixture
+def requests(monkeypatch):
+    """Serve go-import meta tags and record the requested paths."""
+    requested = []
+
+    async def fake_cached_get(url, headers=None, params=None, timeout=10.0, client=None):
+        assert params == {"go-get": "1"}
+        path = url[len("https://"):]
+        requested.append(path)
+        await asyncio.sleep(0.01)
+        for root, content in GO_IMPORTS.items():
+            if path == root or path.startswith(root + "/"):
+                html = (
+                    f'<html><head><meta name="go-import" content="{root} mod https://proxy.golang.org">'
+                    f'<meta name="go-import" content="{content}"></head></html>'
+                )
+                return httpx.Response(200, text=html)
+        return httpx.Response(404)
+
+    monkeypatch.setattr(go_resolver, "cached_get", fake_cached_get)
+    return requested
+
+
+def test_prefix_trie_longest_prefix():
+    """Test that the longest stored prefix wins."""
+    trie = _PrefixTrie()
+    trie.insert("example.com/a", "A")
+    trie.insert("example.com/a/b", "B")
+
+    assert trie.longest_prefix("example.com/a/b/c") == ("example.com/a/b", "B")
+    assert trie.longest_prefix("example.com/a/c") == ("example.com/a", "A")
+    assert trie.longest_prefix("example.com") is None
+
+
+async def test_known_hosts_and_major_versions(requests):
+    """Test host/owner/repo paths, with major version suffixes collapsed."""
+    resolver = GoResolver()
+
+    assert await resolver.resolve("github.com/spf13/cobra") == "https://github.com/spf13/cobra.git"
+    assert await resolver.resolve("github.com/go-redis/redis/v8") == "https://github.com/go-redis/redis.git"
+    assert await resolver.resolve("github.com/owner/repo/sub/pkg") == "https://github.com/owner/repo.git"
+    assert await resolver.resolve("github.com/owner") is None
+    assert await resolver.resolve("evil.com/a?b=c") is None
+    assert requests == []
+
+
+async def test_vanity_roots_resolve_once(requests):
+    """Test that every path under a resolved root shares one go-get request."""
+    resolver = GoResolver()
+
+    results = await asyncio.gather(
+        resolver.resolve("golang.org/x/net"),
+        resolver.resolve("golang.org/x/net/html"),
+        resolver.resolve("golang.org/x/net/http2/v2"),
+        resolver.resolve("k8s.io/api/core/v1"),
+    )
+
+    assert results == [
+        "https://go.googlesource.com/net",
+        "https://go.googlesource.com/net",
+        "https://go.googlesource.com/net",
+        "https://github.com/kubernetes/api.git",
+    ]
+    assert sorted(requests) == ["golang.org/x/net", "k8s.io/api/core/v1"]
+    assert await resolver.resolve("unknown.example/mod") is None
+
+
+async def test_distinct_roots_on_one_host_resolve_concurrently(monkeypatch):
+    """Test that lookups of different roots on the same host are not serialized."""
+    arrived = []
+    both = asyncio.Event()
+
+    async def fake_cached_get(url, headers=None, params=None, timeout=10.0, client=None):
+        path = url[len("https://"):]
+        arrived.append(path)
+        if len(arrived) == 2:
+            both.set()
+        # Serialized lookups would never see the second request arrive
+        await asyncio.wait_for(both.wait(), timeout=1)
+        repo = "https://go.googlesource.com/" + path.rsplit("/", 1)[-1]
+        html = f'<meta name="go-import" content="{path} git {repo}">'
+        return httpx.Response(200, text=html)
+
+    monkeypatch.setattr(go_resolver, "cached_get", fake_cached_get)
+    resolver = GoResolver()
+
+    results = await asyncio.gather(
+        resolver.resolve("golang.org/x/net"), resolver.resolve("golang.org/x/sys")
+    )
+
+    assert results == ["https://go.googlesource.com/net", "https://go.googlesource.com/sys"]
+    assert resolver.requests == 2
+
+
+async def test_vanity_roots_are_cached(tmp_path, requests):
+    """Test that roots resolved in one run need no request in the next."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    assert await GoResolver(cache).resolve("go.uber.org/zap") == "https://github.com/uber-go/zap.git"
+
+    resolver = GoResolver(cache)
+    assert await resolver.resolve("go.uber.org/zap/zapcore") == "https://github.com/uber-go/zap.git"
+    assert resolver.requests == 0
+    cache.close()
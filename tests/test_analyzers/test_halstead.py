@@ -5,12 +5,16 @@ from pathlib import Path
 
 import pytest
 
+from ossval.analyzers.fused import analyze_directory_halstead
 from ossval.analyzers.halstead import (
     TREE_SITTER_AVAILABLE,
-    analyze_directory_halstead,
+    aggregate_halstead,
     analyze_python_file,
     analyze_source_file,
+    collect_source_files,
     detect_language,
+    extrapolate_halstead,
+    select_stratified_sample,
 )
 
 
@@ -448,3 +452,103 @@ func add(a int, b int) int {
     assert metrics.volume > 0
     assert metrics.effort > 0
     assert metrics.bugs > 0
+
+
+def _write_python_files(path: Path, count: int) -> None:
+    """Write `count` small Python files of varying size."""
+    for i in range(count):
+        body = "\n".join(f"    x{j} = a + {j} * b" for j in range(i % 7 + 1))
+        (path / f"mod{i}.py").write_text(f"def f{i}(a, b):\n{body}\n    return a\n")
+
+
+def test_stratified_sample_respects_file_budget():
+    """Test that the stratified sample never exceeds the file budget."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        _write_python_files(tmppath, 40)
+
+        files = collect_source_files(tmppath)
+        strata = select_stratified_sample(files, max_files=10)
+
+    sampled = [f for _, members in strata.values() for f in members]
+    assert len(files) == 40
+    assert len(sampled) == 10
+    assert sum(size for size, _ in strata.values()) == 40
+    assert all(key[0] == "python" for key in strata)
+
+
+def test_stratified_sample_respects_byte_budget():
+    """Test that the byte budget bounds the sample."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        _write_python_files(tmppath, 40)
+
+        files = collect_source_files(tmppath)
+        strata = select_stratified_sample(files, max_bytes=500)
+        sampled = [f for _, members in strata.values() for f in members]
+        sampled_bytes = sum(f.stat().st_size for f in sampled)
+
+    assert sampled
+    assert sampled_bytes <= 500
+
+
+def test_stratified_sample_is_reproducible():
+    """Test that the same seed selects the same files."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        _write_python_files(tmppath, 30)
+
+        files = collect_source_files(tmppath)
+        first = select_stratified_sample(files, max_files=8, seed=42)
+        second = select_stratified_sample(files, max_files=8, seed=42)
+
+    assert first == second
+
+
+def test_analyze_directory_sampled_extrapolates():
+    """Test that sampled analysis extrapolates close to the full result."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        _write_python_files(tmppath, 60)
+
+        full = analyze_directory_halstead(tmppath)
+        sampled = analyze_directory_halstead(tmppath, sample_files=20)
+
+    assert full is not None
+    assert sampled is not None
+    assert full.files_analyzed == 60
+    assert full.sample_relative_error is None
+    assert sampled.files_analyzed == 20
+    assert sampled.files_total == 60
+    assert sampled.sample_relative_error is not None
+    assert sampled.volume == pytest.approx(full.volume, rel=0.25)
+
+
+def test_analyze_directory_sample_larger_than_repo():
+    """Test that a budget above the repository size analyzes every file."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        _write_python_files(tmppath, 5)
+
+        metrics = analyze_directory_halstead(tmppath, sample_files=100)
+
+    assert metrics is not None
+    assert metrics.files_analyzed == 5
+    assert metrics.sample_relative_error is None
+
+
+def test_aggregate_counts_only_analyzed_files(tmp_path):
+    """Test that files that failed analysis are not counted as analyzed."""
+    source = tmp_path / "add.py"
+    source.write_text("def add(a, b):\n    return a + b\n")
+    metrics = analyze_python_file(source)
+    assert metrics is not None
+
+    aggregated = aggregate_halstead([metrics, None, metrics])
+
+    assert aggregated.files_analyzed == 2
+    assert aggregated.files_total == 3
+    assert aggregate_halstead([None, None]) is None
+
+    extrapolated = extrapolate_halstead({("python", 0): (4, [metrics, None])}, files_total=4)
+    assert extrapolated.files_analyzed == 1
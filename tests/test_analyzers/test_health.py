@@ -0,0 +1,168 @@
+"""Tests for repository health metrics."""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pytest
+
+from ossval.analyzers import health as health_module
+from ossval.analyzers.health import HealthBatcher, fetch_contributors_count, fetch_health_batch
+from ossval.http_client import TokenPool
+from ossval.models import HealthMetrics
+
+
+class _GraphQLStub(BaseHTTPRequestHandler):
+    """Answers batched repository queries; repositories named "missing" do not exist."""
+
+    requests = []
+    status = 200
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).requests.append((body, self.headers.get("Authorization")))
+        if self.status != 200:
+            self.send_response(self.status)
+            self.end_headers()
+            return
+
+        variables = body["variables"]
+        data, errors = {}, []
+        for index in range(len(variables) // 2):
+            alias, name = f"r{index}", variables[f"n{index}"]
+            if name == "missing":
+                data[alias] = None
+                errors.append({"type": "NOT_FOUND", "path": [alias]})
+                continue
+            data[alias] = {
+                "stargazerCount": 100 + index,
+                "forkCount": 10,
+                "createdAt": "2015-01-01T00:00:00Z",
+                "pushedAt": "2020-06-01T00:00:00Z",
+                "isSecurityPolicyEnabled": True,
+                "licenseInfo": {"name": "MIT License"},
+                "fundingLinks": [{"url": "https://github.com/sponsors/x"}],
+                "issues": {"totalCount": 3},
+                "pullRequests": {"totalCount": 2},
+            }
+        payload = json.dumps({"data": data, "errors": errors}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def contributors(monkeypatch):
+    """Answer contributor counts without the REST API; returns the repositories asked for."""
+    requested = []
+
+    async def fake_fetch_contributors_count(owner, repo, token_pool, client=None):
+        requested.append((owner, repo))
+        return 7
+
+    monkeypatch.setattr(health_module, "fetch_contributors_count", fake_fetch_contributors_count)
+    return requested
+
+
+@pytest.fixture
+def graphql_endpoint():
+    """Run a local GraphQL stub server."""
+    _GraphQLStub.requests = []
+    _GraphQLStub.status = 200
+    server = HTTPServer(("127.0.0.1", 0), _GraphQLStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}/graphql"
+    server.shutdown()
+    server.server_close()
+
+
+async def test_fetch_health_batch_maps_fields(graphql_endpoint):
+    """Test that GraphQL repository nodes become HealthMetrics."""
+    results = await fetch_health_batch(
+        [("psf", "requests"), ("psf", "missing")], "secret", graphql_endpoint
+    )
+
+    health = results[("psf", "requests")]
+    assert health.stars == 100
+    assert health.forks == 10
+    assert health.open_issues == 5
+    assert health.contributors_count is None
+    assert health.bus_factor is None
+    assert health.license == "MIT License"
+    assert health.has_funding is True
+    assert health.has_security_policy is True
+    assert health.last_commit_date.year == 2020
+    assert health.is_actively_maintained is False
+    assert results[("psf", "missing")] is None
+
+    body, authorization = _GraphQLStub.requests[0]
+    assert authorization == "bearer secret"
+    assert body["variables"] == {"o0": "psf", "n0": "requests", "o1": "psf", "n1": "missing"}
+
+
+async def test_health_batcher_coalesces_lookups(graphql_endpoint, contributors):
+    """Test that concurrent lookups share GraphQL requests of at most batch_size nodes."""
+    batcher = HealthBatcher("secret", batch_size=50, delay=0.05, endpoint=graphql_endpoint)
+    urls = [f"https://github.com/org/repo{index}" for index in range(120)]
+    urls.insert(1, "https://github.com/org/repo0.git")
+
+    results = await asyncio.gather(*(batcher.fetch(url) for url in urls))
+
+    assert all(isinstance(result, HealthMetrics) for result in results)
+    assert results[0].stars == results[1].stars
+    # Contributors come from one REST request per lookup
+    assert all(result.contributors_count == result.bus_factor == 7 for result in results)
+    assert len(contributors) == len(urls)
+    assert batcher.requests == 3
+    assert sorted(len(body["variables"]) // 2 for body, _ in _GraphQLStub.requests) == [20, 50, 50]
+
+
+async def test_health_batcher_falls_back_to_rest(graphql_endpoint, monkeypatch):
+    """Test that repositories of a failed batch are fetched one by one."""
+    _GraphQLStub.status = 502
+    fetched = []
+
+    async def fake_analyze_health(repository_url, github_token=None, token_pool=None):
+        fetched.append(repository_url)
+        return HealthMetrics(stars=1)
+
+    monkeypatch.setattr(health_module, "analyze_health", fake_analyze_health)
+    batcher = HealthBatcher("secret", delay=0.01, endpoint=graphql_endpoint)
+
+    health = await batcher.fetch("https://github.com/org/repo")
+
+    assert health.stars == 1
+    assert fetched == ["https://github.com/org/repo"]
+    assert await batcher.fetch("https://gitlab.com/org/repo") is None
+
+
+async def test_fetch_contributors_count_reads_last_page():
+    """Test that the contributor count is the last page of a one-per-page listing."""
+    requested = []
+
+    def handler(request):
+        requested.append(request.url)
+        if request.url.path == "/repos/psf/requests/contributors":
+            last = "https://api.github.com/repositories/1362490/contributors?per_page=1&anon=true&page=742"
+            return httpx.Response(
+                200, json=[{"login": "kennethreitz"}], headers={"Link": f'<{last}>; rel="last"'}
+            )
+        if request.url.path == "/repos/org/solo/contributors":
+            return httpx.Response(200, json=[{"login": "solo"}])
+        return httpx.Response(204)
+
+    pool = TokenPool([])
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert await fetch_contributors_count("psf", "requests", pool, client) == 742
+        assert await fetch_contributors_count("org", "solo", pool, client) == 1
+        assert await fetch_contributors_count("org", "empty", pool, client) is None
+
+    assert requested[0].params["per_page"] == "1"
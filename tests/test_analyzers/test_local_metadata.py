@@ -0,0 +1,109 @@
+"""Tests for local install metadata resolution."""
+
+import json
+
+import pytest
+
+from ossval.analyzers.local_metadata import LocalMetadataIndex
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Index over fake npm, PyPI, Cargo, Maven and Go metadata stores."""
+    project = tmp_path / "project"
+    home = tmp_path / "home"
+    site_packages = tmp_path / "site-packages"
+
+    modules = project / "node_modules"
+    _write(
+        modules / "left-pad" / "package.json",
+        json.dumps({"name": "left-pad", "version": "1.3.0", "repository": "stevemao/left-pad"}),
+    )
+    _write(
+        modules / "@babel" / "core" / "package.json",
+        json.dumps(
+            {
+                "name": "@babel/core",
+                "version": "7.0.0",
+                "repository": {"type": "git", "url": "https://github.com/babel/babel.git"},
+            }
+        ),
+    )
+    _write(
+        modules / "@babel" / "core" / "node_modules" / "left-pad" / "package.json",
+        json.dumps(
+            {"name": "left-pad", "version": "1.0.0", "repository": "github:old/left-pad"}
+        ),
+    )
+
+    _write(
+        site_packages / "Flask_Login-0.6.3.dist-info" / "METADATA",
+        "Metadata-Version: 2.1\nName: Flask-Login\nVersion: 0.6.3\n"
+        "Project-URL: Documentation, https://flask-login.readthedocs.io\n"
+        "Project-URL: Source Code, https://github.com/maxcountryman/flask-login\n\nBody\n",
+    )
+
+    _write(
+        home / ".cargo" / "registry" / "src" / "index.crates.io-6f17d22bba15001f" / "serde-json-1.0.100" / "Cargo.toml",
+        '[package]\nname = "serde-json"\nversion = "1.0.100"\nrepository = "https://github.com/serde-rs/json"\n',
+    )
+
+    _write(
+        home / ".m2" / "repository" / "com" / "google" / "guava" / "guava" / "32.0.0" / "guava-32.0.0.pom",
+        '<project xmlns="http://maven.apache.org/POM/4.0.0"><scm>'
+        "<connection>scm:git:https://github.com/google/guava.git</connection>"
+        "</scm></project>",
+    )
+
+    gomodcache = tmp_path / "gomod"
+    _write(
+        gomodcache / "cache" / "download" / "github.com" / "!burnt!sushi" / "toml" / "@v" / "v1.3.2.info",
+        json.dumps({"Version": "v1.3.2", "Origin": {"VCS": "git", "URL": "https://github.com/BurntSushi/toml"}}),
+    )
+
+    return LocalMetadataIndex(
+        project_dirs=[project], site_dirs=[site_packages], home=home, gomodcache=gomodcache
+    )
+
+
+def test_npm_lookup_prefers_installed_version(index):
+    """Test node_modules lookups, including scoped, nested and shorthand repositories."""
+    assert index.lookup("left-pad", "npm", "1.3.0") == "https://github.com/stevemao/left-pad.git"
+    assert index.lookup("left-pad", "npm", "1.0.0") == "https://github.com/old/left-pad.git"
+    assert index.lookup("@babel/core", "npm") == "https://github.com/babel/babel.git"
+    assert index.lookup("missing", "npm") is None
+
+
+def test_pypi_lookup_reads_dist_info_metadata(index):
+    """Test that dist-info METADATA Project-URLs are matched by normalized name."""
+    assert index.lookup("flask_login", "pypi") == "https://github.com/maxcountryman/flask-login.git"
+
+
+def test_cargo_maven_and_go_lookups(index):
+    """Test Cargo registry, Maven POM and Go module cache lookups."""
+    assert index.lookup("serde-json", "cargo", "1.0.100") == "https://github.com/serde-rs/json.git"
+    assert index.lookup("com.google.guava:guava", "maven", "32.0.0") == "https://github.com/google/guava.git"
+    assert index.lookup("github.com/BurntSushi/toml", "go") == "https://github.com/BurntSushi/toml.git"
+    assert index.lookup("com.google.guava:missing", "maven") is None
+
+
+async def test_find_repository_url_consults_local_index_first(index, monkeypatch):
+    """Test that local metadata answers before any registry request."""
+    from ossval.analyzers import repo_finder
+
+    async def no_network(*args, **kwargs):
+        raise AssertionError("registry should not be queried")
+
+    monkeypatch.setattr(repo_finder, "_find_repo_from_registry", no_network)
+    repo_finder.set_local_metadata_index(index)
+    try:
+        url = await repo_finder.find_repository_url("left-pad", "npm", "1.3.0")
+    finally:
+        repo_finder.set_local_metadata_index(None)
+
+    assert url == "https://github.com/stevemao/left-pad.git"
@@ -0,0 +1,117 @@
+"""Tests for Maven POM <scm> resolution."""
+
+import pytest
+
+from ossval.analyzers.maven_resolver import MavenResolver
+from ossval.cache import AnalysisCache
+
+
+def _pom(repository, group, artifact, version, body):
+    path = repository / group.replace(".", "/") / artifact / version / f"{artifact}-{version}.pom"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        '<project xmlns="http://maven.apache.org/POM/4.0.0">'
+        f"<groupId>{group}</groupId><artifactId>{artifact}</artifactId><version>{version}</version>"
+        f"{body}</project>"
+    )
+
+
+def _parent(group, artifact, version):
+    return (
+        f"<parent><groupId>{group}</groupId><artifactId>{artifact}</artifactId>"
+        f"<version>{version}</version></parent>"
+    )
+
+
+@pytest.fixture
+def repository(tmp_path):
+    """Stand-in Maven repository with an organization parent and a multi-module project."""
+    repo = tmp_path / "repo"
+    # Organization parent: its <scm> is its own repository
+    _pom(
+        repo,
+        "org.example",
+        "example-parent",
+        "1",
+        "<scm><url>https://github.com/example/example-parent/tree/${project.scm.tag}</url>"
+        "<connection>scm:git:https://github.com/example/example-parent.git</connection></scm>",
+    )
+    # Aggregator of a multi-module build
+    _pom(
+        repo,
+        "org.example.widgets",
+        "widgets-parent",
+        "2.0",
+        _parent("org.example", "example-parent", "1")
+        + "<modules><module>widgets-core</module></modules>"
+        "<scm><url>https://github.com/example/widgets</url></scm>",
+    )
+    _pom(repo, "org.example.widgets", "widgets-core", "2.0", _parent("org.example.widgets", "widgets-parent", "2.0"))
+    _pom(repo, "org.example.widgets", "widgets-extra", "2.0", _parent("org.example.widgets", "widgets-parent", "2.0"))
+    _pom(
+        repo,
+        "org.example.tools",
+        "tool",
+        "1.1",
+        _parent("org.example", "example-parent", "1")
+        + "<scm><url>https://github.com/example/${project.artifactId}</url></scm>",
+    )
+    _pom(repo, "org.example.tools", "tool", "1.10", "<scm><url>https://github.com/example/tool</url></scm>")
+    _pom(repo, "org.example.tools", "orphan", "1.0", _parent("org.example", "example-parent", "1"))
+    return repo
+
+
+def _resolver(tmp_path, repository, cache=None):
+    return MavenResolver([str(repository)], home=tmp_path / "home", cache=cache, central=False)
+
+
+async def test_scm_from_own_pom_and_aggregator_parent(tmp_path, repository):
+    """Test own <scm>, interpolation and inheritance from an aggregating parent."""
+    resolver = _resolver(tmp_path, repository)
+
+    assert await resolver.resolve("org.example.tools:tool", "1.1") == "https://github.com/example/tool.git"
+    assert await resolver.resolve("org.example.widgets:widgets-core", "2.0") == "https://github.com/example/widgets.git"
+    assert await resolver.resolve("org.example.widgets:widgets-extra:jar", "2.0") == "https://github.com/example/widgets.git"
+    # The organization parent's <scm> is not the artifact's repository
+    assert await resolver.resolve("org.example.tools:orphan", "1.0") is None
+    assert await resolver.resolve("org.example.tools:missing", "1.0") is None
+    assert await resolver.resolve("not-maven", "1.0") is None
+
+
+async def test_latest_version_from_repository_layout(tmp_path, repository):
+    """Test that a missing version resolves to the newest release directory."""
+    resolver = _resolver(tmp_path, repository)
+    pom = await resolver.pom("org.example.tools", "tool", await resolver._latest_version("org.example.tools", "tool"))
+
+    assert pom["parent"] is None
+    assert await resolver.resolve("org.example.tools:tool") == "https://github.com/example/tool.git"
+
+
+async def test_parent_poms_are_memoized(tmp_path, repository):
+    """Test that shared parents are read once per process and then come from the disk cache."""
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"))
+    resolver = _resolver(tmp_path, repository, cache)
+    fetched = []
+    fetch = resolver._fetch
+
+    async def counting_fetch(path):
+        fetched.append(path)
+        return await fetch(path)
+
+    resolver._fetch = counting_fetch
+    await resolver.resolve("org.example.widgets:widgets-core", "2.0")
+    await resolver.resolve("org.example.widgets:widgets-extra", "2.0")
+    assert sum("widgets-parent" in path for path in fetched) == 1
+
+    # A new process finds the parsed parent in the cache
+    offline = MavenResolver(home=tmp_path / "home", cache=cache, central=False)
+    assert await offline.pom("org.example.widgets", "widgets-parent", "2.0") is not None
+    assert await offline.pom("org.example.widgets", "widgets-other", "2.0") is None
+    cache.close()
+
+    # Parent coordinates read back from disk are a tuple again
+    reopened = AnalysisCache(cache_dir=str(tmp_path / "cache"))
+    offline = MavenResolver(home=tmp_path / "home", cache=reopened, central=False)
+    pom = await offline.pom("org.example.widgets", "widgets-parent", "2.0")
+    assert pom["parent"] == ("org.example", "example-parent", "1")
+    reopened.close()
@@ -0,0 +1,140 @@
+"""Tests for the offline registry index."""
+
+import gzip
+import io
+import json
+import tarfile
+
+import pytest
+
+from ossval.analyzers.offline_index import OfflineIndex, build_index
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+@pytest.fixture
+def exports(tmp_path):
+    """Bulk exports of every supported kind."""
+    npm = tmp_path / "npm.jsonl.gz"
+    with gzip.open(npm, "wt") as f:
+        f.write(json.dumps({"name": "left-pad", "repository": "stevemao/left-pad"}) + "\n")
+        f.write(
+            json.dumps(
+                {
+                    "doc": {
+                        "_id": "@babel/core",
+                        "dist-tags": {"latest": "7.0.0"},
+                        "versions": {
+                            "7.0.0": {"repository": {"url": "git+https://github.com/babel/babel.git"}}
+                        },
+                    }
+                }
+            )
+            + ",\n"
+        )
+        f.write("not json\n")
+        f.write(json.dumps({"name": "no-repo"}) + "\n")
+
+    pypi = tmp_path / "pypi.jsonl"
+    _write(
+        pypi,
+        json.dumps(
+            {
+                "info": {
+                    "name": "Flask_Login",
+                    "project_urls": {"Source Code": "https://github.com/maxcountryman/flask-login"},
+                }
+            }
+        )
+        + "\n"
+        + json.dumps(
+            {"name": "requests", "project_urls": ["Source, https://github.com/psf/requests"]}
+        )
+        + "\n",
+    )
+
+    crates_csv = b"id,name,homepage,repository\n1,serde_json,,https://github.com/serde-rs/json\n"
+    crates = tmp_path / "db-dump.tar.gz"
+    with tarfile.open(crates, "w:gz") as archive:
+        member = tarfile.TarInfo("2024-01-01-020000/data/crates.csv")
+        member.size = len(crates_csv)
+        archive.addfile(member, io.BytesIO(crates_csv))
+
+    maven = tmp_path / "maven"
+    _write(
+        maven / "com" / "google" / "guava" / "guava" / "32.0.0" / "guava-32.0.0.pom",
+        '<project xmlns="http://maven.apache.org/POM/4.0.0"><scm>'
+        "<connection>scm:git:https://github.com/google/guava.git</connection>"
+        "</scm></project>",
+    )
+    _write(maven / "com" / "broken" / "broken" / "1.0" / "broken-1.0.pom", "<project")
+
+    return {"npm": [npm], "pypi": [pypi], "crates": [crates], "maven": [maven]}
+
+
+def test_build_and_lookup(tmp_path, exports):
+    """Test that every export kind is indexed under registry-normalized names."""
+    path = tmp_path / "index.sqlite"
+    counts = build_index(path, **exports)
+
+    assert counts == {"npm": 2, "pypi": 2, "cargo": 1, "maven": 1}
+    index = OfflineIndex(path)
+    assert index.lookup("left-pad", "npm") == "https://github.com/stevemao/left-pad.git"
+    assert index.lookup("@babel/core", "npm") == "https://github.com/babel/babel.git"
+    assert index.lookup("flask-login", "pypi") == "https://github.com/maxcountryman/flask-login.git"
+    assert index.lookup("Requests", "pypi") == "https://github.com/psf/requests.git"
+    assert index.lookup("Serde-JSON", "cargo") == "https://github.com/serde-rs/json.git"
+    assert index.lookup("com.google.guava:guava", "maven") == "https://github.com/google/guava.git"
+    assert index.lookup("no-repo", "npm") is None
+    assert index.counts() == {"cargo": 1, "maven": 1, "npm": 2, "pypi": 2}
+    index.close()
+    assert not (tmp_path / "index.sqlite.partial").exists()
+
+
+def test_build_failure_removes_partial_index(tmp_path, exports):
+    """Test that a failed build leaves neither a partial nor a final index behind."""
+    path = tmp_path / "index.sqlite"
+    with pytest.raises(FileNotFoundError):
+        build_index(path, npm=exports["npm"] + [tmp_path / "missing.jsonl"])
+
+    assert not path.exists()
+    assert not (tmp_path / "index.sqlite.partial").exists()
+
+
+def test_newest_maven_version_wins(tmp_path):
+    """Test that the newest POM with an <scm> decides the repository of an artifact."""
+    maven = tmp_path / "maven"
+    for version, repo in (("9.0", "old-home"), ("10.0", "new-home"), ("10.1", None)):
+        scm = f"<scm><url>https://github.com/example/{repo}</url></scm>" if repo else ""
+        _write(
+            maven / "org" / "example" / "lib" / version / f"lib-{version}.pom",
+            f"<project>{scm}</project>",
+        )
+    path = tmp_path / "index.sqlite"
+    build_index(path, maven=[maven])
+
+    index = OfflineIndex(path)
+    assert index.lookup("org.example:lib", "maven") == "https://github.com/example/new-home.git"
+    index.close()
+
+
+async def test_find_repository_url_consults_offline_index_first(tmp_path, exports, monkeypatch):
+    """Test that the offline index answers before any other lookup."""
+    from ossval.analyzers import repo_finder
+
+    async def no_network(*args, **kwargs):
+        raise AssertionError("registry should not be queried")
+
+    path = tmp_path / "index.sqlite"
+    build_index(path, npm=exports["npm"])
+    monkeypatch.setattr(repo_finder, "_find_repo_from_registry", no_network)
+    repo_finder.set_offline_index(OfflineIndex(path))
+    try:
+        url = await repo_finder.find_repository_url("left-pad", "npm", "1.3.0")
+    finally:
+        repo_finder.set_offline_index(None)
+
+    assert url == "https://github.com/stevemao/left-pad.git"
@@ -2,12 +2,124 @@
 
 import pytest
 
-from ossval.analyzers.repo_finder import _normalize_git_url
+from ossval.analyzers.urls import normalize_git_url
 
 
 def test_normalize_git_url():
     """Test git URL normalization."""
-    assert _normalize_git_url("git+https://github.com/user/repo") == "https://github.com/user/repo.git"
-    assert _normalize_git_url("git@github.com:user/repo") == "https://github.com/user/repo.git"
-    assert _normalize_git_url("https://github.com/user/repo.git") == "https://github.com/user/repo.git"
+    assert normalize_git_url("git+https://github.com/user/repo") == "https://github.com/user/repo.git"
+    assert normalize_git_url("git@github.com:user/repo") == "https://github.com/user/repo.git"
+    assert normalize_git_url("https://github.com/user/repo.git") == "https://github.com/user/repo.git"
 
+
+
+def test_read_json_keys_stops_after_wanted_keys():
+    """Test that only wanted top-level members are decoded."""
+    from ossval.analyzers.repo_finder import _read_json_keys
+
+    body = b' { "info" : {"name": "x", "urls": [1, {"a": "}"}]}, "last_serial": 1, "releases": {BROKEN'
+    assert _read_json_keys(body, ("info",)) == {"info": {"name": "x", "urls": [1, {"a": "}"}]}}
+    assert _read_json_keys(b'{"a": 1, "b": [2]}', ("b", "missing")) == {"b": [2]}
+    with pytest.raises(ValueError):
+        _read_json_keys(b"[1, 2]", ("a",))
+
+
+def test_read_json_keys_decodes_only_up_to_wanted_keys():
+    """Test that bytes after the last wanted key are never decoded."""
+    from ossval.analyzers.repo_finder import _read_json_keys
+
+    # Invalid UTF-8 well past the first read chunk would fail a full decode
+    body = (
+        b'{"skip": [' + b"1," * 50_000 + b'1], "info": {"a": 1}, '
+        b'"pad": "' + b"x" * 100_000 + b'", "releases": "' + b"\xff" * 100_000
+    )
+    assert _read_json_keys(body, ("info",)) == {"info": {"a": 1}}
+
+
+def _fake_registry(monkeypatch, documents):
+    """Serve registry documents by URL through a fake cached_get; returns requested URLs."""
+    import json
+
+    import httpx
+
+    from ossval.analyzers import repo_finder
+
+    requested = []
+
+    async def fake_cached_get(url, client=None, **kwargs):
+        requested.append(url)
+        if url not in documents:
+            return httpx.Response(404)
+        return httpx.Response(200, content=json.dumps(documents[url]).encode())
+
+    monkeypatch.setattr(repo_finder, "cached_get", fake_cached_get)
+    return requested
+
+
+async def test_find_pypi_repo_uses_release_document(monkeypatch):
+    """Test that PyPI lookups fetch the release document of a known version."""
+    from ossval.analyzers.repo_finder import _find_pypi_repo
+
+    info = {"project_urls": {"Source": "https://github.com/psf/requests"}}
+    requested = _fake_registry(
+        monkeypatch,
+        {
+            "https://pypi.org/pypi/requests/2.31.0/json": {"info": info, "urls": []},
+            "https://pypi.org/pypi/requests/json": {"info": info, "releases": {}},
+        },
+    )
+
+    assert await _find_pypi_repo("requests", "2.31.0") == "https://github.com/psf/requests.git"
+    assert await _find_pypi_repo("requests", "0.0.0-unknown") == "https://github.com/psf/requests.git"
+    assert requested == [
+        "https://pypi.org/pypi/requests/2.31.0/json",
+        "https://pypi.org/pypi/requests/0.0.0-unknown/json",
+        "https://pypi.org/pypi/requests/json",
+    ]
+
+
+async def test_find_npm_repo_uses_version_document(monkeypatch):
+    """Test that npm lookups fetch one version document, falling back to latest."""
+    from ossval.analyzers.repo_finder import _find_npm_repo
+
+    version = {"name": "left-pad", "repository": {"type": "git", "url": "git+https://github.com/left-pad/left-pad.git"}}
+    requested = _fake_registry(
+        monkeypatch,
+        {
+            "https://registry.npmjs.org/left-pad/1.3.0": version,
+            "https://registry.npmjs.org/left-pad/latest": version,
+        },
+    )
+
+    assert await _find_npm_repo("left-pad", "1.3.0") == "https://github.com/left-pad/left-pad.git"
+    assert await _find_npm_repo("left-pad", "^1.0.0") == "https://github.com/left-pad/left-pad.git"
+    assert await _find_npm_repo("left-pad") == "https://github.com/left-pad/left-pad.git"
+    assert requested == [
+        "https://registry.npmjs.org/left-pad/1.3.0",
+        "https://registry.npmjs.org/left-pad/^1.0.0",
+        "https://registry.npmjs.org/left-pad/latest",
+        "https://registry.npmjs.org/left-pad/latest",
+    ]
+
+
+async def test_artifact_lookups_share_one_client(monkeypatch):
+    """Test that artifact fallbacks in a session reuse the session's client."""
+    from ossval.analyzers import repo_finder
+
+    clients = []
+
+    async def no_registry(*args, **kwargs):
+        return None
+
+    async def fake_resolve_purls(purls, client=None, **kwargs):
+        clients.append(client)
+        return {}
+
+    monkeypatch.setattr(repo_finder, "_find_repo_from_registry", no_registry)
+    monkeypatch.setattr(repo_finder, "resolve_purls", fake_resolve_purls)
+    async with repo_finder.artifact_session():
+        await repo_finder.find_repository_url("left-pad", "npm", "1.3.0")
+        await repo_finder.find_repository_url("is-odd", "npm", "3.0.1")
+
+    assert clients[0] is not None and clients[0] is clients[1]
+    assert clients[0].is_closed
@@ -39,3 +39,368 @@ def test_cache_clear():
     value = cache.get("test_key")
     assert value is None
 
+
+
+def test_cache_key_is_stable():
+    """Test that keys depend only on the content of their inputs."""
+    from ossval.cache import cache_key
+
+    assert cache_key("pypi", "requests", "2.31.0") == cache_key("pypi", "requests", "2.31.0")
+    assert cache_key("pypi", "requests", "2.31.0") != cache_key("pypi", "requests", "2.32.0")
+    assert cache_key({"a": 1, "b": 2}) == cache_key({"b": 2, "a": 1})
+    assert len(cache_key("x")) == 64
+
+
+def test_cache_namespaces_are_isolated(tmp_path):
+    """Test that the same key in different namespaces holds different values."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+
+    cache.set("key", "sloc value", "sloc")
+    cache.set("key", "health value", "health")
+
+    assert cache.get("key", "sloc") == "sloc value"
+    assert cache.get("key", "health") == "health value"
+    assert cache.get("key") is None
+    assert cache.get("missing", "sloc", default="fallback") == "fallback"
+
+
+def test_cache_namespace_policies(tmp_path):
+    """Test per-namespace TTLs and size quotas."""
+    from ossval.cache import CachePolicy
+
+    cache = AnalysisCache(
+        cache_dir=str(tmp_path),
+        ttl_days=30,
+        policies={"health": CachePolicy(ttl_days=2, size_limit=2**20)},
+    )
+
+    assert cache.namespace_ttl("health") == 2 * 24 * 60 * 60
+    assert cache.namespace_ttl("sloc") == 30 * 24 * 60 * 60
+    assert cache.namespace_ttl("registry") == 7 * 24 * 60 * 60
+    assert cache.namespace("health").size_limit == 2**20
+
+
+def test_cache_info_and_clear_cover_namespaces(tmp_path):
+    """Test that info and clear include every namespace."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.set("a", 1)
+    cache.set("b", 2, "registry")
+    cache.set("c", 3, "cost")
+
+    info = cache.info()
+    assert info["count"] == 3
+    assert info["namespaces"]["registry"]["count"] == 1
+
+    cache.clear()
+    assert cache.get("b", "registry") is None
+    assert cache.info()["count"] == 0
+
+
+def test_cache_stats_counts_hits_and_misses(tmp_path):
+    """Test hit/miss counters, latency and bytes saved per namespace."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.set("key", "value", "registry")
+    cache.get("key", "registry")
+    cache.get("other", "registry")
+
+    stats = cache.stats(session=True)["registry"]
+
+    assert (stats["hits"], stats["misses"], stats["sets"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+    assert stats["bytes_saved"] == len('"value"')
+    assert stats["avg_get_ms"] >= 0
+
+
+def test_cache_stats_persist_across_instances(tmp_path):
+    """Test that flushed counters are visible to later cache instances."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.get("missing", "health")
+    cache.flush()
+    cache.close()
+
+    reopened = AnalysisCache(cache_dir=str(tmp_path))
+    reopened.get("missing", "health")
+
+    assert reopened.stats()["health"]["misses"] == 2
+    assert reopened.stats(session=True)["health"]["misses"] == 1
+    assert reopened.info()["stats"]["health"]["misses"] == 2
+
+
+def test_cache_stats_count_evictions_and_expirations(tmp_path):
+    """Test that maintenance counts expired and evicted entries."""
+    from ossval.cache import CachePolicy
+
+    cache = AnalysisCache(
+        cache_dir=str(tmp_path),
+        policies={
+            "sloc": CachePolicy(size_limit=300_000),
+            "health": CachePolicy(ttl_days=-1),
+        },
+    )
+    for i in range(50):
+        cache.set(str(i), "x" * 10_000, "sloc")
+    cache.set("stale", "value", "health")
+
+    cache.flush()
+    stats = cache.stats()
+
+    assert stats["sloc"]["evictions"] > 0
+    assert stats["health"]["expirations"] == 1
+
+
+def test_memory_tier_serves_repeated_lookups(tmp_path):
+    """Test that a value read from disk is served from memory on the next lookup."""
+    AnalysisCache(cache_dir=str(tmp_path)).set("key", {"url": "x"}, "registry")
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.memory.clear()
+
+    assert cache.get("key", "registry") == {"url": "x"}
+    assert cache.get("key", "registry") == {"url": "x"}
+
+    stats = cache.stats(session=True)["registry"]
+    assert (stats["hits"], stats["memory_hits"], stats["disk_hits"]) == (2, 1, 1)
+
+
+def test_memory_tier_is_write_through(tmp_path):
+    """Test that writes reach the disk tier as well as memory."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    cache.set("key", "value", "sloc")
+    cache.memory.clear()
+
+    assert cache.get("key", "sloc") == "value"
+    assert cache.stats(session=True)["sloc"]["disk_hits"] == 1
+
+
+def test_memory_tier_lru_limits():
+    """Test eviction of least recently used entries by count and by bytes."""
+    from ossval.cache import MemoryTier
+
+    tier = MemoryTier(max_entries=2, max_bytes=100)
+    tier.set(None, "a", 1, None, 10)
+    tier.set(None, "b", 2, None, 10)
+    tier.get(None, "a")
+    assert tier.set(None, "c", 3, None, 10) == 1
+    assert tier.get(None, "b")[1] == 0
+    assert tier.get(None, "a") == (1, 10, None)
+
+    assert tier.set(None, "big", 4, None, 95) == 2
+    assert len(tier) == 1
+    assert tier.set(None, "huge", 5, None, 101) == 0
+    assert tier.get(None, "huge")[1] == 0
+
+
+def test_memory_tier_honors_expiry():
+    """Test that expired memory entries are not returned."""
+    import time
+
+    from ossval.cache import MemoryTier
+
+    tier = MemoryTier()
+    tier.set("health", "key", "value", time.time() - 1, 5)
+
+    assert tier.get("health", "key")[1] == 0
+    assert len(tier) == 0
+
+
+def test_cache_bundle_round_trip(tmp_path):
+    """Test exporting namespaces and importing them into an empty cache."""
+    source = AnalysisCache(cache_dir=str(tmp_path / "a"))
+    source.set("k1", {"code_lines": 10}, "sloc")
+    source.set("k2", "https://github.com/a/b", "registry")
+    bundle = str(tmp_path / "cache.tar.gz")
+
+    counts = source.export_bundle(bundle, ["sloc", "registry"])
+    target = AnalysisCache(cache_dir=str(tmp_path / "b"))
+    results = target.import_bundle(bundle)
+
+    assert counts == {"sloc": {"exported": 1, "skipped": 0}, "registry": {"exported": 1, "skipped": 0}}
+    assert results["sloc"]["imported"] == 1
+    assert target.get("k1", "sloc") == {"code_lines": 10}
+    assert target.get("k2", "registry") == "https://github.com/a/b"
+
+
+def test_cache_bundle_round_trips_bytes_and_reports_skipped(tmp_path):
+    """Test that bytes values survive a bundle and unserializable values are counted."""
+    source = AnalysisCache(cache_dir=str(tmp_path / "a"))
+    source.set("page", {"headers": {"etag": "x"}, "body": b"\x00{binary}"}, "http")
+    source.set("raw", b"body", "http")
+    source.set("odd", {1, 2}, "http")
+    bundle = str(tmp_path / "cache.tar.gz")
+
+    counts = source.export_bundle(bundle, ["http"])
+    target = AnalysisCache(cache_dir=str(tmp_path / "b"))
+    target.import_bundle(bundle)
+
+    assert counts == {"http": {"exported": 2, "skipped": 1}}
+    assert target.get("page", "http") == {"headers": {"etag": "x"}, "body": b"\x00{binary}"}
+    assert target.get("raw", "http") == b"body"
+
+
+def test_cache_bundle_merge_keeps_newer_entries(tmp_path):
+    """Test that import resolves conflicts by store time."""
+    source = AnalysisCache(cache_dir=str(tmp_path / "a"))
+    source.set("old", "from bundle", "registry")
+    source.set("new", "from bundle", "registry")
+    bundle = str(tmp_path / "cache.tar.gz")
+
+    target = AnalysisCache(cache_dir=str(tmp_path / "b"))
+    target.set("old", "local", "registry")
+    source.set("new", "from bundle, updated", "registry")
+    source.export_bundle(bundle, ["registry"])
+
+    results = target.import_bundle(bundle)
+
+    assert results["registry"] == {"imported": 1, "kept": 1, "expired": 0}
+    assert target.get("old", "registry") == "local"
+    assert target.get("new", "registry") == "from bundle, updated"
+
+
+def test_cache_bundle_integrity_check(tmp_path):
+    """Test that a bundle whose contents do not match the manifest is rejected."""
+    import io
+    import json
+    import tarfile
+
+    import pytest
+
+    bundle = tmp_path / "bad.tar.gz"
+    manifest = {
+        "format": "ossval-cache-bundle",
+        "version": 1,
+        "namespaces": {"sloc": {"file": "namespaces/sloc.jsonl", "entries": 1, "sha256": "0" * 64}},
+    }
+    with tarfile.open(bundle, "w:gz") as archive:
+        for name, data in (
+            ("manifest.json", json.dumps(manifest).encode()),
+            ("namespaces/sloc.jsonl", b'{"key":"k","value":1,"stored_at":0,"expire_at":null}\n'),
+        ):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+
+    cache = AnalysisCache(cache_dir=str(tmp_path / "cache"))
+    with pytest.raises(ValueError, match="checksum"):
+        cache.import_bundle(str(bundle))
+    assert cache.get("k", "sloc") is None
+
+    with pytest.raises(ValueError, match="Not a cache bundle"):
+        cache.import_bundle(str(tmp_path / "cache" / "cache.db"))
+
+
+def test_cache_bundle_rejects_malformed_entries(tmp_path):
+    """Test that a bundle with a malformed entry raises ValueError and imports nothing."""
+    import hashlib
+    import io
+    import json
+    import tarfile
+
+    import pytest
+
+    for number, lines in enumerate((
+        b'{"key":"k","value":1,"stored_at":0,"expire_at":null}\n{"key":"j","stored_at":0}\n',
+        b'{"key":"k","value":1,"stored_at":"yesterday","expire_at":null}\n',
+        b'[1, 2]\n',
+        b'{"key":"k",\n',
+    )):
+        bundle = tmp_path / f"bad{number}.tar.gz"
+        manifest = {
+            "format": "ossval-cache-bundle",
+            "version": 1,
+            "namespaces": {
+                "sloc": {
+                    "file": "namespaces/sloc.jsonl",
+                    "entries": 1,
+                    "sha256": hashlib.sha256(lines).hexdigest(),
+                }
+            },
+        }
+        with tarfile.open(bundle, "w:gz") as archive:
+            for name, data in (
+                ("manifest.json", json.dumps(manifest).encode()),
+                ("namespaces/sloc.jsonl", lines),
+            ):
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+
+        cache = AnalysisCache(cache_dir=str(tmp_path / "cache"))
+        with pytest.raises(ValueError, match="corrupt"):
+            cache.import_bundle(str(bundle))
+        assert cache.get("k", "sloc") is None
+
+
+def _make_legacy_file(cache_dir):
+    """Create a legacy SLOC JSON file."""
+    legacy = cache_dir / "sloc" / ("0" * 32)
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text('{"total": 1}')
+    return legacy
+
+
+def test_cache_disk_usage_and_clear_cover_legacy_files(tmp_path):
+    """Test that legacy metric files are counted and cleared."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    legacy = _make_legacy_file(tmp_path)
+    unrelated = tmp_path / "sloc" / "notes.txt"
+    unrelated.write_text("keep")
+
+    usage = cache.disk_usage()
+    assert usage["legacy"] == legacy.stat().st_size
+    assert usage["total"] >= usage["entries"] + usage["legacy"]
+
+    cache.clear()
+    assert not legacy.exists()
+    assert unrelated.exists()
+
+
+def test_cache_gc_age_target(tmp_path):
+    """Test that gc removes legacy files, and entries stored before the age target."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    legacy = _make_legacy_file(tmp_path)
+    cache.set("recent", 1, "sloc")
+
+    result = cache.gc(max_age_days=365)
+    assert result["removed_files"] == 1
+    assert not legacy.exists()
+    assert cache.get("recent", "sloc") == 1
+
+    # Reading an entry does not renew it: age counts from when it was stored
+    result = cache.gc(max_age_days=0)
+    assert result["removed_entries"] == 1
+    assert cache.get("recent", "sloc") is None
+
+
+def test_cache_gc_size_target_evicts_least_recently_used(tmp_path):
+    """Test that gc evicts least recently used entries down to the size target."""
+    cache = AnalysisCache(cache_dir=str(tmp_path), memory_entries=0)
+    for index in range(40):
+        cache.set(f"key{index}", "x" * 20_000, "sloc")
+    # Reading an early entry makes it recently used
+    assert cache.get("key0", "sloc") is not None
+
+    result = cache.gc(max_bytes=cache.disk_usage()["total"])
+    assert result["removed_entries"] == 0
+
+    target = cache.disk_usage()["total"] - 200_000
+    result = cache.gc(max_bytes=target)
+    assert result["removed_entries"] > 0
+    assert result["size_after"] <= result["size_before"]
+    assert cache.get("key0", "sloc") is not None
+    assert cache.get("key1", "sloc") is None
+    assert cache.get("key39", "sloc") is not None
+    assert cache.stats()["sloc"]["evictions"] == result["removed_entries"]
+
+
+def test_cache_gc_lock(tmp_path):
+    """Test that only one process collects a cache directory at a time."""
+    from ossval.cache import GC_LOCK_KEY
+
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    other = AnalysisCache(cache_dir=str(tmp_path))
+    other._stats_store().add(GC_LOCK_KEY, 0)
+    assert cache.gc() is None
+
+    other._stats_store().delete(GC_LOCK_KEY)
+    assert cache.gc() is not None
+    assert GC_LOCK_KEY not in other._stats_store()
+    assert "ossval" not in cache.stats()
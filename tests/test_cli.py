@@ -47,3 +47,173 @@ def test_cli_formats():
     assert result.exit_code == 0
     assert "Supported" in result.output
 
+
+
+def _make_git_repo(path):
+    """Create a one-commit git repository with a Python module."""
+    import subprocess
+
+    path.mkdir()
+    (path / "mod.py").write_text("def add(a, b):\n    return a + b\n")
+    for args in (
+        ["init"],
+        ["add", "."],
+        ["-c", "user.email=t@example.com", "-c", "user.name=T", "commit", "-m", "init"],
+    ):
+        subprocess.run(["git", *args], cwd=path, check=True, capture_output=True)
+
+
+def test_cli_cache_warm(tmp_path):
+    """Test that cache warm computes metrics into the cache without a report."""
+    import json
+
+    from ossval.cache import AnalysisCache, cache_key
+
+    repo = tmp_path / "repo"
+    _make_git_repo(repo)
+    sbom = tmp_path / "bom.json"
+    sbom.write_text(json.dumps({
+        "bomFormat": "CycloneDX",
+        "specVersion": "1.4",
+        "components": [{
+            "type": "library",
+            "name": "repo",
+            "version": "1.0.0",
+            "externalReferences": [{"type": "vcs", "url": str(repo)}],
+        }],
+    }))
+    cache_dir = tmp_path / "cache"
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["cache", "warm", str(sbom), "--cache-dir", str(cache_dir)])
+
+    assert result.exit_code == 0, result.output
+    assert "Cached 1/1 repositories for 1 packages" in result.output
+    cache = AnalysisCache(cache_dir=str(cache_dir))
+    cache.memory.clear()
+    assert cache.get(cache_key(str(repo)), "sloc")["code_lines"] == 2
+
+
+def test_cli_cache_warm_reports_malformed_sbom(tmp_path):
+    """Test that a truncated SBOM fails with a message instead of a traceback."""
+    sbom = tmp_path / "bom.xml"
+    sbom.write_text(
+        '<?xml version="1.0"?><bom xmlns="http://cyclonedx.org/schema/bom/1.4"><components>'
+        '<component type="library"><name>a</name></component><component type="lib'
+    )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        main, ["cache", "warm", str(sbom), "--cache-dir", str(tmp_path / "cache"), "--quiet"]
+    )
+
+    assert result.exit_code == 1
+    assert "Error: Failed to parse" in result.output
+    assert result.exception is None or isinstance(result.exception, SystemExit)
+
+
+def test_cli_cache_warm_shares_analysis_options(tmp_path, monkeypatch):
+    """Test that cache warm builds its config from the same options as analyze."""
+    from ossval import cli
+
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests==2.31.0\n")
+    configs = {}
+
+    async def fake_analyze(filepath, config):
+        configs["analyze"] = config
+        raise SystemExit(0)
+
+    async def fake_warm_cache(filepath, config, progress=None):
+        configs["warm"] = config
+        return {"packages": 0, "resolved": 0, "analyzed": 0, "failed": 0}
+
+    monkeypatch.setattr(cli, "analyze", fake_analyze)
+    monkeypatch.setattr(cli, "warm_cache", fake_warm_cache)
+    options = [
+        "--region", "us_sf", "--no-local-metadata", "--halstead-sample", "50",
+        "--max-file-bytes", "100000", "--repo-timeout", "60", "--methodology", "sloccount",
+        "--cache-max-bytes", "1000000",
+    ]
+    runner = CliRunner()
+    runner.invoke(main, ["analyze", str(requirements), *options])
+    result = runner.invoke(main, ["cache", "warm", str(requirements), "--quiet", *options])
+
+    assert result.exit_code == 0, result.output
+    fields = (
+        "region", "local_metadata", "halstead_sample_files", "max_file_bytes", "repo_timeout",
+        "methodology", "cache_max_bytes",
+    )
+    for field in fields:
+        assert getattr(configs["warm"], field) == getattr(configs["analyze"], field)
+    assert configs["warm"].halstead_sample_files == 50
+    assert configs["warm"].local_metadata is False
+    assert configs["warm"].cache_max_bytes == 1000000
+
+
+def test_cli_cache_export_import(tmp_path):
+    """Test cache export and import commands."""
+    from ossval.cache import AnalysisCache
+
+    AnalysisCache(cache_dir=str(tmp_path / "a")).set("key", "value", "registry")
+    bundle = str(tmp_path / "bundle.tar.gz")
+
+    runner = CliRunner()
+    exported = runner.invoke(
+        main, ["cache", "export", bundle, "--cache-dir", str(tmp_path / "a"), "-n", "registry"]
+    )
+    imported = runner.invoke(main, ["cache", "import", bundle, "--cache-dir", str(tmp_path / "b")])
+
+    assert exported.exit_code == 0, exported.output
+    assert "Exported 1 entries" in exported.output
+    assert imported.exit_code == 0, imported.output
+    assert "Imported 1 entries" in imported.output
+
+
+def test_cli_cache_gc(tmp_path):
+    """Test the cache gc command."""
+    legacy = tmp_path / "sloc" / ("a" * 32)
+    legacy.parent.mkdir()
+    legacy.write_text("{}")
+
+    runner = CliRunner()
+    result = runner.invoke(main, ["cache", "gc", "--cache-dir", str(tmp_path), "--max-age-days", "30"])
+
+    assert result.exit_code == 0, result.output
+    assert "1 files" in result.output
+    assert not legacy.exists()
+
+
+def test_cli_rate_limit_option(tmp_path):
+    """Test parsing of --rate-limit HOST=RPS values."""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("requests==2.31.0\n")
+    result = CliRunner().invoke(main, ["analyze", str(requirements), "--rate-limit", "crates.io"])
+    assert result.exit_code == 2
+    assert "HOST=RPS" in result.output
+
+    from ossval.cli import _parse_rate_limits
+
+    assert _parse_rate_limits(None, None, ("crates.io=0.5", "PyPI.org=5")) == {
+        "crates.io": 0.5,
+        "pypi.org": 5.0,
+    }
+
+
+def test_cli_index_build_and_info(tmp_path):
+    """Test building an offline index and showing its counts."""
+    npm = tmp_path / "npm.jsonl"
+    npm.write_text('{"name": "left-pad", "repository": "stevemao/left-pad"}\n')
+    index = tmp_path / "index.sqlite"
+    runner = CliRunner()
+
+    result = runner.invoke(main, ["index", "build", "--npm", str(npm), "-o", str(index)])
+    assert result.exit_code == 0, result.output
+    assert "npm: 1 packages" in result.output
+
+    result = runner.invoke(main, ["index", "info", str(index)])
+    assert result.exit_code == 0, result.output
+    assert "npm: 1 packages" in result.output
+
+    result = runner.invoke(main, ["index", "build", "-o", str(index)])
+    assert result.exit_code == 2
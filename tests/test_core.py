@@ -57,3 +57,242 @@ async def test_analyze_package_list():
     assert len(result.packages) == 2
     assert result.packages[0].name == "requests"
 
+
+
+def test_skip_warnings():
+    """Test that analysis limit skips become package warnings with counts."""
+    from ossval.core import _skip_warnings
+
+    config = AnalysisConfig(max_file_bytes=1000, file_timeout=5, repo_timeout=60)
+    warnings = _skip_warnings({"size": 2, "timeout": 1, "budget": 7}, config)
+
+    assert warnings == [
+        "Skipped 2 files larger than 1000 bytes",
+        "Skipped 1 files that exceeded the 5.0s per-file time limit",
+        "Repository time budget of 60.0s exhausted; 7 files not analyzed",
+    ]
+    assert _skip_warnings({}, config) == []
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_reports_progress(tmp_path):
+    """Test that warm_cache calls the progress callback once per package."""
+    from ossval.core import warm_cache
+    from ossval.models import Package
+
+    packages = [
+        Package(name="a", repository_url=str(tmp_path / "missing-a")),
+        Package(name="b", repository_url=str(tmp_path / "missing-b")),
+    ]
+    seen = []
+
+    counts = await warm_cache(
+        packages, AnalysisConfig(cache_dir=str(tmp_path / "cache")), progress=seen.append
+    )
+
+    assert sorted(p.name for p in seen) == ["a", "b"]
+    assert counts == {"packages": 2, "resolved": 2, "analyzed": 0, "failed": 0}
+
+
+
+@pytest.mark.asyncio
+async def test_warm_cache_streams_sbom_packages(tmp_path, monkeypatch):
+    """Test that packages of a streamed SBOM are analyzed before parsing finishes."""
+    import json
+
+    from ossval import core
+    from ossval.core import warm_cache
+
+    sbom = tmp_path / "bom.json"
+    sbom.write_text(
+        json.dumps(
+            {
+                "bomFormat": "CycloneDX",
+                "components": [
+                    {"type": "library", "name": f"pkg-{i}", "purl": f"pkg:pypi/pkg-{i}@1.0"}
+                    for i in range(3)
+                ],
+            }
+        )
+    )
+    events = []
+    iter_sbom = core.iter_sbom
+
+    def recording_iter_sbom(filepath, result=None):
+        for package in iter_sbom(filepath, result):
+            events.append(("parsed", package.name))
+            yield package
+
+    async def fake_analyze(pkg, config, cache=None, refreshes=None):
+        events.append(("analyzed", pkg.name))
+        return pkg
+
+    async def fake_health(pkg, *args):
+        return None
+
+    monkeypatch.setattr(core, "iter_sbom", recording_iter_sbom)
+    monkeypatch.setattr(core, "_analyze_package", fake_analyze)
+    monkeypatch.setattr(core, "_analyze_package_health", fake_health)
+
+    counts = await warm_cache(str(sbom), AnalysisConfig(cache_dir=str(tmp_path / "cache")))
+
+    assert counts["packages"] == 3
+    assert events.index(("analyzed", "pkg-0")) < events.index(("parsed", "pkg-2"))
+
+async def test_analyze_streams_sbom_and_reports_parse_errors(tmp_path):
+    """Test that analyze reads the SBOM through iter_sbom and keeps packages before an error."""
+    sbom = tmp_path / "bom.xml"
+    sbom.write_text(
+        '<?xml version="1.0"?><bom xmlns="http://cyclonedx.org/schema/bom/1.4"><components>'
+        '<component type="library"><name>a</name></component><component type="lib'
+    )
+    config = AnalysisConfig(clone_repos=False, use_cache=False)
+
+    result = await analyze(str(sbom), config)
+
+    assert [p.name for p in result.packages] == ["a"]
+    assert result.meta["source_type"] == "cyclonedx"
+    assert len(result.errors) == 1 and result.errors[0].startswith("Failed to parse")
+
+    unknown = tmp_path / "unknown.bin"
+    unknown.write_bytes(b"\x00\x01")
+    missing = await analyze(str(unknown), config)
+    assert missing.errors and "No parser found" in missing.errors[0]
+
+
+def _store_stale(cache_dir, namespace, key, value, age_days):
+    """Write a cache entry that was stored ``age_days`` ago."""
+    import time
+
+    from ossval.cache import AnalysisCache
+
+    cache = AnalysisCache(cache_dir=cache_dir)
+    cache.namespace(namespace).set(key, value, expire=60, tag=time.time() - age_days * 86400)
+    cache.memory.clear()
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_analyze_serves_stale_registry_entry_and_refreshes(tmp_path, monkeypatch):
+    """Test stale-while-revalidate for registry lookups."""
+    from ossval.cache import AnalysisCache, cache_key
+    from ossval.models import Package
+
+    cache_dir = str(tmp_path / "cache")
+    key = cache_key("pypi", "demo", "1.0")
+    _store_stale(cache_dir, "registry", key, "https://github.com/old/demo", age_days=8)
+
+    calls = []
+
+    async def fake_find(name, ecosystem, version=None):
+        calls.append(name)
+        return "https://github.com/new/demo"
+
+    monkeypatch.setattr("ossval.core.find_repository_url", fake_find)
+    config = AnalysisConfig(cache_dir=cache_dir, clone_repos=False)
+
+    result = await analyze([Package(name="demo", version="1.0", ecosystem="pypi")], config)
+
+    package = result.packages[0]
+    assert package.repository_url == "https://github.com/old/demo"
+    assert package.freshness["registry"] == "stale"
+    # Refreshed in the background before the run ended
+    assert calls == ["demo"]
+    cache = AnalysisCache(cache_dir=cache_dir)
+    assert cache.lookup(key, "registry") == ("https://github.com/new/demo", "fresh")
+
+
+@pytest.mark.asyncio
+async def test_cached_fetch_revalidates_without_background_refresh(tmp_path):
+    """Test that stale entries are refetched synchronously when no refresh set is given."""
+    from ossval.cache import AnalysisCache
+    from ossval.core import _cached_fetch
+
+    _store_stale(str(tmp_path), "health", "k", {"stars": 1}, age_days=2)
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+
+    async def fetch():
+        return {"stars": 2}
+
+    async def failing_fetch():
+        return None
+
+    assert await _cached_fetch(cache, "health", "k", fetch) == ({"stars": 2}, "live")
+    assert await _cached_fetch(cache, "health", "k", failing_fetch) == ({"stars": 2}, "fresh")
+
+    _store_stale(str(tmp_path), "health", "old", {"stars": 1}, age_days=2)
+    assert await _cached_fetch(cache, "health", "old", failing_fetch) == ({"stars": 1}, "stale")
+
+
+def test_auto_gc_runs_only_over_quota(tmp_path):
+    """Test that the end-of-run gc only collects a cache over its quota."""
+    from ossval.cache import AnalysisCache
+    from ossval.core import _auto_gc
+
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    legacy = tmp_path / "sloc" / ("0" * 32)
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text('{"total": 1}')
+    size = cache.disk_usage()["total"]
+
+    _auto_gc(cache, AnalysisConfig(cache_dir=str(tmp_path)))
+    _auto_gc(cache, AnalysisConfig(cache_dir=str(tmp_path), cache_max_bytes=size))
+    assert legacy.exists()
+
+    _auto_gc(cache, AnalysisConfig(cache_dir=str(tmp_path), cache_max_bytes=size - 1))
+    assert not legacy.exists()
+
+
+async def test_rate_limited_health_is_deferred(monkeypatch):
+    """Test that a rate-limited health lookup is marked deferred with a warning."""
+    import time
+
+    from ossval import core
+    from ossval.http_client import RateLimitExceededError
+    from ossval.models import FetchStatus, Package
+
+    async def limited(*args, **kwargs):
+        raise RateLimitExceededError(time.time() + 600)
+
+    monkeypatch.setattr(core, "analyze_health", limited)
+    package = Package(name="requests", repository_url="https://github.com/psf/requests")
+
+    await core._analyze_package_health(package, AnalysisConfig(use_cache=False))
+
+    assert package.health is None
+    assert package.health_status == FetchStatus.DEFERRED
+    assert any("deferred" in warning for warning in package.warnings)
+
+
+async def test_duplicate_packages_share_lookups(monkeypatch):
+    """Test that packages resolving to one repository share registry, code and health work."""
+    from ossval import core
+    from ossval.models import HealthMetrics, Package
+
+    calls = {"registry": 0, "code": 0, "health": 0}
+
+    async def fake_find(name, ecosystem, version):
+        calls["registry"] += 1
+        await asyncio.sleep(0.01)
+        return "https://github.com/psf/requests"
+
+    async def fake_code(repository_url, config, cache):
+        calls["code"] += 1
+        await asyncio.sleep(0.01)
+        return {"sloc": None, "halstead": None, "complexity": None, "freshness": {}, "warnings": []}
+
+    async def fake_health(repository_url, github_token=None, token_pool=None):
+        calls["health"] += 1
+        await asyncio.sleep(0.01)
+        return HealthMetrics(stars=1)
+
+    monkeypatch.setattr(core, "find_repository_url", fake_find)
+    monkeypatch.setattr(core, "_compute_repository_code", fake_code)
+    monkeypatch.setattr(core, "analyze_health", fake_health)
+
+    packages = [Package(name="requests", ecosystem="pypi", version="2.31.0") for _ in range(3)]
+    config = AnalysisConfig(use_cache=False, concurrency=3)
+    analyzed = await core._analyze_packages_parallel(packages, config)
+
+    assert calls == {"registry": 1, "code": 1, "health": 1}
+    assert all(p.health and p.health.stars == 1 for p in analyzed)
@@ -0,0 +1,232 @@
+"""Tests for the conditional-request HTTP cache."""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import httpx
+import pytest
+
+from ossval.cache import AnalysisCache
+from ossval.http_client import cached_get, set_http_cache
+
+
+class _ValidatorStub(BaseHTTPRequestHandler):
+    """Serves /etag and /modified with validators and answers revalidations with 304."""
+
+    requests = []
+
+    def do_GET(self):
+        type(self).requests.append(dict(self.headers))
+        if self.path.startswith("/etag"):
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.send_header("ETag", '"v1"')
+                self.end_headers()
+                return
+            validator = ("ETag", '"v1"')
+        elif self.path.startswith("/modified"):
+            if self.headers.get("If-Modified-Since") == "Wed, 01 Jan 2025 00:00:00 GMT":
+                self.send_response(304)
+                self.end_headers()
+                return
+            validator = ("Last-Modified", "Wed, 01 Jan 2025 00:00:00 GMT")
+        else:
+            validator = None
+
+        body = b'{"name": "requests"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if validator:
+            self.send_header(*validator)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def base_url():
+    """Run a local server that supports conditional requests."""
+    _ValidatorStub.requests = []
+    server = HTTPServer(("127.0.0.1", 0), _ValidatorStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    set_http_cache(None)
+
+
+@pytest.mark.parametrize("path", ["/etag", "/modified"])
+async def test_cached_get_revalidates(tmp_path, base_url, path):
+    """Test that a stored response is revalidated and served on 304."""
+    cache = AnalysisCache(cache_dir=str(tmp_path))
+    set_http_cache(cache)
+
+    first = await cached_get(base_url + path, headers={"Authorization": "token a"})
+    second = await cached_get(base_url + path, headers={"Authorization": "token b"})
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.json() == {"name": "requests"}
+    assert "If-None-Match" not in _ValidatorStub.requests[0]
+    assert (
+        "If-None-Match" in _ValidatorStub.requests[1]
+        or "If-Modified-Since" in _ValidatorStub.requests[1]
+    )
+    assert cache.stats(session=True)["http"]["revalidations"] == 1
+
+
+async def test_cached_get_without_validators_or_cache(tmp_path, base_url):
+    """Test that responses without validators, or without a cache, are not stored."""
+    set_http_cache(AnalysisCache(cache_dir=str(tmp_path)))
+    await cached_get(base_url + "/plain")
+    await cached_get(base_url + "/plain")
+
+    set_http_cache(None)
+    await cached_get(base_url + "/etag")
+    await cached_get(base_url + "/etag")
+
+    assert all(
+        "If-None-Match" not in headers and "If-Modified-Since" not in headers
+        for headers in _ValidatorStub.requests
+    )
+
+
+def _response(status, **headers):
+    """Build a response with rate-limit headers."""
+    return httpx.Response(status, headers={k.replace("_", "-"): v for k, v in headers.items()})
+
+
+async def test_token_pool_rotates_on_rate_limit():
+    """Test that a rate-limited token is blocked and the request retried on another."""
+    from ossval.http_client import TokenPool
+
+    sent = []
+    reset = str(int(time.time()) + 3600)
+
+    async def send(token):
+        sent.append(token)
+        if token == "a":
+            return _response(403, x_ratelimit_remaining="0", x_ratelimit_reset=reset)
+        return _response(200, x_ratelimit_remaining="4999", x_ratelimit_reset=reset)
+
+    pool = TokenPool(["a", "b"], base_delay=0.01)
+    assert (await pool.request(send)).status_code == 200
+    assert (await pool.request(send)).status_code == 200
+    assert sent == ["a", "b", "b"]
+
+
+async def test_token_pool_prefers_token_with_most_remaining():
+    """Test that requests go to the token with the most requests left."""
+    from ossval.http_client import TokenPool
+
+    reset = str(int(time.time()) + 3600)
+    remaining = {"a": "10", "b": "500"}
+    sent = []
+
+    async def send(token):
+        sent.append(token)
+        return _response(200, x_ratelimit_remaining=remaining[token], x_ratelimit_reset=reset)
+
+    pool = TokenPool(["a", "b"])
+    for _ in range(3):
+        await pool.request(send)
+    assert sent == ["a", "b", "b"]
+
+
+async def test_token_pool_raises_when_wait_exceeds_limit():
+    """Test that a long rate-limit wait raises instead of blocking."""
+    from ossval.http_client import RateLimitExceededError, TokenPool
+
+    async def send(token):
+        return _response(429, retry_after="600")
+
+    pool = TokenPool([], max_wait=1, base_delay=0.01)
+    with pytest.raises(RateLimitExceededError) as excinfo:
+        await pool.request(send)
+    assert excinfo.value.reset_at > time.time() + 500
+
+
+async def test_token_pool_waits_for_short_retry_after():
+    """Test that a short Retry-After is waited out and the request retried."""
+    from ossval.http_client import TokenPool
+
+    responses = [_response(429, retry_after="0"), _response(200)]
+
+    async def send(token):
+        return responses.pop(0)
+
+    pool = TokenPool(["a"], base_delay=0.01)
+    assert (await pool.request(send)).status_code == 200
+    assert responses == []
+
+
+async def test_token_pool_detects_secondary_rate_limit():
+    """Test that a 403 secondary rate limit with quota left blocks the token."""
+    from ossval.http_client import TokenPool, _is_rate_limited
+
+    reset = str(int(time.time()) + 3600)
+    secondary = httpx.Response(
+        403,
+        headers={"x-ratelimit-remaining": "4000", "x-ratelimit-reset": reset},
+        json={"message": "You have exceeded a secondary rate limit. Please wait a few minutes."},
+    )
+    forbidden = httpx.Response(
+        403, headers={"x-ratelimit-remaining": "4000"}, json={"message": "Resource not accessible"}
+    )
+    assert _is_rate_limited(secondary)
+    assert not _is_rate_limited(forbidden)
+
+    sent = []
+
+    async def send(token):
+        sent.append(token)
+        if token == "a":
+            return secondary
+        return _response(200, x_ratelimit_remaining="4999", x_ratelimit_reset=reset)
+
+    pool = TokenPool(["a", "b"], base_delay=0.01)
+    assert (await pool.request(send)).status_code == 200
+    assert (await pool.request(send)).status_code == 200
+    assert sent == ["a", "b", "b"]
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    """Test that a bucket allows a burst, then one request per 1/rate seconds."""
+    from ossval.http_client import TokenBucket
+
+    bucket = TokenBucket(rate=2.0, burst=2)
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.5, abs=0.05)
+    assert delays[3] == pytest.approx(1.0, abs=0.05)
+
+
+async def test_throttle_limits_each_host_independently():
+    """Test that a slow host does not hold back requests to other hosts."""
+    from ossval.http_client import set_host_rate_limits, throttle
+
+    set_host_rate_limits({"slow.example": 20.0, "fast.example": 1000.0, "crates.io": 0})
+    try:
+        start = time.monotonic()
+        await asyncio.gather(
+            *(throttle("https://slow.example/a") for _ in range(25)),
+            *(throttle("https://crates.io/api/v1/crates/serde") for _ in range(5)),
+        )
+        slow_elapsed = time.monotonic() - start
+
+        start = time.monotonic()
+        await asyncio.gather(*(throttle("https://fast.example/a") for _ in range(25)))
+        fast_elapsed = time.monotonic() - start
+    finally:
+        set_host_rate_limits()
+
+    # 20 burst requests pass at once, the other 5 are spaced 50 ms apart
+    assert 0.2 <= slow_elapsed < 1.0
+    assert fast_elapsed < 0.1
@@ -60,3 +60,84 @@ def test_parse_cyclonedx_json(tmp_path):
     assert result.packages[0].name == "requests"
     assert result.packages[0].ecosystem == "pypi"
 
+
+
+def test_parse_cyclonedx_json_streams_nested_components(tmp_path):
+    """Test that nested components are included and other sections are skipped."""
+    parser = CycloneDXParser()
+
+    test_file = tmp_path / "sbom.json"
+    data = {
+        "bomFormat": "CycloneDX",
+        "metadata": {"component": {"type": "library", "name": "subject"}},
+        "dependencies": [{"ref": f"pkg:npm/dep-{i}", "dependsOn": []} for i in range(5000)],
+        "components": [
+            {
+                "type": "application",
+                "name": "my-app",
+                "components": [
+                    {
+                        "type": "library",
+                        "name": "lodash",
+                        "version": "v4.17.21",
+                        "purl": "pkg:npm/lodash@4.17.21",
+                        "externalReferences": [
+                            {"type": "website", "url": "https://lodash.com"},
+                            {"type": "vcs", "url": "https://github.com/lodash/lodash"},
+                        ],
+                    }
+                ],
+            },
+            {"type": "library", "name": "serde", "purl": "pkg:cargo/serde@1.0.0"},
+        ],
+        "vulnerabilities": [{"id": "CVE-0000-0000"}],
+    }
+    test_file.write_text(json.dumps(data))
+
+    with open(test_file, "rb") as f:
+        packages = parser.iter_packages(str(test_file), f)
+        first = next(packages)
+        assert first.name == "lodash"
+        assert first.version == "4.17.21"
+        assert first.ecosystem == "npm"
+        assert first.repository_url == "https://github.com/lodash/lodash"
+        assert [p.name for p in packages] == ["serde"]
+
+
+def test_parse_cyclonedx_xml_incrementally(tmp_path):
+    """Test XML components, including namespaced and nested ones, but not metadata."""
+    parser = CycloneDXParser()
+
+    test_file = tmp_path / "bom.xml"
+    test_file.write_text(
+        """<?xml version="1.0" encoding="UTF-8"?>
+<bom xmlns="http://cyclonedx.org/schema/bom/1.5" version="1">
+  <metadata>
+    <component type="application"><name>subject</name></component>
+  </metadata>
+  <components>
+    <component type="library">
+      <name>requests</name>
+      <version>2.31.0</version>
+      <purl>pkg:pypi/requests@2.31.0</purl>
+      <externalReferences>
+        <reference type="vcs"><url>https://github.com/psf/requests</url></reference>
+      </externalReferences>
+      <components>
+        <component type="library"><name>urllib3</name><purl>pkg:pypi/urllib3@2.0.0</purl></component>
+      </components>
+    </component>
+    <component type="framework"><name>django</name></component>
+  </components>
+</bom>
+"""
+    )
+
+    result = parser.parse(str(test_file))
+
+    assert result.errors == []
+    assert [p.name for p in result.packages] == ["urllib3", "requests"]
+    requests = result.packages[1]
+    assert requests.version == "2.31.0"
+    assert requests.ecosystem == "pypi"
+    assert requests.repository_url == "https://github.com/psf/requests"
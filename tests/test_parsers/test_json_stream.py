@@ -0,0 +1,39 @@
+"""Tests for the streaming JSON reader."""
+
+import io
+import json
+
+import pytest
+
+from ossval.parsers.json_stream import JsonStreamReader
+
+
+def test_members_items_and_skip_across_chunks():
+    """Test decoding and skipping values split across tiny read chunks."""
+    document = {
+        "skipped": {"nested": ["a", {"b": "}]\\"}], "n": -1.5e3},
+        "items": ["x\\\"y", 12, True, None, {"k": [1, 2]}, "é€😀"],
+        "last": False,
+    }
+    data = b"\xef\xbb\xbf " + json.dumps(document, ensure_ascii=False).encode()
+
+    for chunk_bytes in (1, 2, 3, 7, 4096):
+        reader = JsonStreamReader(io.BytesIO(data), chunk_bytes=chunk_bytes)
+        seen = {}
+        for key in reader.members():
+            if key == "skipped":
+                reader.skip()
+            elif key == "items":
+                seen[key] = [reader.value() for _ in reader.items()]
+            else:
+                seen[key] = reader.value()
+
+        assert seen == {"items": document["items"], "last": False}
+
+
+def test_truncated_document_raises():
+    """Test that a document cut off inside a value is an error."""
+    reader = JsonStreamReader(io.BytesIO(b'{"components": [{"name": "x'), chunk_bytes=4)
+    with pytest.raises(ValueError):
+        for _ in reader.members():
+            reader.skip()
@@ -0,0 +1,74 @@
+"""Tests for format sniffing and single-read parser dispatch."""
+
+import json
+
+from ossval.core import _parse_file, _select_parser
+from ossval.parsers.cyclonedx import CycloneDXParser
+from ossval.parsers.package_lock import PackageLockParser
+from ossval.parsers.sniff import (
+    CYCLONEDX_JSON,
+    CYCLONEDX_XML,
+    SPDX_JSON,
+    SPDX_TAG_VALUE,
+    sniff,
+)
+from ossval.parsers.spdx import SPDXParser
+
+
+def test_sniff_identifies_formats_from_head():
+    """Test signature detection from top-level keys, XML roots and tag-value tags."""
+    assert sniff("bom.json", b'\xef\xbb\xbf {"bomFormat": "CycloneDX", "compo').kind == CYCLONEDX_JSON
+    assert sniff("bom.json", b'{"metadata": {}, "components": [{"name": "x"').kind == CYCLONEDX_JSON
+    assert sniff("sbom.json", b'{"SPDXID": "SPDXRef-DOCUMENT"}').kind == SPDX_JSON
+    # Keys of nested objects are not signatures
+    assert sniff("package-lock.json", b'{"name": "app", "packages": {"": {"components": 1}}}').kind is None
+    assert (
+        sniff(
+            "bom.xml",
+            b'<?xml version="1.0"?>\n<!-- generated -->\n<bom xmlns="http://cyclonedx.org/schema/bom/1.5">',
+        ).kind
+        == CYCLONEDX_XML
+    )
+    assert sniff("pom.xml", b'<?xml version="1.0"?><project>').kind is None
+    assert sniff("sbom.spdx", b"SPDXVersion: SPDX-2.3\nDataLicense: CC0-1.0\n").kind == SPDX_TAG_VALUE
+
+
+def test_parse_file_reads_and_parses_once(tmp_path, monkeypatch):
+    """Test that selecting a parser for and parsing a JSON SBOM never loads the document."""
+    sbom = tmp_path / "bom.json"
+    sbom.write_text(
+        json.dumps(
+            {
+                "bomFormat": "CycloneDX",
+                "components": [{"type": "library", "name": "requests", "purl": "pkg:pypi/requests@2.31.0"}],
+            }
+        )
+    )
+    loads = []
+    original_load = json.load
+
+    def counting_load(*args, **kwargs):
+        loads.append(args)
+        return original_load(*args, **kwargs)
+
+    monkeypatch.setattr(json, "load", counting_load)
+    result = _parse_file(str(sbom))
+
+    assert [package.name for package in result.packages] == ["requests"]
+    # CycloneDX is read incrementally; the document is never loaded whole
+    assert loads == []
+
+
+def test_select_parser_by_sniffed_content(tmp_path):
+    """Test dispatch of SBOMs by content and lockfiles by name."""
+    spdx = tmp_path / "sbom.spdx"
+    spdx.write_text("SPDXVersion: SPDX-2.3\nPackageName: lodash\nPackageVersion: 4.17.21\n")
+    lock = tmp_path / "package-lock.json"
+    lock.write_text(json.dumps({"lockfileVersion": 3, "packages": {}}))
+    bom = tmp_path / "bom.json"
+    bom.write_text(json.dumps({"bomFormat": "CycloneDX", "components": []}))
+
+    assert isinstance(_select_parser(str(spdx)), SPDXParser)
+    assert isinstance(_select_parser(str(lock)), PackageLockParser)
+    assert isinstance(_select_parser(str(bom)), CycloneDXParser)
+    assert [p.name for p in _parse_file(str(spdx)).packages] == ["lodash"]
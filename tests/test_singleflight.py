@@ -0,0 +1,66 @@
+"""Tests for single-flight coalescing."""
+
+import asyncio
+
+import pytest
+
+from ossval.singleflight import SingleFlight
+
+
+async def test_concurrent_calls_share_one_execution():
+    """Test that concurrent calls with the same key run the work once."""
+    flights = SingleFlight()
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    results = await asyncio.gather(
+        flights.do(("double", 1), lambda: work(1)),
+        flights.do(("double", 1), lambda: work(1)),
+        flights.do(("double", 2), lambda: work(2)),
+    )
+
+    assert results == [2, 2, 4]
+    assert calls == [1, 2]
+    assert flights.coalesced == 1
+    assert len(flights) == 0
+
+    # Completed calls are not remembered
+    assert await flights.do(("double", 1), lambda: work(1)) == 2
+    assert calls == [1, 2, 1]
+
+
+async def test_exceptions_reach_every_caller():
+    """Test that a failing call raises in every waiting caller."""
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        flights.do("key", fail), flights.do("key", fail), return_exceptions=True
+    )
+
+    assert [str(result) for result in results] == ["boom", "boom"]
+
+
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that cancelling one waiter leaves the shared call running."""
+    flights = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    first = asyncio.ensure_future(flights.do("key", work))
+    second = asyncio.ensure_future(flights.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first